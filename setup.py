@@ -27,9 +27,13 @@ setup(
         "requests>=2.31.0",
         "pydantic>=2.5.0",
     ],
+    extras_require={
+        "fast": ["orjson>=3.9.0", "msgspec>=0.18.0"],
+        "zstd": ["zstandard>=0.22.0"],
+    },
     entry_points={
         "console_scripts": [
-            "merge-spdx-sboms=sbom_merger.cli:main",
+            "merge-spdx-sboms=sbom_merger.cli:cli",
         ],
     },
 )
@@ -1,15 +1,67 @@
 import click
+import json
 import sys
+import time
 from pathlib import Path
+from typing import List, Optional
+from click.core import ParameterSource
+from .services.batch_merger import FILE_ENGINES, BatchMerger
+from .services.graph_index import DependencyGraph
+from .services.merge_planner import MergePlanner
 from .services.merger import SbomMerger
-from .services.parser import SpdxParser
+from .services.parse_stage import check_executor, default_executor
 from .services.reporter import MergeReporter
+from .services.writers import save_merged_document
 from .infrastructure.config import Config
 from .infrastructure.file_handler import FileHandler
 from .infrastructure.github_client import GitHubClient
+from .infrastructure.id_table import IdTable
+from .services.id_generator import CachingIdGenerator
+from .infrastructure.merge_manifest import MergeManifest
+from .infrastructure.parse_cache import MemoryParseCache, ParseCache
 
 
-@click.command()
+class DefaultCommandGroup(click.Group):
+    # Arguments that do not start with a subcommand name go to the default
+    # command, so `merge-spdx-sboms --dependencies-dir ...` keeps working.
+
+    def __init__(self, *args, default_command: str, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.default_command = default_command
+
+    def parse_args(self, ctx: click.Context, args: List[str]) -> List[str]:
+        if not args or (
+            args[0] not in self.commands and args[0] not in ctx.help_option_names
+        ):
+            args = [self.default_command, *args]
+        return super().parse_args(ctx, args)
+
+
+def check_engine_options(
+    engine: str, output_format: str, columnar_store: bool, incremental: bool
+) -> None:
+    if engine not in ("memory", "auto"):
+        if output_format != "json":
+            raise click.UsageError(f"--engine {engine} only writes --format json")
+        if columnar_store or incremental:
+            raise click.UsageError(
+                f"--engine {engine} cannot be combined with --columnar-store "
+                "or --incremental"
+            )
+
+
+def validate_executor(
+    ctx: click.Context, param: click.Parameter, value: Optional[str]
+) -> Optional[str]:
+    try:
+        if value is not None:
+            check_executor(value)
+    except ValueError as e:
+        raise click.BadParameter(str(e)) from e
+    return value
+
+
+@click.command(help="Merge the dependency SBOMs of one project into its root SBOM")
 @click.option(
     "--dependencies-dir",
     type=click.Path(exists=True, path_type=Path),
@@ -22,6 +74,13 @@ from .infrastructure.github_client import GitHubClient
     default=None,
     help="Output directory for merged SBOM (default: same as root SBOM)",
 )
+@click.option(
+    "--format",
+    "output_format",
+    type=click.Choice(Config.SUPPORTED_OUTPUT_FORMATS),
+    default="json",
+    help="Output format for the merged SBOM (default: json)",
+)
 @click.option(
     "--key-file",
     type=click.Path(),
@@ -58,10 +117,129 @@ from .infrastructure.github_client import GitHubClient
     default="main",
     help="GitHub branch to push to (default: main)",
 )
+@click.option(
+    "--streaming-parse",
+    is_flag=True,
+    help=(
+        "Decode SBOM JSON one element at a time instead of as a whole tree; "
+        "each parsed document is still held in full (see --engine streaming)"
+    ),
+)
+@click.option(
+    "--lazy-packages",
+    is_flag=True,
+    help="Keep raw package records and decode fields only when accessed",
+)
+@click.option(
+    "--jobs",
+    type=click.IntRange(min=0),
+    default=1,
+    help="Number of dependency SBOMs to parse in parallel (0 = one per CPU)",
+)
+@click.option(
+    "--executor",
+    type=click.Choice(Config.SUPPORTED_EXECUTORS),
+    default=None,
+    callback=validate_executor,
+    help="Worker pool used for parallel parsing and by --engine parallel "
+    "(default: thread; for --engine parallel, including when auto picks it, "
+    "process, or free-threaded on a Python build with the GIL disabled)",
+)
+@click.option(
+    "--json-backend",
+    type=click.Choice(Config.SUPPORTED_JSON_BACKENDS),
+    default="auto",
+    help=(
+        "JSON codec used to read and write SBOMs (default: fastest installed); "
+        "only orjson and msgspec decode mapped inputs without a text copy"
+    ),
+)
+@click.option(
+    "--canonical-json",
+    is_flag=True,
+    help="Write sorted-key UTF-8 JSON that is identical across JSON backends",
+)
+@click.option(
+    "--cache-dir",
+    type=click.Path(file_okay=False, path_type=Path),
+    default=None,
+    help="Directory for the persistent parse cache (disabled when omitted)",
+)
+@click.option(
+    "--cache-max-size",
+    type=click.IntRange(min=1),
+    default=ParseCache.DEFAULT_MAX_BYTES // (1024 * 1024),
+    help="Maximum parse cache size in MB before least recently used entries "
+    "are evicted (default: 1024)",
+)
+@click.option(
+    "--validate-on-parse",
+    is_flag=True,
+    help="Check each SBOM while it is parsed and validate only cross-document "
+    "concerns on the merged result",
+)
+@click.option(
+    "--columnar-store",
+    is_flag=True,
+    help="Hold the merged document in columnar arrays keyed by interned string "
+    "codes instead of one object per package and relationship",
+)
+@click.option(
+    "--passthrough",
+    is_flag=True,
+    help="Keep the original SPDX JSON package and relationship records and write "
+    "them back with only SPDXIDs rewritten, preserving fields the merger does "
+    "not model",
+)
+@click.option(
+    "--incremental",
+    is_flag=True,
+    help="Keep a manifest next to the output and, on later runs, reuse the "
+    "merge results of input SBOMs whose content has not changed",
+)
+@click.option(
+    "--engine",
+    type=click.Choice(Config.SUPPORTED_ENGINES),
+    default="memory",
+    help="memory builds the merged document before writing it; streaming "
+    "writes packages and relationships to the JSON output as they are merged, "
+    "holding only the merged SPDXIDs; sqlite also stages those in an on-disk "
+    "SQLite database; parallel deduplicates hash partitions of the merged "
+    "packages and relationships on --jobs workers; auto picks the engine, and "
+    "unless --jobs is given the worker count, from a scan of the inputs "
+    "(default: memory)",
+)
+@click.option(
+    "--memory-budget",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Memory in MB that --engine auto plans the merge to fit in "
+    "(default: half of physical memory)",
+)
+@click.option(
+    "--id-cache-size",
+    type=click.IntRange(min=0),
+    default=CachingIdGenerator.DEFAULT_MAX_ENTRIES,
+    help="Package IDs remembered by (name, version, ecosystem) so recurring "
+    "packages are not re-hashed (default: 65536, 0 disables)",
+)
+@click.option(
+    "--id-table",
+    type=click.Path(dir_okay=False, path_type=Path),
+    default=None,
+    help="SQLite file of package IDs reused across runs and projects, and "
+    "extended with the IDs each merge generates",
+)
+@click.option(
+    "--explain-plan",
+    is_flag=True,
+    help="Print the planned engine and worker count and why they were chosen",
+)
 @click.option("--verbose", is_flag=True, help="Enable verbose output")
 def main(
     dependencies_dir,
     output_dir,
+    output_format,
     key_file,
     account,
     push_to_github,
@@ -69,8 +247,27 @@ def main(
     github_repo,
     github_path,
     github_branch,
+    streaming_parse,
+    lazy_packages,
+    jobs,
+    executor,
+    json_backend,
+    canonical_json,
+    cache_dir,
+    cache_max_size,
+    validate_on_parse,
+    columnar_store,
+    passthrough,
+    incremental,
+    engine,
+    memory_budget,
+    id_cache_size,
+    id_table,
+    explain_plan,
     verbose,
 ):
+    check_engine_options(engine, output_format, columnar_store, incremental)
+
     click.echo("=" * 70)
     click.echo("SPDX SBOM Merger v1.0.0")
     click.echo("=" * 70)
@@ -88,9 +285,61 @@ def main(
         click.echo(f"\n📦 Root SBOM: {root_sbom.name}")
         click.echo(f"📦 Dependency SBOMs: {len(dep_sboms)}")
 
+        plan = None
+        if engine == "auto" or explain_plan:
+            jobs_source = click.get_current_context().get_parameter_source("jobs")
+            plan = MergePlanner.plan(
+                [root_sbom, *dep_sboms],
+                memory_budget=memory_budget and memory_budget * 1024 * 1024,
+                engine=engine,
+                jobs=None if jobs_source == ParameterSource.DEFAULT else jobs,
+                memory_only=MergePlanner.memory_only_reason(
+                    output_format, columnar_store, incremental
+                ),
+                executor=executor,
+            )
+            engine, jobs, executor = plan.engine, plan.jobs, plan.executor
+            if explain_plan:
+                click.echo("\n🧭 Merge plan:")
+                for line in MergePlanner.explain(plan):
+                    click.echo(f"   {line}")
+
+        executor = executor or default_executor(engine)
+
+        cache = None
+        if cache_dir:
+            cache = ParseCache(cache_dir, max_bytes=cache_max_size * 1024 * 1024)
+
+        output_path = FileHandler.get_output_path(root_sbom, output_dir, output_format)
+        manifest_path = MergeManifest.path_for(output_path) if incremental else None
+
+        merger_options = dict(
+            streaming_parse=streaming_parse,
+            jobs=jobs,
+            executor=executor,
+            json_backend=json_backend,
+            cache=cache,
+            lazy_packages=lazy_packages,
+            validate_on_parse=validate_on_parse,
+            passthrough=passthrough,
+            id_cache_size=id_cache_size,
+            id_table=IdTable(id_table) if id_table else None,
+        )
+
         click.echo("\n🔄 Merging SBOMs...")
-        merger = SbomMerger()
-        result = merger.merge_sboms(root_sbom, dep_sboms)
+        if engine != "memory":
+            click.echo(f"💾 Streaming merged SBOM to: {output_path}")
+            result = FILE_ENGINES[engine](**merger_options).merge_to_file(
+                root_sbom, dep_sboms, output_path, canonical=canonical_json
+            )
+        else:
+            merger = SbomMerger(
+                **merger_options,
+                columnar_store=columnar_store,
+                manifest_path=manifest_path,
+            )
+            result = merger.merge_sboms(root_sbom, dep_sboms)
+        result.plan = plan
 
         click.echo(
             f"✅ Merge completed in {result.statistics.processing_time_seconds:.2f}s"
@@ -99,13 +348,34 @@ def main(
         click.echo(
             f"   Duplicates removed: {result.statistics.duplicate_packages_removed}"
         )
+        click.echo(
+            f"   Duplicate relationships removed: "
+            f"{result.statistics.duplicate_relationships_removed}"
+        )
         click.echo(f"   Total relationships: {result.statistics.total_relationships}")
+        if cache:
+            click.echo(
+                f"   Parse cache: {result.statistics.cache_hits} hits, "
+                f"{result.statistics.cache_misses} misses"
+            )
+        if incremental:
+            click.echo(f"   Unchanged inputs reused: {result.statistics.inputs_reused}")
+        click.echo(
+            f"   Package IDs: {result.statistics.id_hit_rate:.0%} reused "
+            f"({result.statistics.id_cache_hits} cached, "
+            f"{result.statistics.id_table_hits} from ID table, "
+            f"{result.statistics.ids_generated} generated)"
+        )
 
-        output_path = FileHandler.get_output_path(root_sbom, output_dir)
-
-        click.echo(f"\n💾 Saving merged SBOM to: {output_path}")
-        serialized = SpdxParser.serialize_to_json(result.merged_document)
-        FileHandler.save_merged_sbom(serialized, output_path)
+        if engine == "memory":
+            click.echo(f"\n💾 Saving merged SBOM to: {output_path}")
+            save_merged_document(
+                result.merged_document,
+                output_path,
+                output_format,
+                json_backend,
+                canonical_json,
+            )
 
         click.echo("📊 Generating merge report...")
         MergeReporter.generate_report(result, output_path)
@@ -196,5 +466,302 @@ def main(
         sys.exit(1)
 
 
+@click.command(
+    help="Merge every <project>/dependencies directory under EXPORT_ROOT in "
+    "one process"
+)
+@click.argument(
+    "export_root", type=click.Path(exists=True, file_okay=False, path_type=Path)
+)
+@click.option(
+    "--output-dir",
+    type=click.Path(path_type=Path),
+    default=None,
+    help="Output directory for all merged SBOMs (default: each project's own)",
+)
+@click.option(
+    "--format",
+    "output_format",
+    type=click.Choice(Config.SUPPORTED_OUTPUT_FORMATS),
+    default="json",
+    help="Output format for the merged SBOMs (default: json)",
+)
+@click.option(
+    "--engine",
+    type=click.Choice(Config.SUPPORTED_ENGINES),
+    default="memory",
+    help="Merge engine used for each project, as for the merge command; auto "
+    "plans each project within its share of --memory-budget (default: memory)",
+)
+@click.option(
+    "--memory-budget",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Memory in MB shared by the projects merged at once, for --engine auto "
+    "(default: half of physical memory)",
+)
+@click.option(
+    "--jobs",
+    type=click.IntRange(min=0),
+    default=0,
+    help="Number of projects to merge in parallel (default: 0 = one per CPU)",
+)
+@click.option(
+    "--executor",
+    type=click.Choice(Config.SUPPORTED_EXECUTORS),
+    default="thread",
+    callback=validate_executor,
+    help="Worker pool the projects are merged on (default: thread)",
+)
+@click.option(
+    "--json-backend",
+    type=click.Choice(Config.SUPPORTED_JSON_BACKENDS),
+    default="auto",
+    help=(
+        "JSON codec used to read and write SBOMs (default: fastest installed); "
+        "only orjson and msgspec decode mapped inputs without a text copy"
+    ),
+)
+@click.option(
+    "--canonical-json",
+    is_flag=True,
+    help="Write sorted-key UTF-8 JSON that is identical across JSON backends",
+)
+@click.option(
+    "--cache-dir",
+    type=click.Path(file_okay=False, path_type=Path),
+    default=None,
+    help="Directory for the persistent parse cache (default: an in-memory "
+    "cache shared by the projects, unless --executor process)",
+)
+@click.option(
+    "--cache-max-size",
+    type=click.IntRange(min=1),
+    default=ParseCache.DEFAULT_MAX_BYTES // (1024 * 1024),
+    help="Maximum parse cache size in MB (default: 1024)",
+)
+@click.option(
+    "--streaming-parse",
+    is_flag=True,
+    help=(
+        "Decode SBOM JSON one element at a time instead of as a whole tree; "
+        "each parsed document is still held in full (see --engine streaming)"
+    ),
+)
+@click.option(
+    "--validate-on-parse",
+    is_flag=True,
+    help="Check each SBOM while it is parsed",
+)
+@click.option(
+    "--passthrough",
+    is_flag=True,
+    help="Write original package and relationship records back with only "
+    "SPDXIDs rewritten",
+)
+@click.option(
+    "--id-table",
+    type=click.Path(dir_okay=False, path_type=Path),
+    default=None,
+    help="SQLite file of package IDs shared by the projects and reused across " "runs",
+)
+@click.option(
+    "--index",
+    "index_path",
+    type=click.Path(dir_okay=False, path_type=Path),
+    default=None,
+    help=f"Summary index of outputs and per-project statistics (default: "
+    f"{BatchMerger.INDEX_NAME} in --output-dir or EXPORT_ROOT)",
+)
+@click.option("--verbose", is_flag=True, help="Show every project's validation errors")
+def batch(
+    export_root,
+    output_dir,
+    output_format,
+    engine,
+    memory_budget,
+    jobs,
+    executor,
+    json_backend,
+    canonical_json,
+    cache_dir,
+    cache_max_size,
+    streaming_parse,
+    validate_on_parse,
+    passthrough,
+    id_table,
+    index_path,
+    verbose,
+):
+    check_engine_options(engine, output_format, False, False)
+    start_time = time.time()
+
+    cache = None
+    if cache_dir:
+        cache = ParseCache(cache_dir, max_bytes=cache_max_size * 1024 * 1024)
+    elif executor != "process":
+        cache = MemoryParseCache(max_bytes=cache_max_size * 1024 * 1024)
+
+    try:
+        projects = BatchMerger.discover_projects(export_root)
+    except FileNotFoundError as e:
+        click.echo(f"❌ Error: {e}")
+        sys.exit(1)
+    if not projects:
+        click.echo(f"❌ Error: No <project>/dependencies directories in {export_root}")
+        sys.exit(1)
+
+    click.echo(f"📦 Merging {len(projects)} projects from: {export_root}")
+    merger = BatchMerger(
+        output_dir=output_dir,
+        output_format=output_format,
+        engine=engine,
+        canonical_json=canonical_json,
+        jobs=jobs,
+        executor=executor,
+        memory_budget=memory_budget and memory_budget * 1024 * 1024,
+        streaming_parse=streaming_parse,
+        json_backend=json_backend,
+        cache=cache,
+        validate_on_parse=validate_on_parse,
+        passthrough=passthrough,
+        id_table=IdTable(id_table) if id_table else None,
+    )
+
+    outcomes = []
+    for outcome in merger.run(projects):
+        outcomes.append(outcome)
+        statistics = outcome.statistics
+        if statistics is None:
+            click.echo(f"❌ {outcome.project}: {outcome.error}")
+            continue
+
+        click.echo(
+            f"✅ {outcome.project}: {statistics.total_packages} packages, "
+            f"{statistics.duplicate_packages_removed} duplicates removed"
+        )
+        if verbose:
+            for error in statistics.validation_errors:
+                click.echo(f"   ❌ {error}")
+
+    index_path = index_path or (output_dir or export_root) / BatchMerger.INDEX_NAME
+    BatchMerger.write_index(
+        outcomes, index_path, export_root, time.time() - start_time, json_backend
+    )
+
+    failed = [outcome for outcome in outcomes if not outcome.succeeded]
+    click.echo(
+        f"\n📊 {len(outcomes) - len(failed)} merged, {len(failed)} failed; "
+        f"index: {index_path}"
+    )
+    if failed:
+        sys.exit(1)
+
+
+@click.command(
+    help="Query the dependency graph of a merged SBOM: the dependencies or "
+    "dependents of a package, everything reachable from it (default: from the "
+    "root), the shortest path between two packages, or a package's depth "
+    "below the root. Packages are given by SPDXID or by unambiguous name."
+)
+@click.argument(
+    "merged_sbom", type=click.Path(exists=True, dir_okay=False, path_type=Path)
+)
+@click.argument("query", type=click.Choice(DependencyGraph.QUERIES))
+@click.argument("packages", nargs=-1)
+@click.option(
+    "--max-depth",
+    type=click.IntRange(min=0),
+    default=None,
+    help="Edges to follow; 0 for no limit (default: 1 for dependencies and "
+    "dependents, no limit for reachable)",
+)
+@click.option(
+    "--reverse",
+    is_flag=True,
+    help="With reachable, follow dependents instead of dependencies",
+)
+@click.option("--json", "as_json", is_flag=True, help="Print the results as JSON")
+@click.option(
+    "--streaming-parse",
+    is_flag=True,
+    help=(
+        "Decode the SBOM JSON one element at a time instead of as a whole "
+        "tree; the parsed document is still held in full"
+    ),
+)
+@click.option(
+    "--json-backend",
+    type=click.Choice(Config.SUPPORTED_JSON_BACKENDS),
+    default="auto",
+    help=(
+        "JSON codec used to read the SBOM (default: fastest installed); "
+        "only orjson and msgspec decode mapped inputs without a text copy"
+    ),
+)
+def query(
+    merged_sbom,
+    query,
+    packages,
+    max_depth,
+    reverse,
+    as_json,
+    streaming_parse,
+    json_backend,
+):
+    arity = {"reachable": (0, 1), "path": (2, 2)}.get(query, (1, 1))
+    if not arity[0] <= len(packages) <= arity[1]:
+        expected = " or ".join(str(count) for count in sorted(set(arity)))
+        raise click.UsageError(f"{query} takes {expected} package(s)")
+
+    graph = DependencyGraph.load(merged_sbom, streaming_parse, json_backend)
+    if max_depth is None:
+        max_depth = None if query == "reachable" else 1
+    try:
+        if query in ("dependencies", "dependents", "reachable"):
+            results = graph.reachable(
+                packages[0] if packages else None,
+                reverse=reverse or query == "dependents",
+                max_depth=max_depth or None,
+            )
+        else:
+            if query == "path":
+                path = graph.shortest_path(*packages)
+            else:
+                path = graph.path_from_root(packages[0])
+            if path is None:
+                source = packages[0] if query == "path" else "the root"
+                click.echo(f"❌ {packages[-1]} is not reachable from {source}")
+                sys.exit(1)
+            results = {spdx_id: depth for depth, spdx_id in enumerate(path)}
+    except ValueError as e:
+        click.echo(f"❌ Error: {e}")
+        sys.exit(1)
+
+    if as_json:
+        entries = [
+            {"spdxId": spdx_id, "package": graph.label(spdx_id), "depth": depth}
+            for spdx_id, depth in results.items()
+        ]
+        click.echo(json.dumps(entries, indent=2))
+        return
+    for spdx_id, depth in results.items():
+        click.echo(f"{depth:>3}  {spdx_id}  {graph.label(spdx_id)}".rstrip())
+
+
+@click.group(
+    cls=DefaultCommandGroup,
+    default_command="merge",
+    help="Merge SPDX SBOMs. Without a command, the arguments go to merge.",
+)
+def cli():
+    pass
+
+
+cli.add_command(main, name="merge")
+cli.add_command(batch)
+cli.add_command(query)
+
+
 if __name__ == "__main__":
-    main()
+    cli()
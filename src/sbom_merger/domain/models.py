@@ -1,9 +1,93 @@
+from array import array
 from dataclasses import dataclass, field
-from typing import List, Dict, Optional, Any
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Generic,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    TYPE_CHECKING,
+    Tuple,
+    TypeVar,
+    cast,
+    overload,
+)
 
+if TYPE_CHECKING:
+    from ..infrastructure.element_spool import ElementSpool
 
-@dataclass
-class SpdxPackage:
+T = TypeVar("T")
+
+
+class BaseSpdxPackage:
+    # The package fields, without storage: SpdxPackage holds them in slots,
+    # and the lazy and stored views read them from elsewhere without
+    # inheriting those slots, so a view costs only the references it keeps.
+
+    __slots__ = ()
+
+    name: str
+    spdx_id: str
+    download_location: str
+    files_analyzed: bool
+    version_info: Optional[str]
+    license_concluded: Optional[str]
+    copyright_text: Optional[str]
+    external_refs: List[Dict[str, str]]
+    source_sbom: Optional[str]
+    raw_record: Optional[Dict[str, Any]]
+
+    # Compared and shown like the SpdxPackage dataclass: by class and fields,
+    # raw_record aside.
+    _COMPARED = (
+        "name",
+        "spdx_id",
+        "download_location",
+        "files_analyzed",
+        "version_info",
+        "license_concluded",
+        "copyright_text",
+        "external_refs",
+        "source_sbom",
+    )
+
+    def _fields(self) -> Tuple[Any, ...]:
+        return tuple(getattr(self, name) for name in self._COMPARED)
+
+    def __eq__(self, other: object) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return self._fields() == cast(BaseSpdxPackage, other)._fields()
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        fields = ", ".join(
+            f"{name}={value!r}" for name, value in zip(self._COMPARED, self._fields())
+        )
+        return f"{self.__class__.__qualname__}({fields})"
+
+    def materialize(self) -> "SpdxPackage":
+        return SpdxPackage(
+            name=self.name,
+            spdx_id=self.spdx_id,
+            download_location=self.download_location,
+            files_analyzed=self.files_analyzed,
+            version_info=self.version_info,
+            license_concluded=self.license_concluded,
+            copyright_text=self.copyright_text,
+            external_refs=self.external_refs,
+            source_sbom=self.source_sbom,
+            raw_record=self.raw_record,
+        )
+
+
+@dataclass(slots=True)
+class SpdxPackage(BaseSpdxPackage):
     name: str
     spdx_id: str
     download_location: str = "NOASSERTION"
@@ -13,14 +97,451 @@ class SpdxPackage:
     copyright_text: Optional[str] = None
     external_refs: List[Dict[str, str]] = field(default_factory=list)
     source_sbom: Optional[str] = None
+    # The source SPDX JSON record, kept when parsing in passthrough mode so
+    # fields the model does not cover are written back unchanged.
+    raw_record: Optional[Dict[str, Any]] = field(
+        default=None, repr=False, compare=False
+    )
 
 
-@dataclass
-class SpdxRelationship:
+class _RecordField(Generic[T]):
+    # Reads a package field from the raw SPDX JSON record on every access.
+
+    def __init__(self, key: str, default: Callable[[], T]):
+        self.key = key
+        self.default = default
+
+    @overload
+    def __get__(self, instance: None, owner: Any) -> "_RecordField[T]": ...
+
+    @overload
+    def __get__(self, instance: "LazySpdxPackage", owner: Any) -> T: ...
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        value = instance._record.get(self.key, self)
+        return self.default() if value is self else value
+
+    def __set__(self, instance: "LazySpdxPackage", value: T) -> None:
+        instance._record[self.key] = value
+
+
+class LazySpdxPackage(BaseSpdxPackage):
+    # Backed by the raw SPDX JSON record: fields are looked up when accessed
+    # instead of being copied into the instance at parse time.
+
+    __slots__ = ("_record", "source_sbom", "raw_record")
+
+    name = _RecordField[str]("name", str)
+    spdx_id = _RecordField[str]("SPDXID", str)
+    download_location = _RecordField[str]("downloadLocation", lambda: "NOASSERTION")
+    # SPDX 2.x defaults filesAnalyzed to true.
+    files_analyzed = _RecordField[bool]("filesAnalyzed", lambda: True)
+    version_info = _RecordField[Optional[str]]("versionInfo", lambda: None)
+    license_concluded = _RecordField[Optional[str]]("licenseConcluded", lambda: None)
+    copyright_text = _RecordField[Optional[str]]("copyrightText", lambda: None)
+    external_refs = _RecordField[List[Dict[str, str]]]("externalRefs", list)
+
+    def __init__(
+        self,
+        record: Dict[str, Any],
+        source_sbom: Optional[str] = None,
+        passthrough: bool = False,
+    ):
+        self._record = record
+        self.source_sbom = source_sbom
+        self.raw_record = record if passthrough else None
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return self.__class__, (
+            self._record,
+            self.source_sbom,
+            self.raw_record is not None,
+        )
+
+    @property
+    def purl(self) -> Optional[str]:
+        for ref in self._record.get("externalRefs", ()):
+            if ref.get("referenceType") == "purl":
+                locator: Optional[str] = ref.get("referenceLocator")
+                return locator
+        return None
+
+
+class BaseSpdxRelationship:
+    # The relationship fields, without storage, as BaseSpdxPackage is for
+    # packages: SpdxRelationship holds them in slots, and the stored view
+    # reads them from its ColumnarStore row.
+
+    __slots__ = ()
+
+    spdx_element_id: str
+    related_spdx_element: str
+    relationship_type: str
+    source_sbom: Optional[str]
+    raw_record: Optional[Dict[str, Any]]
+
+    _COMPARED = (
+        "spdx_element_id",
+        "related_spdx_element",
+        "relationship_type",
+        "source_sbom",
+    )
+
+    def _fields(self) -> Tuple[Any, ...]:
+        return tuple(getattr(self, name) for name in self._COMPARED)
+
+    def __eq__(self, other: object) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return self._fields() == cast(BaseSpdxRelationship, other)._fields()
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        fields = ", ".join(
+            f"{name}={value!r}" for name, value in zip(self._COMPARED, self._fields())
+        )
+        return f"{self.__class__.__qualname__}({fields})"
+
+
+@dataclass(slots=True)
+class SpdxRelationship(BaseSpdxRelationship):
     spdx_element_id: str
     related_spdx_element: str
     relationship_type: str
     source_sbom: Optional[str] = None
+    raw_record: Optional[Dict[str, Any]] = field(
+        default=None, repr=False, compare=False
+    )
+
+
+NO_STRING = -1
+
+
+class StringTable:
+    # Each distinct string is stored once and referred to by its integer code.
+
+    __slots__ = ("_strings", "_codes")
+
+    def __init__(self) -> None:
+        self._strings: List[str] = []
+        self._codes: Dict[str, int] = {}
+
+    def code(self, value: Optional[str]) -> int:
+        if value is None:
+            return NO_STRING
+        code = self._codes.get(value)
+        if code is None:
+            code = self._codes[value] = len(self._strings)
+            self._strings.append(value)
+        return code
+
+    def find(self, value: str) -> Optional[int]:
+        return self._codes.get(value)
+
+    def __getitem__(self, code: int) -> Optional[str]:
+        return None if code == NO_STRING else self._strings[code]
+
+    def __len__(self) -> int:
+        return len(self._strings)
+
+
+class RelationshipIndex:
+    # Relationships seen so far, keyed on (element, related, type) string codes
+    # packed into a single integer, to drop exact duplicates after remapping.
+    # Codes are shifted by one so NO_STRING packs as 0 instead of sign-extending
+    # over the other fields.
+
+    __slots__ = ("strings", "_keys")
+
+    def __init__(self, strings: Optional[StringTable] = None) -> None:
+        self.strings = strings if strings is not None else StringTable()
+        self._keys: Set[int] = set()
+
+    def add_codes(self, element: int, related: int, relationship_type: int) -> bool:
+        key = ((element + 1) << 64) | ((related + 1) << 32) | (relationship_type + 1)
+        if key in self._keys:
+            return False
+        self._keys.add(key)
+        return True
+
+    def add(self, rel: BaseSpdxRelationship) -> bool:
+        code = self.strings.code
+        return self.add_codes(
+            code(rel.spdx_element_id),
+            code(rel.related_spdx_element),
+            code(rel.relationship_type),
+        )
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+
+class ColumnarStore:
+    # Packages and relationships held as parallel integer arrays. Package rows
+    # are addressed by index; relationship endpoints and types are string codes,
+    # so elements that are not packages (the document, files) are nodes too.
+
+    PACKAGE_STRING_COLUMNS = (
+        "name",
+        "spdx_id",
+        "download_location",
+        "version_info",
+        "license_concluded",
+        "copyright_text",
+        "source_sbom",
+        "purl",
+    )
+
+    def __init__(self) -> None:
+        self.strings = StringTable()
+        self.package_columns = {
+            column: array("i") for column in self.PACKAGE_STRING_COLUMNS
+        }
+        self.files_analyzed = bytearray()
+        self.external_refs: List[List[Dict[str, str]]] = []
+        self.raw_records: List[Optional[Dict[str, Any]]] = []
+        self.rel_element = array("i")
+        self.rel_related = array("i")
+        self.rel_type = array("i")
+        self.rel_source = array("i")
+        self.rel_raw_records: List[Optional[Dict[str, Any]]] = []
+        self._rows_by_id: Dict[int, int] = {}
+
+    @property
+    def package_count(self) -> int:
+        return len(self.files_analyzed)
+
+    @property
+    def relationship_count(self) -> int:
+        return len(self.rel_type)
+
+    def add_package(self, pkg: BaseSpdxPackage, spdx_id: Optional[str] = None) -> int:
+        code = self.strings.code
+        columns = self.package_columns
+        row = self.package_count
+
+        spdx_id_code = code(pkg.spdx_id if spdx_id is None else spdx_id)
+        columns["spdx_id"].append(spdx_id_code)
+        columns["name"].append(code(pkg.name))
+        columns["download_location"].append(code(pkg.download_location))
+        columns["version_info"].append(code(pkg.version_info))
+        columns["license_concluded"].append(code(pkg.license_concluded))
+        columns["copyright_text"].append(code(pkg.copyright_text))
+        columns["source_sbom"].append(code(pkg.source_sbom))
+
+        purl = None
+        for ref in pkg.external_refs:
+            if ref.get("referenceType") == "purl":
+                purl = ref.get("referenceLocator")
+                break
+        columns["purl"].append(code(purl))
+
+        self.files_analyzed.append(1 if pkg.files_analyzed else 0)
+        self.external_refs.append(pkg.external_refs)
+        self.raw_records.append(pkg.raw_record)
+        self._rows_by_id.setdefault(spdx_id_code, row)
+        return row
+
+    def has_package_code(self, spdx_id_code: int) -> bool:
+        return spdx_id_code in self._rows_by_id
+
+    def row_of(self, spdx_id: str) -> Optional[int]:
+        code = self.strings.find(spdx_id)
+        return None if code is None else self._rows_by_id.get(code)
+
+    def add_relationship_codes(
+        self,
+        element: int,
+        related: int,
+        relationship_type: int,
+        source: int,
+        raw_record: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        self.rel_element.append(element)
+        self.rel_related.append(related)
+        self.rel_type.append(relationship_type)
+        self.rel_source.append(source)
+        self.rel_raw_records.append(raw_record)
+
+    def add_relationship(self, rel: BaseSpdxRelationship) -> None:
+        code = self.strings.code
+        self.add_relationship_codes(
+            code(rel.spdx_element_id),
+            code(rel.related_spdx_element),
+            code(rel.relationship_type),
+            code(rel.source_sbom),
+            rel.raw_record,
+        )
+
+    def package(self, row: int) -> "StoredSpdxPackage":
+        return StoredSpdxPackage(self, row)
+
+    def relationship(self, index: int) -> "StoredSpdxRelationship":
+        return StoredSpdxRelationship(self, index)
+
+    @property
+    def packages(self) -> "StoredRows[BaseSpdxPackage]":
+        return StoredRows(self, "package_count", self.package)
+
+    @property
+    def relationships(self) -> "StoredRows[BaseSpdxRelationship]":
+        return StoredRows(self, "relationship_count", self.relationship)
+
+    @classmethod
+    def from_document(cls, document: "SpdxDocument") -> "ColumnarStore":
+        store = cls()
+        for pkg in document.packages:
+            store.add_package(pkg)
+        for rel in document.relationships:
+            store.add_relationship(rel)
+        return store
+
+
+class StoredRows(Sequence[T]):
+    # Read-only sequence of row views over a ColumnarStore.
+
+    def __init__(
+        self, store: ColumnarStore, count: str, row: Callable[[int], T]
+    ) -> None:
+        self._store = store
+        self._count = count
+        self._row = row
+
+    def __len__(self) -> int:
+        count: int = getattr(self._store, self._count)
+        return count
+
+    @overload
+    def __getitem__(self, index: int) -> T: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[T]: ...
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._row(i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        return self._row(index)
+
+    def __iter__(self) -> Iterator[T]:
+        return (self._row(i) for i in range(len(self)))
+
+
+class _ColumnField(Generic[T]):
+    # Decodes one field of a stored row from its string-code column.
+
+    def __init__(self, column: str):
+        self.column = column
+
+    @overload
+    def __get__(self, instance: None, owner: Any) -> "_ColumnField[T]": ...
+
+    @overload
+    def __get__(self, instance: Any, owner: Any) -> T: ...
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        store = instance._store
+        return store.strings[store.package_columns[self.column][instance._row]]
+
+    def __set__(self, instance: Any, value: T) -> None:
+        store = instance._store
+        store.package_columns[self.column][instance._row] = store.strings.code(value)
+
+
+class _RelationshipColumnField(_ColumnField[T]):
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        store = instance._store
+        return store.strings[getattr(store, self.column)[instance._row]]
+
+    def __set__(self, instance: Any, value: T) -> None:
+        store = instance._store
+        getattr(store, self.column)[instance._row] = store.strings.code(value)
+
+
+class StoredSpdxPackage(BaseSpdxPackage):
+    # A package row of a ColumnarStore presented as an SpdxPackage.
+
+    __slots__ = ("_store", "_row")
+
+    name = _ColumnField[str]("name")
+    spdx_id = _ColumnField[str]("spdx_id")
+    download_location = _ColumnField[str]("download_location")
+    version_info = _ColumnField[Optional[str]]("version_info")
+    license_concluded = _ColumnField[Optional[str]]("license_concluded")
+    copyright_text = _ColumnField[Optional[str]]("copyright_text")
+    source_sbom = _ColumnField[Optional[str]]("source_sbom")
+
+    def __init__(self, store: ColumnarStore, row: int):
+        self._store = store
+        self._row = row
+
+    @property
+    def files_analyzed(self) -> bool:
+        return bool(self._store.files_analyzed[self._row])
+
+    @files_analyzed.setter
+    def files_analyzed(self, value: bool) -> None:
+        self._store.files_analyzed[self._row] = 1 if value else 0
+
+    @property
+    def external_refs(self) -> List[Dict[str, str]]:
+        return self._store.external_refs[self._row]
+
+    @external_refs.setter
+    def external_refs(self, value: List[Dict[str, str]]) -> None:
+        self._store.external_refs[self._row] = value
+
+    @property
+    def raw_record(self) -> Optional[Dict[str, Any]]:
+        return self._store.raw_records[self._row]
+
+    @raw_record.setter
+    def raw_record(self, value: Optional[Dict[str, Any]]) -> None:
+        self._store.raw_records[self._row] = value
+
+    @property
+    def purl(self) -> Optional[str]:
+        return self._store.strings[self._store.package_columns["purl"][self._row]]
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return self.__class__, (self._store, self._row)
+
+
+class StoredSpdxRelationship(BaseSpdxRelationship):
+    # A relationship row of a ColumnarStore presented as an SpdxRelationship.
+
+    __slots__ = ("_store", "_row")
+
+    spdx_element_id = _RelationshipColumnField[str]("rel_element")
+    related_spdx_element = _RelationshipColumnField[str]("rel_related")
+    relationship_type = _RelationshipColumnField[str]("rel_type")
+    source_sbom = _RelationshipColumnField[Optional[str]]("rel_source")
+
+    def __init__(self, store: ColumnarStore, row: int):
+        self._store = store
+        self._row = row
+
+    @property
+    def raw_record(self) -> Optional[Dict[str, Any]]:
+        return self._store.rel_raw_records[self._row]
+
+    @raw_record.setter
+    def raw_record(self, value: Optional[Dict[str, Any]]) -> None:
+        self._store.rel_raw_records[self._row] = value
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return self.__class__, (self._store, self._row)
 
 
 @dataclass
@@ -31,10 +552,28 @@ class SpdxDocument:
     name: str
     document_namespace: str
     creation_info: Dict[str, Any]
-    packages: List[SpdxPackage] = field(default_factory=list)
-    relationships: List[SpdxRelationship] = field(default_factory=list)
+    packages: Sequence[BaseSpdxPackage] = field(default_factory=list)
+    relationships: Sequence[BaseSpdxRelationship] = field(default_factory=list)
     comment: Optional[str] = None
     source_file: Optional[str] = None
+    # Set when packages and relationships are row views over a ColumnarStore.
+    store: Optional[ColumnarStore] = field(default=None, repr=False, compare=False)
+    # SPDX files and snippets, spooled to disk instead of held as objects.
+    elements: Optional["ElementSpool"] = field(default=None, repr=False, compare=False)
+    # Filled in when the document was validated while it was parsed.
+    validation_errors: Optional[List[str]] = None
+    validation_warnings: Optional[List[str]] = None
+
+
+@dataclass
+class MergeContribution:
+    # What one input adds to a merge: its packages paired with their merged
+    # SPDXIDs, its relationships with remapped endpoints, and the ID mapping
+    # used. Packages are copied under the merged ID only once they are kept.
+    source_file: Optional[str]
+    packages: List[Tuple[BaseSpdxPackage, str]] = field(default_factory=list)
+    relationships: List[SpdxRelationship] = field(default_factory=list)
+    id_mapping: Dict[str, str] = field(default_factory=dict)
 
 
 @dataclass
@@ -45,13 +584,44 @@ class MergeStatistics:
     total_packages: int = 0
     total_relationships: int = 0
     duplicate_packages_removed: int = 0
+    duplicate_relationships_removed: int = 0
     processing_time_seconds: float = 0.0
+    cache_hits: int = 0
+    cache_misses: int = 0
+    inputs_reused: int = 0
+    id_cache_hits: int = 0
+    id_table_hits: int = 0
+    ids_generated: int = 0
     validation_errors: List[str] = field(default_factory=list)
     validation_warnings: List[str] = field(default_factory=list)
 
+    @property
+    def id_hit_rate(self) -> float:
+        # Share of package IDs that were not generated afresh.
+        lookups = self.id_cache_hits + self.id_table_hits + self.ids_generated
+        return (self.id_cache_hits + self.id_table_hits) / lookups if lookups else 0.0
+
+
+@dataclass
+class MergePlan:
+    # The engine, worker count and worker pool picked for a merge, with the
+    # input scan they were based on and the reasons, in decision order.
+    engine: str
+    jobs: int
+    executor: str = "thread"
+    input_count: int = 0
+    input_bytes: int = 0
+    estimated_elements: int = 0
+    in_memory_bytes: int = 0
+    streamed_bytes: int = 0
+    memory_budget: int = 0
+    cpu_count: int = 1
+    reasons: List[str] = field(default_factory=list)
+
 
 @dataclass
 class MergeResult:
     merged_document: SpdxDocument
     statistics: MergeStatistics
     output_path: Optional[str] = None
+    plan: Optional[MergePlan] = None
@@ -0,0 +1,39 @@
+import hashlib
+import math
+from typing import List
+
+
+class BloomFilter:
+    # Set membership with no false negatives: a miss means the key was never
+    # added, so the exact (slower) lookup is only needed on a hit.
+
+    def __init__(self, capacity: int, error_rate: float = 0.01):
+        if capacity < 1:
+            raise ValueError(f"Bloom filter capacity must be >= 1, got {capacity}")
+        if not 0 < error_rate < 1:
+            raise ValueError(
+                f"Bloom filter error rate must be between 0 and 1, got {error_rate}"
+            )
+
+        self.bit_count = max(
+            8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        )
+        self.hash_count = max(1, round(self.bit_count / capacity * math.log(2)))
+        self._bits = bytearray((self.bit_count + 7) // 8)
+
+    def _positions(self, key: str) -> List[int]:
+        # Double hashing: k positions from the two halves of one digest.
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        return [(first + i * second) % self.bit_count for i in range(self.hash_count)]
+
+    def add(self, key: str) -> None:
+        for position in self._positions(key):
+            self._bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, key: str) -> bool:
+        return all(
+            self._bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(key)
+        )
@@ -13,9 +13,17 @@ class GitHubAccount:
 class Config:
     SUPPORTED_SPDX_VERSIONS = ["SPDX-2.3"]
     FUTURE_SPDX_VERSIONS = ["SPDX-3.0", "SPDX-3.0.1"]
+    # Versions that can be read and mapped onto the SPDX 2.3 merge model.
+    INGESTIBLE_SPDX_VERSIONS = SUPPORTED_SPDX_VERSIONS + FUTURE_SPDX_VERSIONS
 
-    SUPPORTED_OUTPUT_FORMATS = ["json"]
-    FUTURE_OUTPUT_FORMATS = ["yaml", "rdf"]
+    SUPPORTED_OUTPUT_FORMATS = ["json", "tag-value", "spdx3-jsonld", "yaml", "rdf"]
+    FUTURE_OUTPUT_FORMATS: List[str] = []
+
+    SUPPORTED_EXECUTORS = ["thread", "process", "free-threaded"]
+
+    SUPPORTED_JSON_BACKENDS = ["auto", "orjson", "msgspec", "stdlib"]
+
+    SUPPORTED_ENGINES = ["memory", "streaming", "sqlite", "parallel", "auto"]
 
     def __init__(self, key_file: Optional[str] = None):
         self.key_file = key_file or "keys.json"
@@ -59,6 +67,10 @@ class Config:
     def is_supported_spdx_version(version: str) -> bool:
         return version in Config.SUPPORTED_SPDX_VERSIONS
 
+    @staticmethod
+    def is_ingestible_spdx_version(version: str) -> bool:
+        return version in Config.INGESTIBLE_SPDX_VERSIONS
+
     @staticmethod
     def is_supported_output_format(fmt: str) -> bool:
         return fmt in Config.SUPPORTED_OUTPUT_FORMATS
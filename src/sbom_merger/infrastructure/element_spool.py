@@ -0,0 +1,69 @@
+import json
+import tempfile
+from typing import IO, Any, Dict, Iterator
+
+
+class ElementSpool:
+    # SPDX file and snippet records kept as JSON lines in anonymous temporary
+    # files, one per section, so a document can carry any number of them
+    # without holding the records in memory.
+
+    SECTIONS = ("files", "snippets")
+    READ_HINT = 1024 * 1024
+
+    def __init__(self) -> None:
+        self._files: Dict[str, IO[bytes]] = {}
+        self.counts: Dict[str, int] = dict.fromkeys(self.SECTIONS, 0)
+
+    def append(self, section: str, record: Dict[str, Any]) -> None:
+        spool = self._files.get(section)
+        if spool is None:
+            spool = self._files[section] = tempfile.TemporaryFile()
+        spool.seek(0, 2)
+        spool.write(json.dumps(record).encode("utf-8") + b"\n")
+        self.counts[section] += 1
+
+    def extend(self, other: "ElementSpool") -> None:
+        for section in self.SECTIONS:
+            for record in other.iter_records(section):
+                self.append(section, record)
+
+    def __len__(self) -> int:
+        return sum(self.counts.values())
+
+    def iter_records(self, section: str) -> Iterator[Dict[str, Any]]:
+        spool = self._files.get(section)
+        if spool is None:
+            return
+
+        # Track the read position explicitly: appends between batches move the
+        # shared file position.
+        offset = 0
+        while True:
+            spool.seek(offset)
+            lines = spool.readlines(self.READ_HINT)
+            if not lines:
+                return
+            offset = spool.tell()
+            for line in lines:
+                yield json.loads(line)
+
+    def element_ids(self) -> Iterator[str]:
+        for section in self.SECTIONS:
+            for record in self.iter_records(section):
+                yield record.get("SPDXID", "")
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Pickled copies (parse cache, process pool) carry the spooled bytes.
+        sections = {}
+        for section, spool in self._files.items():
+            spool.seek(0)
+            sections[section] = spool.read()
+        return {"sections": sections, "counts": self.counts}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self._files = {}
+        self.counts = state["counts"]
+        for section, data in state["sections"].items():
+            spool = self._files[section] = tempfile.TemporaryFile()
+            spool.write(data)
@@ -1,10 +1,41 @@
-import json
+import gzip
+import lzma
+import mmap
+from contextlib import contextmanager
 from pathlib import Path
-from typing import List, Tuple, Optional
+from typing import (
+    BinaryIO,
+    Iterable,
+    Iterator,
+    List,
+    Tuple,
+    Optional,
+    Union,
+    cast,
+)
+from .json_codec import get_json_codec
 
 
 class FileHandler:
 
+    COMPRESSION_SUFFIXES = {".gz": "gzip", ".xz": "xz", ".zst": "zstd"}
+    SBOM_FORMATS = {".json": "json", ".spdx": "tag-value", ".jsonld": "spdx3-jsonld"}
+    SBOM_SUFFIXES = list(SBOM_FORMATS)
+    OUTPUT_EXTENSIONS = {
+        "json": ".json",
+        "tag-value": ".spdx",
+        "spdx3-jsonld": ".jsonld",
+        "yaml": ".yaml",
+        "rdf": ".rdf",
+    }
+
+    # JSON inputs are told apart by a marker near the top of the file.
+    JSON_FORMAT_MARKERS = {
+        b'"@context"': "spdx3-jsonld",
+        b'"bomFormat"': "cyclonedx",
+    }
+    SNIFF_BYTES = 4096
+
     @staticmethod
     def discover_sbom_files(dependencies_dir: Path) -> Tuple[Path, List[Path]]:
         if not dependencies_dir.exists():
@@ -21,7 +52,11 @@ class FileHandler:
         parent_dir = dependencies_dir.parent
 
         root_sbom_pattern = "*_root.json"
-        root_sboms = list(parent_dir.glob(root_sbom_pattern))
+        root_sboms = [
+            f
+            for pattern in FileHandler.sbom_patterns("*_root")
+            for f in parent_dir.glob(pattern)
+        ]
 
         if not root_sboms:
             raise FileNotFoundError(
@@ -37,7 +72,12 @@ class FileHandler:
 
         root_sbom = root_sboms[0]
 
-        dependency_sboms = [f for f in dependencies_dir.glob("*.json") if f.is_file()]
+        dependency_sboms = [
+            f
+            for pattern in FileHandler.sbom_patterns("*")
+            for f in dependencies_dir.glob(pattern)
+            if f.is_file()
+        ]
 
         if not dependency_sboms:
             raise FileNotFoundError(f"No dependency SBOMs found in {dependencies_dir}")
@@ -45,21 +85,148 @@ class FileHandler:
         return root_sbom, dependency_sboms
 
     @staticmethod
-    def save_merged_sbom(sbom_data: dict, output_path: Path) -> None:
+    def sbom_patterns(stem_pattern: str) -> List[str]:
+        return [
+            f"{stem_pattern}{suffix}{compression}"
+            for suffix in FileHandler.SBOM_SUFFIXES
+            for compression in ["", *FileHandler.COMPRESSION_SUFFIXES]
+        ]
+
+    @staticmethod
+    def compression_of(file_path: Path) -> Optional[str]:
+        return FileHandler.COMPRESSION_SUFFIXES.get(file_path.suffix)
+
+    @staticmethod
+    def detect_format(file_path: Path) -> str:
+        suffix_path = file_path
+        if FileHandler.compression_of(file_path):
+            suffix_path = file_path.with_suffix("")
+
+        sbom_format = FileHandler.SBOM_FORMATS.get(suffix_path.suffix, "json")
+        if sbom_format == "json":
+            return FileHandler.sniff_json_format(file_path)
+        return sbom_format
+
+    @staticmethod
+    def sniff_json_format(file_path: Path) -> str:
+        try:
+            with FileHandler.open_sbom(file_path) as f:
+                head = f.read(FileHandler.SNIFF_BYTES)
+        except (OSError, ValueError, EOFError):
+            return "json"
+
+        for marker, sbom_format in FileHandler.JSON_FORMAT_MARKERS.items():
+            if marker in head:
+                return sbom_format
+        return "json"
+
+    @staticmethod
+    def sbom_stem(file_path: Path) -> str:
+        if FileHandler.compression_of(file_path):
+            file_path = file_path.with_suffix("")
+        return file_path.stem
+
+    @staticmethod
+    def open_sbom(file_path: Path) -> BinaryIO:
+        compression = FileHandler.compression_of(file_path)
+        if compression == "gzip":
+            return cast(BinaryIO, gzip.open(file_path, "rb"))
+        if compression == "xz":
+            return cast(BinaryIO, lzma.open(file_path, "rb"))
+        if compression == "zstd":
+            return FileHandler._open_zstd(file_path)
+        return open(file_path, "rb")
+
+    @staticmethod
+    def _open_zstd(file_path: Path) -> BinaryIO:
+        try:
+            from compression import zstd
+
+            return cast(BinaryIO, zstd.open(file_path, "rb"))
+        except ImportError:
+            pass
+
+        try:
+            import zstandard
+        except ImportError:
+            raise ValueError(
+                f"Reading {file_path.name} requires Python 3.14+ or the "
+                "'zstandard' package"
+            )
+
+        # Multi-frame files (zstd --adapt, pzstd, concatenated .zst files) are
+        # read to the end, like Python 3.14's zstd module reads them.
+        raw = open(file_path, "rb")
+        reader = zstandard.ZstdDecompressor().stream_reader(
+            raw, closefd=True, read_across_frames=True
+        )
+        return cast(BinaryIO, reader)
+
+    @staticmethod
+    @contextmanager
+    def read_sbom(file_path: Path) -> Iterator[Union[mmap.mmap, bytes]]:
+        # The whole input, for the codecs, none of which decodes incrementally:
+        # a compressed file is decompressed in full here. The streaming parser
+        # reads open_sbom() instead, a chunk at a time.
+        if FileHandler.compression_of(file_path) is None:
+            with FileHandler.map_file(file_path) as buffer:
+                yield buffer
+        else:
+            with FileHandler.open_sbom(file_path) as f:
+                yield f.read()
+
+    @staticmethod
+    @contextmanager
+    def map_file(file_path: Path) -> Iterator[Union[mmap.mmap, bytes]]:
+        with open(file_path, "rb") as f:
+            try:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except (ValueError, OSError):
+                # Empty files and non-regular files cannot be mapped.
+                yield f.read()
+                return
+
+            try:
+                yield mapped
+            finally:
+                mapped.close()
+
+    @staticmethod
+    def save_merged_sbom(
+        sbom_data: dict,
+        output_path: Path,
+        json_backend: str = "auto",
+        canonical: bool = False,
+    ) -> None:
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+
+        encoded = get_json_codec(json_backend).dumps(sbom_data, canonical=canonical)
+        with open(output_path, "wb") as f:
+            f.write(encoded)
+
+    @staticmethod
+    def save_lines(lines: Iterable[str], output_path: Path) -> None:
         output_path.parent.mkdir(parents=True, exist_ok=True)
 
         with open(output_path, "w", encoding="utf-8") as f:
-            json.dump(sbom_data, f, indent=2)
+            f.writelines(lines)
 
     @staticmethod
     def get_output_path(
-        root_sbom_path: Path, output_dir: Optional[Path] = None
+        root_sbom_path: Path,
+        output_dir: Optional[Path] = None,
+        output_format: str = "json",
     ) -> Path:
+        extension = FileHandler.OUTPUT_EXTENSIONS[output_format]
         if output_dir:
             output_dir.mkdir(parents=True, exist_ok=True)
-            base_name = root_sbom_path.stem.replace("_root", "_merged")
-            return output_dir / f"{base_name}.json"
+            base_name = FileHandler.sbom_stem(root_sbom_path).replace(
+                "_root", "_merged"
+            )
+            return output_dir / f"{base_name}{extension}"
         else:
             parent = root_sbom_path.parent
-            base_name = root_sbom_path.stem.replace("_root", "_merged")
-            return parent / f"{base_name}.json"
+            base_name = FileHandler.sbom_stem(root_sbom_path).replace(
+                "_root", "_merged"
+            )
+            return parent / f"{base_name}{extension}"
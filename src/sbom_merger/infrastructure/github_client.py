@@ -1,6 +1,7 @@
 import requests
 from typing import Optional, Dict, Any
 from pathlib import Path
+from .file_handler import FileHandler
 
 
 class GitHubClient:
@@ -27,12 +28,10 @@ class GitHubClient:
         if not commit_message:
             commit_message = f"Add merged SBOM: {file_path.name}"
 
-        with open(file_path, "r", encoding="utf-8") as f:
-            content = f.read()
-
         import base64
 
-        encoded_content = base64.b64encode(content.encode()).decode()
+        with FileHandler.map_file(file_path) as content:
+            encoded_content = base64.b64encode(content).decode()
 
         url = f"https://api.github.com/repos/{owner}/{repo}/contents/{target_path}"
 
@@ -0,0 +1,90 @@
+import sqlite3
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+IdKey = Tuple[str, str, str]
+
+
+class IdTable:
+    # Merged package SPDXIDs by (name, version, ecosystem), kept in SQLite so
+    # that runs and projects, including concurrent ones, can share it. The
+    # whole table is read at once: a query per package costs about as much as
+    # generating the ID. It is read once per instance, and saved IDs are added
+    # to the loaded dict, so the merges of a batch share one copy.
+
+    # Bumped whenever generated IDs change; older tables are then discarded.
+    FORMAT_VERSION = 1
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS ids (
+            name TEXT NOT NULL,
+            version TEXT NOT NULL,
+            ecosystem TEXT NOT NULL,
+            spdx_id TEXT NOT NULL,
+            PRIMARY KEY (name, version, ecosystem)
+        ) WITHOUT ROWID;
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._ids: Optional[Dict[IdKey, str]] = None
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Worker processes read the table themselves rather than receive a
+        # pickled copy of it with every task.
+        return {"path": self.path, "_ids": None}
+
+    def _connect(self) -> sqlite3.Connection:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(self.path, timeout=30)
+        (version,) = connection.execute("PRAGMA user_version").fetchone()
+        if version != self.FORMAT_VERSION:
+            with connection:
+                connection.execute("DROP TABLE IF EXISTS ids")
+                connection.execute(f"PRAGMA user_version = {self.FORMAT_VERSION}")
+        connection.executescript(self.SCHEMA)
+        return connection
+
+    def load(self) -> Dict[IdKey, str]:
+        if self._ids is None:
+            self._ids = self._read()
+        return self._ids
+
+    def _read(self) -> Dict[IdKey, str]:
+        if not self.path.exists():
+            return {}
+        try:
+            connection = self._connect()
+        except sqlite3.DatabaseError:
+            return {}
+        try:
+            rows = connection.execute(
+                "SELECT name, version, ecosystem, spdx_id FROM ids"
+            )
+            return {
+                (name, version, eco): spdx_id for name, version, eco, spdx_id in rows
+            }
+        finally:
+            connection.close()
+
+    def save(self, entries: Iterable[Tuple[IdKey, str]]) -> None:
+        # Like the parse cache, a table that cannot be written is skipped:
+        # it only ever saves work.
+        entries = list(entries)
+        if self._ids is not None:
+            self._ids.update(entries)
+        try:
+            connection = self._connect()
+        except sqlite3.Error:
+            return
+        try:
+            with connection:
+                connection.executemany(
+                    "INSERT OR IGNORE INTO ids (name, version, ecosystem, spdx_id) "
+                    "VALUES (?, ?, ?, ?)",
+                    ((*key, spdx_id) for key, spdx_id in entries),
+                )
+        except sqlite3.Error:
+            pass
+        finally:
+            connection.close()
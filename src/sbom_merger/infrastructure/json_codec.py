@@ -0,0 +1,149 @@
+import importlib
+import json
+import math
+import mmap
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+JsonInput = Union[bytes, bytearray, memoryview, mmap.mmap]
+
+
+class JsonCodec:
+    name = "base"
+
+    def loads(self, data: JsonInput) -> Any:
+        raise NotImplementedError
+
+    def dumps(self, obj: Any, canonical: bool = False) -> bytes:
+        raise NotImplementedError
+
+
+def canonical_float(value: float) -> str:
+    # Floats as orjson and msgspec write them: the shortest round-trip digits,
+    # like repr, but with exponents unpadded and without "+", fixed notation
+    # down to 1e-5, and null for values JSON cannot represent.
+    if math.isnan(value) or math.isinf(value):
+        return "null"
+    text = repr(value)
+    mantissa, _, exponent = text.partition("e")
+    if not exponent:
+        return text
+    power = int(exponent)
+    if power == -5:
+        sign = "-" if mantissa.startswith("-") else ""
+        return f"{sign}0.0000{mantissa.lstrip('-').replace('.', '')}"
+    return f"{mantissa}e{power}"
+
+
+class _CanonicalJsonEncoder(json.JSONEncoder):
+    # The stdlib encoder with its float formatting replaced, so that canonical
+    # bytes do not depend on which backend is installed.
+
+    def iterencode(self, o: Any, _one_shot: bool = False) -> Iterator[str]:
+        iterencode = json.encoder._make_iterencode(  # type: ignore[attr-defined]
+            {} if self.check_circular else None,
+            self.default,
+            json.encoder.encode_basestring,  # type: ignore[attr-defined]
+            self.indent,
+            canonical_float,
+            self.key_separator,
+            self.item_separator,
+            self.sort_keys,
+            self.skipkeys,
+            _one_shot,
+        )
+        chunks: Iterator[str] = iterencode(o, 0)
+        return chunks
+
+
+class StdlibJsonCodec(JsonCodec):
+    name = "stdlib"
+
+    def loads(self, data: JsonInput) -> Any:
+        if isinstance(data, (bytes, bytearray)):
+            return json.loads(data)
+        # The stdlib decoder only reads text, so a mapped file is decoded into
+        # one str: a full copy of the input, though without a bytes copy
+        # first. orjson and msgspec read the buffer itself.
+        return json.loads(str(data, "utf-8"))
+
+    def dumps(self, obj: Any, canonical: bool = False) -> bytes:
+        if canonical:
+            text = _CanonicalJsonEncoder(
+                indent=2, sort_keys=True, ensure_ascii=False
+            ).encode(obj)
+        else:
+            text = json.dumps(obj, indent=2)
+        return text.encode("utf-8")
+
+
+class OrjsonCodec(JsonCodec):
+    name = "orjson"
+
+    def __init__(self) -> None:
+        self._orjson = importlib.import_module("orjson")
+
+    def loads(self, data: JsonInput) -> Any:
+        with memoryview(data) as view:
+            return self._orjson.loads(view)
+
+    def dumps(self, obj: Any, canonical: bool = False) -> bytes:
+        option = self._orjson.OPT_INDENT_2
+        if canonical:
+            option |= self._orjson.OPT_SORT_KEYS
+        result: bytes = self._orjson.dumps(obj, option=option)
+        return result
+
+
+class MsgspecCodec(JsonCodec):
+    name = "msgspec"
+
+    def __init__(self) -> None:
+        self._json = importlib.import_module("msgspec.json")
+        self._decoder = self._json.Decoder()
+
+    def loads(self, data: JsonInput) -> Any:
+        return self._decoder.decode(data)
+
+    def dumps(self, obj: Any, canonical: bool = False) -> bytes:
+        encoded = self._json.encode(obj, order="sorted" if canonical else None)
+        result: bytes = self._json.format(encoded, indent=2)
+        return result
+
+
+_BACKENDS = {
+    codec.name: codec for codec in (OrjsonCodec, MsgspecCodec, StdlibJsonCodec)
+}
+_AUTO_PREFERENCE = ["orjson", "msgspec", "stdlib"]
+_instances: Dict[str, JsonCodec] = {}
+
+
+def _load_backend(name: str) -> Optional[JsonCodec]:
+    if name not in _instances:
+        try:
+            _instances[name] = _BACKENDS[name]()
+        except ImportError:
+            return None
+    return _instances[name]
+
+
+def available_json_backends() -> List[str]:
+    return [name for name in _AUTO_PREFERENCE if _load_backend(name) is not None]
+
+
+def get_json_codec(backend: str = "auto") -> JsonCodec:
+    if backend == "auto":
+        for name in _AUTO_PREFERENCE:
+            codec = _load_backend(name)
+            if codec is not None:
+                return codec
+
+    if backend not in _BACKENDS:
+        raise ValueError(
+            f"Unsupported JSON backend: {backend}. "
+            f"Supported: auto, {', '.join(_AUTO_PREFERENCE)}"
+        )
+
+    codec = _load_backend(backend)
+    if codec is None:
+        raise ValueError(f"JSON backend '{backend}' is not installed")
+    return codec
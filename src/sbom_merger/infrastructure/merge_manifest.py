@@ -0,0 +1,74 @@
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Optional
+from .json_codec import get_json_codec
+
+
+class MergeManifest:
+    # Content hashes and merge contributions of the inputs of the last merge,
+    # kept next to the merged output so unchanged inputs are not parsed again.
+
+    FORMAT_VERSION = 1
+    SUFFIX = ".manifest.json"
+
+    def __init__(self, path: Path, options: Dict[str, Any], json_backend: str = "auto"):
+        self.path = path
+        self.options = options
+        self.codec = get_json_codec(json_backend)
+        self.entries = self._load()
+
+    @staticmethod
+    def path_for(output_path: Path) -> Path:
+        return output_path.with_suffix(MergeManifest.SUFFIX)
+
+    @staticmethod
+    def file_hash(file_path: Path) -> str:
+        with open(file_path, "rb") as f:
+            return hashlib.file_digest(f, "sha256").hexdigest()
+
+    @staticmethod
+    def key(file_path: Path) -> str:
+        return str(file_path.resolve())
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            with open(self.path, "rb") as f:
+                data = self.codec.loads(f.read())
+        except (OSError, ValueError):
+            return {}
+
+        # Contributions depend on how inputs were parsed; other options mean
+        # a full merge.
+        if not isinstance(data, dict) or data.get("version") != self.FORMAT_VERSION:
+            return {}
+        if data.get("options") != self.options:
+            return {}
+        inputs: Dict[str, Dict[str, Any]] = data.get("inputs", {})
+        return inputs
+
+    def lookup(self, file_path: Path, digest: str) -> Optional[Dict[str, Any]]:
+        entry = self.entries.get(self.key(file_path))
+        if entry is not None and entry.get("sha256") == digest:
+            return entry
+        return None
+
+    def save(self, entries: Dict[str, Dict[str, Any]]) -> None:
+        data = {
+            "version": self.FORMAT_VERSION,
+            "options": self.options,
+            "inputs": entries,
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        fd, tmp_name = tempfile.mkstemp(dir=self.path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(self.codec.dumps(data))
+            # Atomic rename: an interrupted run leaves the previous manifest.
+            os.replace(tmp_name, self.path)
+        except OSError:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+        self.entries = entries
@@ -0,0 +1,180 @@
+import hashlib
+import os
+import pickle  # nosec B403 - cache entries are only written by this tool
+import tempfile
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None  # type: ignore[assignment]
+
+
+class ParseCache:
+
+    FORMAT_VERSION = 2
+    ENTRY_SUFFIX = ".pickle"
+    DEFAULT_MAX_BYTES = 1024 * 1024 * 1024
+
+    def __init__(self, cache_dir: Path, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._estimated_bytes: Optional[int] = None
+
+    @staticmethod
+    def content_key(file_path: Path, parse_options: Dict[str, Any]) -> str:
+        with open(file_path, "rb") as f:
+            digest = hashlib.file_digest(f, "sha256")
+
+        # The file name is stamped on every parsed element, so it is part of the
+        # key alongside the content and the options that shape the result.
+        options = ",".join(f"{k}={v}" for k, v in sorted(parse_options.items()))
+        digest.update(
+            f"\0{ParseCache.FORMAT_VERSION}\0{file_path.name}\0{options}".encode()
+        )
+        return digest.hexdigest()
+
+    def _entry_path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}{self.ENTRY_SUFFIX}"
+
+    def get(self, key: str) -> Optional[Any]:
+        path = self._entry_path(key)
+        try:
+            with open(path, "rb") as f:
+                value = pickle.load(f)  # nosec B301 - trusted local cache
+        except FileNotFoundError:
+            return None
+        except Exception:
+            # A truncated entry, or one written against an older model layout,
+            # can fail in any number of ways (a changed dataclass or slots
+            # layout raises TypeError or ValueError); each is just a miss.
+            self._discard(path)
+            return None
+
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return value
+
+    def put(self, key: str, value: Any) -> None:
+        path = self._entry_path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+            size = os.path.getsize(tmp_name)
+            # Atomic rename: concurrent readers see either no entry or a whole one.
+            os.replace(tmp_name, path)
+        except OSError:
+            self._discard(Path(tmp_name))
+            return
+
+        if self._estimated_bytes is None:
+            self._estimated_bytes = self.total_size()
+        else:
+            self._estimated_bytes += size
+
+        if self._estimated_bytes > self.max_bytes:
+            self.evict()
+
+    def _entries(self) -> List[Tuple[float, int, Path]]:
+        entries = []
+        for path in self.cache_dir.glob(f"*/*{self.ENTRY_SUFFIX}"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def total_size(self) -> int:
+        return sum(size for _, size, _ in self._entries())
+
+    def evict(self) -> None:
+        with self._eviction_lock() as acquired:
+            if not acquired:
+                return
+
+            entries = sorted(self._entries())
+            total = sum(size for _, size, _ in entries)
+            for _, size, path in entries:
+                if total <= self.max_bytes:
+                    break
+                self._discard(path)
+                total -= size
+
+            self._estimated_bytes = total
+
+    @contextmanager
+    def _eviction_lock(self) -> Iterator[bool]:
+        if fcntl is None:  # pragma: no cover - Windows
+            yield True
+            return
+
+        with open(self.cache_dir / ".lock", "a") as lock_file:
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                # Another process is already evicting.
+                yield False
+                return
+
+            try:
+                yield True
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    @staticmethod
+    def _discard(path: Path) -> None:
+        try:
+            path.unlink()
+        except OSError:
+            pass
+
+
+class MemoryParseCache(ParseCache):
+    # Process-local ParseCache for runs that merge many projects in one
+    # process. Entries are kept pickled, so every hit is a private copy the
+    # merge may modify; least recently used entries go first past max_bytes.
+
+    def __init__(self, max_bytes: int = ParseCache.DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._entries_by_key: "OrderedDict[str, bytes]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            data = self._entries_by_key.get(key)
+            if data is None:
+                return None
+            self._entries_by_key.move_to_end(key)
+        return pickle.loads(data)  # nosec B301 - pickled by this process
+
+    def put(self, key: str, value: Any) -> None:
+        data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            previous = self._entries_by_key.pop(key, None)
+            if previous is not None:
+                self._size -= len(previous)
+            self._entries_by_key[key] = data
+            self._size += len(data)
+        if self._size > self.max_bytes:
+            self.evict()
+
+    def total_size(self) -> int:
+        return self._size
+
+    def evict(self) -> None:
+        with self._lock:
+            while self._size > self.max_bytes and self._entries_by_key:
+                _, data = self._entries_by_key.popitem(last=False)
+                self._size -= len(data)
@@ -0,0 +1,140 @@
+import os
+import sqlite3
+import tempfile
+from pathlib import Path
+from typing import Iterable, Iterator, Optional, Set, Tuple
+from .bloom_filter import BloomFilter
+
+
+class SqliteMergeStore:
+    # Merged packages and relationships staged in a temporary SQLite database,
+    # with unique indexes on their dedup keys. Bloom filters sit in front of
+    # the indexes, so only keys that may have been seen cost a lookup.
+
+    SCHEMA = """
+        PRAGMA journal_mode = OFF;
+        PRAGMA synchronous = OFF;
+        CREATE TABLE packages (
+            seq INTEGER PRIMARY KEY,
+            spdx_id TEXT NOT NULL UNIQUE,
+            record TEXT NOT NULL
+        );
+        CREATE TABLE relationships (
+            seq INTEGER PRIMARY KEY,
+            element TEXT NOT NULL,
+            related TEXT NOT NULL,
+            type TEXT NOT NULL,
+            record TEXT NOT NULL,
+            UNIQUE (element, related, type)
+        );
+        CREATE TABLE element_ids (spdx_id TEXT PRIMARY KEY) WITHOUT ROWID;
+    """
+
+    # Relationships, in the order they were added, with an endpoint that is
+    # neither a package nor another known element.
+    DANGLING_QUERY = """
+        SELECT element, related, element_known, related_known FROM (
+            SELECT r.seq, r.element, r.related,
+                EXISTS (SELECT 1 FROM packages WHERE spdx_id = r.element)
+                    OR EXISTS (SELECT 1 FROM element_ids WHERE spdx_id = r.element)
+                    AS element_known,
+                EXISTS (SELECT 1 FROM packages WHERE spdx_id = r.related)
+                    OR EXISTS (SELECT 1 FROM element_ids WHERE spdx_id = r.related)
+                    AS related_known
+            FROM relationships r
+        )
+        WHERE NOT (element_known AND related_known)
+        ORDER BY seq
+    """
+
+    def __init__(self, expected_ids: int, directory: Optional[Path] = None):
+        fd, name = tempfile.mkstemp(suffix=".sqlite", dir=directory)
+        os.close(fd)
+        self.path = Path(name)
+        self.connection = sqlite3.connect(name)
+        self.connection.executescript(self.SCHEMA)
+
+        self.package_filter = BloomFilter(expected_ids)
+        self.relationship_filter = BloomFilter(expected_ids)
+        self.package_count = 0
+        self.relationship_count = 0
+        self.probes = 0
+
+    def _exists(self, query: str, parameters: Tuple[str, ...]) -> bool:
+        self.probes += 1
+        return self.connection.execute(query, parameters).fetchone() is not None
+
+    def has_package(self, spdx_id: str) -> bool:
+        return spdx_id in self.package_filter and self._exists(
+            "SELECT 1 FROM packages WHERE spdx_id = ?", (spdx_id,)
+        )
+
+    def insert_package(self, spdx_id: str, record: str) -> None:
+        self.package_filter.add(spdx_id)
+        self.connection.execute(
+            "INSERT INTO packages (spdx_id, record) VALUES (?, ?)", (spdx_id, record)
+        )
+        self.package_count += 1
+
+    def add_package(self, spdx_id: str, record: str) -> bool:
+        if self.has_package(spdx_id):
+            return False
+        self.insert_package(spdx_id, record)
+        return True
+
+    def has_relationship(
+        self, element: str, related: str, relationship_type: str
+    ) -> bool:
+        key = (element, related, relationship_type)
+        return "\0".join(key) in self.relationship_filter and self._exists(
+            "SELECT 1 FROM relationships "
+            "WHERE element = ? AND related = ? AND type = ?",
+            key,
+        )
+
+    def insert_relationship(
+        self, element: str, related: str, relationship_type: str, record: str
+    ) -> None:
+        self.relationship_filter.add("\0".join((element, related, relationship_type)))
+        self.connection.execute(
+            "INSERT INTO relationships (element, related, type, record) "
+            "VALUES (?, ?, ?, ?)",
+            (element, related, relationship_type, record),
+        )
+        self.relationship_count += 1
+
+    def add_relationship(
+        self, element: str, related: str, relationship_type: str, record: str
+    ) -> bool:
+        if self.has_relationship(element, related, relationship_type):
+            return False
+        self.insert_relationship(element, related, relationship_type, record)
+        return True
+
+    def add_element_ids(self, element_ids: Iterable[str]) -> None:
+        self.connection.executemany(
+            "INSERT OR IGNORE INTO element_ids (spdx_id) VALUES (?)",
+            ((element_id,) for element_id in element_ids),
+        )
+
+    def iter_records(self, table: str) -> Iterator[str]:
+        if table not in ("packages", "relationships"):
+            raise ValueError(f"Unknown table: {table}")
+        # Rowid order is insertion order, so rows come back as they were added.
+        for (record,) in self.connection.execute(
+            f"SELECT record FROM {table} ORDER BY seq"  # nosec B608 - fixed names
+        ):
+            yield record
+
+    def iter_dangling_endpoints(self) -> Iterator[Tuple[str, str, Set[str]]]:
+        # Each with the set of its endpoints that do resolve.
+        rows = self.connection.execute(self.DANGLING_QUERY)
+        for element, related, element_known, related_known in rows:
+            resolved = {element} if element_known else set()
+            if related_known:
+                resolved.add(related)
+            yield element, related, resolved
+
+    def close(self) -> None:
+        self.connection.close()
+        self.path.unlink(missing_ok=True)
@@ -0,0 +1,185 @@
+import dataclasses
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Type
+from ..domain.models import MergeResult, MergeStatistics
+from ..infrastructure.file_handler import FileHandler
+from .merge_planner import MergePlanner
+from .merger import SbomMerger
+from .parse_stage import check_executor, create_executor, resolve_jobs
+from .partitioned_merger import PartitionedMerger
+from .reporter import MergeReporter
+from .sqlite_merger import SqliteMerger
+from .streaming_merger import StreamingMerger
+from .writers import save_merged_document
+
+# Engines other than "memory", which write their output while merging.
+FILE_ENGINES: Dict[str, Type[StreamingMerger]] = {
+    "streaming": StreamingMerger,
+    "sqlite": SqliteMerger,
+    "parallel": PartitionedMerger,
+}
+
+
+@dataclass
+class ProjectOutcome:
+    project: str
+    dependencies_dir: Path
+    engine: Optional[str] = None
+    output_path: Optional[Path] = None
+    report_path: Optional[Path] = None
+    statistics: Optional[MergeStatistics] = None
+    error: Optional[str] = None
+
+    @property
+    def succeeded(self) -> bool:
+        return self.error is None
+
+    def to_dict(self) -> Dict[str, Any]:
+        statistics = None
+        if self.statistics is not None:
+            statistics = dataclasses.asdict(self.statistics)
+            statistics["validation_errors"] = len(self.statistics.validation_errors)
+            statistics["validation_warnings"] = len(self.statistics.validation_warnings)
+        return {
+            "project": self.project,
+            "dependencies_dir": str(self.dependencies_dir),
+            "status": "merged" if self.succeeded else "failed",
+            "engine": self.engine,
+            "output": str(self.output_path) if self.output_path else None,
+            "report": str(self.report_path) if self.report_path else None,
+            "error": self.error,
+            "statistics": statistics,
+        }
+
+
+class BatchMerger:
+    # Merges every <project>/dependencies directory of an SBOM export in one
+    # process, `jobs` projects at a time. Each project is merged on its own,
+    # with a fresh merger, exactly as a single-project run would merge it;
+    # a shared parse cache spares re-parsing dependency SBOMs that several
+    # projects have in common.
+
+    INDEX_NAME = "merge_index.json"
+
+    def __init__(
+        self,
+        output_dir: Optional[Path] = None,
+        output_format: str = "json",
+        engine: str = "memory",
+        canonical_json: bool = False,
+        jobs: int = 1,
+        executor: str = "thread",
+        memory_budget: Optional[int] = None,
+        **merger_options,
+    ):
+        self.output_dir = output_dir
+        self.output_format = output_format
+        self.engine = engine
+        self.canonical_json = canonical_json
+        check_executor(executor)
+        self.jobs = resolve_jobs(jobs)
+        self.executor = executor
+        self.memory_budget = memory_budget
+        self.merger_options = merger_options
+
+    @staticmethod
+    def discover_projects(export_root: Path) -> List[Path]:
+        if not export_root.is_dir():
+            raise FileNotFoundError(f"Export directory not found: {export_root}")
+
+        return sorted(
+            path for path in export_root.glob("*/dependencies") if path.is_dir()
+        )
+
+    def merge_project(self, dependencies_dir: Path) -> ProjectOutcome:
+        outcome = ProjectOutcome(dependencies_dir.parent.name, dependencies_dir)
+        try:
+            root_sbom, dep_sboms = FileHandler.discover_sbom_files(dependencies_dir)
+            output_path = FileHandler.get_output_path(
+                root_sbom, self.output_dir, self.output_format
+            )
+            result = self._merge(root_sbom, dep_sboms, output_path)
+            MergeReporter.generate_report(result, output_path)
+        except Exception as e:
+            outcome.error = str(e)
+            return outcome
+
+        outcome.engine = result.plan.engine if result.plan else self.engine
+        outcome.output_path = output_path
+        outcome.report_path = output_path.parent / f"{output_path.stem}_merge_report.md"
+        outcome.statistics = result.statistics
+        return outcome
+
+    def _merge(
+        self, root_sbom: Path, dep_sboms: List[Path], output_path: Path
+    ) -> MergeResult:
+        # Parallelism is across projects, so each merge parses serially, and
+        # an auto-planned merge gets its share of the memory budget.
+        options = dict(self.merger_options, jobs=1)
+        engine, plan = self.engine, None
+        if engine == "auto":
+            memory_budget = self.memory_budget or MergePlanner.default_memory_budget()
+            plan = MergePlanner.plan(
+                [root_sbom, *dep_sboms],
+                memory_budget=max(1, memory_budget // self.jobs),
+                jobs=1,
+                memory_only=MergePlanner.memory_only_reason(self.output_format),
+            )
+            engine = plan.engine
+
+        if engine != "memory":
+            merger = FILE_ENGINES[engine](**options)
+            result = merger.merge_to_file(
+                root_sbom, dep_sboms, output_path, canonical=self.canonical_json
+            )
+            result.plan = plan
+            return result
+
+        result = SbomMerger(**options).merge_sboms(root_sbom, dep_sboms)
+        result.plan = plan
+        save_merged_document(
+            result.merged_document,
+            output_path,
+            self.output_format,
+            options.get("json_backend", "auto"),
+            self.canonical_json,
+        )
+        return result
+
+    def run(self, dependency_dirs: List[Path]) -> Iterator[ProjectOutcome]:
+        # Outcomes come back in input order, whatever order they finish in.
+        if self.jobs == 1 or len(dependency_dirs) < 2:
+            for dependencies_dir in dependency_dirs:
+                yield self.merge_project(dependencies_dir)
+            return
+
+        workers = min(self.jobs, len(dependency_dirs))
+        with create_executor(self.executor, workers) as pool:
+            futures = [
+                pool.submit(self.merge_project, dependencies_dir)
+                for dependencies_dir in dependency_dirs
+            ]
+            for future in futures:
+                yield future.result()
+
+    @staticmethod
+    def write_index(
+        outcomes: List[ProjectOutcome],
+        index_path: Path,
+        export_root: Path,
+        processing_time_seconds: float,
+        json_backend: str = "auto",
+    ) -> None:
+        failed = sum(1 for outcome in outcomes if not outcome.succeeded)
+        index = {
+            "export_root": str(export_root),
+            "generated": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "projects": len(outcomes),
+            "merged": len(outcomes) - failed,
+            "failed": failed,
+            "processing_time_seconds": round(processing_time_seconds, 3),
+            "results": [outcome.to_dict() for outcome in outcomes],
+        }
+        FileHandler.save_merged_sbom(index, index_path, json_backend)
@@ -0,0 +1,223 @@
+import re
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from ..domain.models import BaseSpdxPackage, SpdxDocument, SpdxRelationship
+from ..infrastructure.config import Config
+from ..infrastructure.file_handler import FileHandler
+from ..infrastructure.json_codec import get_json_codec
+from .parser import SpdxParser
+from .validator import DocumentValidator
+
+DOCUMENT_REF = "SPDXRef-DOCUMENT"
+
+# SPDX identifiers only allow letters, digits, "." and "-".
+_INVALID_ID_CHARS = re.compile(r"[^A-Za-z0-9.-]+")
+
+
+class CycloneDxParser:
+
+    @staticmethod
+    def is_cyclonedx(data: Any) -> bool:
+        return isinstance(data, dict) and data.get("bomFormat") == "CycloneDX"
+
+    @staticmethod
+    def parse_sbom_file(
+        file_path: Path,
+        json_backend: str = "auto",
+        lazy: bool = False,
+        validator: Optional[DocumentValidator] = None,
+    ) -> SpdxDocument:
+        with FileHandler.read_sbom(file_path) as buffer:
+            data = get_json_codec(json_backend).loads(buffer)
+        return CycloneDxParser.build_document(data, file_path.name, lazy, validator)
+
+    @staticmethod
+    def iter_components(
+        components: List[Dict[str, Any]], parent_ref: Optional[str] = None
+    ) -> Iterator[Tuple[Optional[str], Dict[str, Any]]]:
+        for component in components:
+            yield parent_ref, component
+            yield from CycloneDxParser.iter_components(
+                component.get("components", []), component.get("bom-ref")
+            )
+
+    @staticmethod
+    def build_document(
+        data: Dict[str, Any],
+        source: str,
+        lazy: bool = False,
+        validator: Optional[DocumentValidator] = None,
+    ) -> SpdxDocument:
+        metadata = data.get("metadata", {})
+        root_component = metadata.get("component")
+
+        entries = list(CycloneDxParser.iter_components(data.get("components", [])))
+        if root_component:
+            entries.insert(0, (None, root_component))
+
+        # One bom-ref -> SPDXID index serves every edge lookup below.
+        index: Dict[str, str] = {}
+        used_ids: Dict[str, int] = {}
+        records = []
+        for position, (parent_ref, component) in enumerate(entries):
+            bom_ref = component.get("bom-ref") or f"component-{position}"
+            if bom_ref in index:
+                continue
+            record = CycloneDxParser._package_record(component)
+            record["SPDXID"] = index[bom_ref] = CycloneDxParser._spdx_id(
+                bom_ref, used_ids
+            )
+            records.append((parent_ref, record))
+
+        packages: List[BaseSpdxPackage] = [
+            SpdxParser.build_package(record, source, lazy) for _, record in records
+        ]
+
+        def resolve(bom_ref: str) -> str:
+            return index.get(bom_ref) or CycloneDxParser._spdx_id(bom_ref, {})
+
+        relationships: List[SpdxRelationship] = []
+        if root_component:
+            relationships.append(
+                SpdxParser.make_relationship(
+                    DOCUMENT_REF, "DESCRIBES", packages[0].spdx_id, source
+                )
+            )
+
+        for parent_ref, record in records:
+            if parent_ref is not None:
+                relationships.append(
+                    SpdxParser.make_relationship(
+                        resolve(parent_ref), "CONTAINS", record["SPDXID"], source
+                    )
+                )
+
+        for dependency in data.get("dependencies", []):
+            element_id = resolve(dependency.get("ref", ""))
+            for target in dependency.get("dependsOn", []):
+                relationships.append(
+                    SpdxParser.make_relationship(
+                        element_id, "DEPENDS_ON", resolve(target), source
+                    )
+                )
+
+        serial = data.get("serialNumber", "")
+        name = root_component.get("name", "") if root_component else ""
+        header = {
+            "spdxVersion": Config.SUPPORTED_SPDX_VERSIONS[-1],
+            "dataLicense": "CC0-1.0",
+            "SPDXID": DOCUMENT_REF,
+            "name": name or serial or source,
+            "documentNamespace": serial or f"urn:cyclonedx:{source}",
+            "creationInfo": CycloneDxParser._creation_info(metadata),
+            "comment": (
+                f"Converted from CycloneDX {data.get('specVersion', '')}".rstrip()
+            ),
+        }
+        if validator is not None:
+            # Conversion builds its own element lists; feed them to the
+            # validator before the document is assembled.
+            for pkg in packages:
+                validator.add_package(pkg)
+            for rel in relationships:
+                validator.add_relationship(rel)
+        return SpdxParser.build_document(header, packages, relationships, source)
+
+    @staticmethod
+    def _spdx_id(bom_ref: str, used_ids: Dict[str, int]) -> str:
+        base = "SPDXRef-" + (_INVALID_ID_CHARS.sub("-", bom_ref).strip("-") or "ref")
+        count = used_ids.get(base, 0)
+        used_ids[base] = count + 1
+        return base if count == 0 else f"{base}-{count}"
+
+    @staticmethod
+    def _package_record(component: Dict[str, Any]) -> Dict[str, Any]:
+        # CycloneDX components carry no SPDX file analysis.
+        record: Dict[str, Any] = {
+            "name": component.get("name", ""),
+            "filesAnalyzed": False,
+        }
+        if component.get("version"):
+            record["versionInfo"] = component["version"]
+        if component.get("copyright"):
+            record["copyrightText"] = component["copyright"]
+
+        license_expression = CycloneDxParser._license_expression(
+            component.get("licenses", [])
+        )
+        if license_expression:
+            record["licenseConcluded"] = license_expression
+
+        for reference in component.get("externalReferences", []):
+            if reference.get("type") == "distribution" and reference.get("url"):
+                record["downloadLocation"] = reference["url"]
+                break
+
+        external_refs = []
+        if component.get("purl"):
+            external_refs.append(
+                {
+                    "referenceCategory": "PACKAGE-MANAGER",
+                    "referenceType": "purl",
+                    "referenceLocator": component["purl"],
+                }
+            )
+        if component.get("cpe"):
+            external_refs.append(
+                {
+                    "referenceCategory": "SECURITY",
+                    "referenceType": "cpe23Type",
+                    "referenceLocator": component["cpe"],
+                }
+            )
+        if external_refs:
+            record["externalRefs"] = external_refs
+        return record
+
+    @staticmethod
+    def _license_expression(licenses: List[Dict[str, Any]]) -> Optional[str]:
+        terms: List[str] = []
+        for choice in licenses:
+            if "expression" in choice:
+                terms.append(choice["expression"])
+                continue
+            license_info = choice.get("license", {})
+            if license_info.get("id"):
+                terms.append(license_info["id"])
+            elif license_info.get("name"):
+                name = _INVALID_ID_CHARS.sub("-", license_info["name"]).strip("-")
+                terms.append(f"LicenseRef-{name}")
+
+        if not terms:
+            return None
+        if len(terms) == 1:
+            return terms[0]
+        return " AND ".join(f"({term})" if " " in term else term for term in terms)
+
+    @staticmethod
+    def _creation_info(metadata: Dict[str, Any]) -> Dict[str, Any]:
+        tools = metadata.get("tools", [])
+        if isinstance(tools, dict):
+            # CycloneDX 1.5+ groups tools into components and services.
+            tools = tools.get("components", []) + tools.get("services", [])
+
+        creators = []
+        for tool in tools:
+            name = " ".join(
+                part for part in (tool.get("name"), tool.get("version")) if part
+            )
+            if name:
+                creators.append(f"Tool: {name}")
+        for author in metadata.get("authors", []):
+            if author.get("name"):
+                creators.append(f"Person: {author['name']}")
+        for key in ("manufacture", "manufacturer", "supplier"):
+            organization = metadata.get(key) or {}
+            if organization.get("name"):
+                creators.append(f"Organization: {organization['name']}")
+                break
+
+        creation_info: Dict[str, Any] = {"creators": creators}
+        if metadata.get("timestamp"):
+            creation_info["created"] = metadata["timestamp"]
+        return creation_info
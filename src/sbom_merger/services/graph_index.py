@@ -0,0 +1,239 @@
+from array import array
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from ..domain.models import SpdxDocument, StringTable
+from .parser import SpdxParser
+
+
+def compress(node_count: int, sources: array, targets: array) -> Tuple[array, array]:
+    # Counting sort of the edges by source: the targets of node i are
+    # adjacency[offsets[i]:offsets[i + 1]], in the order the edges came.
+    offsets = array("i", [0]) * (node_count + 1)
+    for source in sources:
+        offsets[source + 1] += 1
+    for node in range(node_count):
+        offsets[node + 1] += offsets[node]
+
+    positions = offsets[:-1]
+    adjacency = array("i", [0]) * len(sources)
+    for source, target in zip(sources, targets):
+        adjacency[positions[source]] = target
+        positions[source] += 1
+    return offsets, adjacency
+
+
+class DependencyGraph:
+    # The dependency edges of a merged document as compressed sparse rows, in
+    # both directions, over integer node IDs: the string codes of the element
+    # SPDXIDs. Every query visits only what it reaches, so none costs more
+    # than one pass over the nodes and edges.
+
+    # Relationship types read as dependency edges, and whether the related
+    # element is the dependent rather than the dependency.
+    DEPENDENCY_TYPES: Dict[str, bool] = {
+        "DEPENDS_ON": False,
+        "DEPENDENCY_OF": True,
+        "BUILD_DEPENDENCY_OF": True,
+        "DEV_DEPENDENCY_OF": True,
+        "OPTIONAL_DEPENDENCY_OF": True,
+        "PROVIDED_DEPENDENCY_OF": True,
+        "RUNTIME_DEPENDENCY_OF": True,
+        "TEST_DEPENDENCY_OF": True,
+    }
+
+    QUERIES = ("dependencies", "dependents", "reachable", "path", "depth")
+
+    def __init__(
+        self,
+        nodes: StringTable,
+        sources: array,
+        targets: array,
+        roots: List[int],
+        labels: Dict[int, Tuple[str, Optional[str]]],
+    ):
+        self.nodes = nodes
+        self.roots = roots
+        self.labels = labels
+        self.edge_count = len(sources)
+        self.forward = compress(len(nodes), sources, targets)
+        self.reverse = compress(len(nodes), targets, sources)
+        self._by_name: Dict[str, List[int]] = {}
+        for node, (name, _) in labels.items():
+            self._by_name.setdefault(name, []).append(node)
+
+    @classmethod
+    def from_document(
+        cls,
+        document: SpdxDocument,
+        dependency_types: Optional[Dict[str, bool]] = None,
+    ) -> "DependencyGraph":
+        # Packages are numbered first, in document order; the roots are the
+        # packages the document DESCRIBES.
+        dependency_types = dependency_types or cls.DEPENDENCY_TYPES
+        nodes = StringTable()
+        labels = {}
+        for pkg in document.packages:
+            labels[nodes.code(pkg.spdx_id)] = (pkg.name, pkg.version_info)
+
+        roots: List[int] = []
+        sources, targets = array("i"), array("i")
+        seen = set()
+        code, edge_direction = nodes.code, dependency_types.get
+        for rel in document.relationships:
+            if rel.relationship_type == "DESCRIBES":
+                related = code(rel.related_spdx_element)
+                if rel.spdx_element_id == document.spdx_id and related not in roots:
+                    roots.append(related)
+                continue
+
+            reversed_edge = edge_direction(rel.relationship_type)
+            if reversed_edge is None:
+                continue
+            element = code(rel.spdx_element_id)
+            related = code(rel.related_spdx_element)
+            if reversed_edge:
+                element, related = related, element
+            key = (element << 32) | related
+            if key not in seen:
+                seen.add(key)
+                sources.append(element)
+                targets.append(related)
+
+        return cls(nodes, sources, targets, roots, labels)
+
+    @classmethod
+    def load(
+        cls, file_path: Path, streaming: bool = False, json_backend: str = "auto"
+    ) -> "DependencyGraph":
+        document = SpdxParser.parse_sbom_file(file_path, streaming, json_backend)
+        return cls.from_document(document)
+
+    @property
+    def node_count(self) -> int:
+        return len(self.nodes)
+
+    def node(self, reference: str) -> int:
+        # An element SPDXID, or the name of exactly one package.
+        node = self.nodes.find(reference)
+        if node is not None:
+            return node
+        candidates = self._by_name.get(reference, [])
+        if len(candidates) == 1:
+            return candidates[0]
+        if candidates:
+            matches = ", ".join(self.spdx_id(node) for node in candidates)
+            raise ValueError(f"Package name {reference} is ambiguous: {matches}")
+        raise ValueError(f"No element or package named {reference} in the graph")
+
+    def spdx_id(self, node: int) -> str:
+        return self.nodes[node] or ""
+
+    def label(self, spdx_id: str) -> str:
+        # "name version" of a package; empty for other elements.
+        node = self.nodes.find(spdx_id)
+        if node is None or node not in self.labels:
+            return ""
+        name, version = self.labels[node]
+        return f"{name} {version}" if version else name
+
+    def dependencies(
+        self, reference: str, max_depth: Optional[int] = 1
+    ) -> Dict[str, int]:
+        return self.reachable(reference, max_depth=max_depth)
+
+    def dependents(
+        self, reference: str, max_depth: Optional[int] = 1
+    ) -> Dict[str, int]:
+        return self.reachable(reference, reverse=True, max_depth=max_depth)
+
+    def reachable(
+        self,
+        reference: Optional[str] = None,
+        reverse: bool = False,
+        max_depth: Optional[int] = None,
+    ) -> Dict[str, int]:
+        # Every element reached from `reference` (default: the roots) within
+        # `max_depth` edges, mapped to its distance, nearest first.
+        starts = self.roots if reference is None else [self.node(reference)]
+        offsets, adjacency = self.reverse if reverse else self.forward
+        visited = set(starts)
+        reached: Dict[str, int] = {}
+        frontier, depth = list(starts), 0
+        while frontier and (max_depth is None or depth < max_depth):
+            depth += 1
+            next_frontier = []
+            for node in frontier:
+                for neighbor in adjacency[offsets[node] : offsets[node + 1]]:
+                    if neighbor not in visited:
+                        visited.add(neighbor)
+                        next_frontier.append(neighbor)
+                        reached[self.spdx_id(neighbor)] = depth
+            frontier = next_frontier
+        return reached
+
+    def shortest_path(self, source: str, target: str) -> Optional[List[str]]:
+        # Along dependency edges, from `source` to `target`; None if unreachable.
+        path = self._search([self.node(source)], self.node(target))
+        return None if path is None else [self.spdx_id(node) for node in path]
+
+    def path_from_root(self, reference: str) -> Optional[List[str]]:
+        path = self._search(self.roots, self.node(reference))
+        return None if path is None else [self.spdx_id(node) for node in path]
+
+    def depth(self, reference: str) -> Optional[int]:
+        # Fewest dependency edges from a root; None if no root reaches it.
+        path = self.path_from_root(reference)
+        return None if path is None else len(path) - 1
+
+    def _search(self, starts: List[int], goal: int) -> Optional[List[int]]:
+        # Bidirectional breadth-first search: forward from `starts` and back
+        # from `goal`, a whole level of the smaller frontier at a time. The
+        # searches meet on a shortest path, having scanned only the edges
+        # around the two ends rather than all that `starts` reaches.
+        if goal in starts:
+            return [goal]
+        forward = dict.fromkeys(starts, -1)
+        backward = {goal: -1}
+        forward_frontier, backward_frontier = list(starts), [goal]
+        while forward_frontier and backward_frontier:
+            if len(forward_frontier) <= len(backward_frontier):
+                forward_frontier, meeting = self._expand(
+                    forward_frontier, forward, backward, self.forward
+                )
+            else:
+                backward_frontier, meeting = self._expand(
+                    backward_frontier, backward, forward, self.reverse
+                )
+            if meeting is None:
+                continue
+
+            path = []
+            node = meeting
+            while node != -1:
+                path.append(node)
+                node = forward[node]
+            path.reverse()
+            node = backward[meeting]
+            while node != -1:
+                path.append(node)
+                node = backward[node]
+            return path
+        return None
+
+    @staticmethod
+    def _expand(
+        frontier: List[int],
+        parents: Dict[int, int],
+        other: Dict[int, int],
+        rows: Tuple[array, array],
+    ) -> Tuple[List[int], Optional[int]]:
+        offsets, adjacency = rows
+        next_frontier: List[int] = []
+        for node in frontier:
+            for neighbor in adjacency[offsets[node] : offsets[node + 1]]:
+                if neighbor not in parents:
+                    parents[neighbor] = node
+                    if neighbor in other:
+                        return next_frontier, neighbor
+                    next_frontier.append(neighbor)
+        return next_frontier, None
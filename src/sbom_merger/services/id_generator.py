@@ -1,10 +1,15 @@
+import functools
 import hashlib
 import re
-from typing import List, Optional, Any
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+from ..infrastructure.id_table import IdKey, IdTable
 
 
 class SpdxIdGenerator:
 
+    UNSCOPED_IDS = {"SPDXRef-DOCUMENT", "NONE", "NOASSERTION"}
+
     @staticmethod
     def sanitize_name(name: str) -> str:
         sanitized = re.sub(r"[^a-zA-Z0-9-_.]", "-", name)
@@ -13,12 +18,21 @@ class SpdxIdGenerator:
 
     @staticmethod
     def extract_ecosystem(external_refs: list) -> str:
+        return SpdxIdGenerator.purl_ecosystem(SpdxIdGenerator.find_purl(external_refs))
+
+    @staticmethod
+    def find_purl(external_refs: list) -> str:
         for ref in external_refs:
             if ref.get("referenceType") == "purl":
-                purl = ref.get("referenceLocator", "")
-                if purl.startswith("pkg:"):
-                    ecosystem: str = purl.split(":")[1].split("/")[0]
-                    return ecosystem
+                purl: str = ref.get("referenceLocator", "")
+                return purl
+        return ""
+
+    @staticmethod
+    def purl_ecosystem(purl: str) -> str:
+        if purl.startswith("pkg:"):
+            ecosystem: str = purl.split(":")[1].split("/")[0]
+            return ecosystem
         return "unknown"
 
     @staticmethod
@@ -34,14 +48,104 @@ class SpdxIdGenerator:
         external_refs: Optional[List[Any]] = None,
     ) -> str:
         ecosystem = SpdxIdGenerator.extract_ecosystem(external_refs or [])
+        return SpdxIdGenerator.format_spdx_id(name, version, ecosystem)
+
+    @staticmethod
+    def format_spdx_id(name: str, version: Optional[str], ecosystem: str) -> str:
         sanitized_name = SpdxIdGenerator.sanitize_name(name)
         hash_suffix = SpdxIdGenerator.generate_hash(name, version)
 
         return f"SPDXRef-{ecosystem}-{sanitized_name}-{hash_suffix}"
 
+    @staticmethod
+    def scope_element_id(element_id: str, scope: str) -> str:
+        # File and snippet IDs are only unique within their document; prefixing
+        # the source keeps them apart in the merge without an ID table.
+        # External "DocumentRef-...:SPDXRef-..." references are left alone.
+        if element_id in SpdxIdGenerator.UNSCOPED_IDS or ":" in element_id:
+            return element_id
+        local_id = element_id.removeprefix("SPDXRef-")
+        return f"SPDXRef-{SpdxIdGenerator.sanitize_name(scope)}-{local_id}"
+
     @staticmethod
     def generate_document_namespace(base_name: str) -> str:
         import uuid
 
         unique_id = str(uuid.uuid4())
         return f"https://spdx.org/spdxdocs/merged-sbom/{unique_id}"
+
+
+class CachingIdGenerator(SpdxIdGenerator):
+    # SpdxIdGenerator whose package IDs are memoized by (name, version, purl)
+    # in a bounded LRU cache; the ecosystem, the part of the purl an ID
+    # depends on, is only parsed out on a miss. With an IdTable, IDs from
+    # earlier runs are looked up before generating, and newly generated ones
+    # are added to the table by save_table(). Generators given the same
+    # IdTable share its loaded IDs instead of each reading the table.
+
+    DEFAULT_MAX_ENTRIES = 65536
+
+    def __init__(
+        self, max_entries: int = DEFAULT_MAX_ENTRIES, table: Optional[IdTable] = None
+    ):
+        self.max_entries = max_entries
+        self.table = table
+        self.known_ids: Dict[IdKey, str] = table.load() if table else {}
+        self.new_ids: Dict[IdKey, str] = {}
+        self.table_hits = 0
+        # Thread workers share the generator, and `+=` is not atomic.
+        self._lock = threading.Lock()
+        self._cached_id = functools.lru_cache(maxsize=max_entries)(self._lookup)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # The LRU cache wraps a bound method and cannot be pickled, nor can
+        # the lock; worker processes start with new ones.
+        state = self.__dict__.copy()
+        del state["_cached_id"], state["_lock"]
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+        self._cached_id = functools.lru_cache(maxsize=self.max_entries)(self._lookup)
+
+    def _lookup(self, name: str, version: str, purl: str) -> str:
+        ecosystem = self.purl_ecosystem(purl)
+        key = (name, version, ecosystem)
+        spdx_id = self.known_ids.get(key)
+        if spdx_id is not None:
+            with self._lock:
+                self.table_hits += 1
+            return spdx_id
+
+        spdx_id = self.format_spdx_id(name, version, ecosystem)
+        if self.table is not None:
+            with self._lock:
+                self.new_ids[key] = spdx_id
+        return spdx_id
+
+    def generate_spdx_id(  # type: ignore[override]
+        self,
+        name: str,
+        version: Optional[str] = None,
+        external_refs: Optional[List[Any]] = None,
+    ) -> str:
+        purl = self.find_purl(external_refs or [])
+        spdx_id: str = self._cached_id(name, version or "", purl)
+        return spdx_id
+
+    def counts(self) -> Tuple[int, int, int]:
+        # (cache hits, table hits, generated), over the generator's lifetime.
+        info = self._cached_id.cache_info()
+        return info.hits, self.table_hits, info.misses - self.table_hits
+
+    def take_new_ids(self) -> Dict[IdKey, str]:
+        with self._lock:
+            new_ids, self.new_ids = self.new_ids, {}
+        return new_ids
+
+    def save_table(self) -> None:
+        if self.table is not None and self.new_ids:
+            new_ids = self.take_new_ids()
+            self.table.save(new_ids.items())
+            self.known_ids.update(new_ids)
@@ -0,0 +1,186 @@
+import os
+from pathlib import Path
+from typing import List, Optional, Tuple
+from ..domain.models import MergePlan
+from ..infrastructure.file_handler import FileHandler
+from .parse_stage import default_executor, resolve_jobs
+
+
+def format_bytes(size: float) -> str:
+    for unit in ("B", "KiB", "MiB", "GiB"):
+        if size < 1024 or unit == "GiB":
+            break
+        size /= 1024
+    return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+
+
+class MergePlanner:
+    # Picks the merge engine and worker count from a quick scan of the inputs:
+    # their sizes and an element count sampled from the start of each file.
+
+    # Leading bytes of each (decompressed) input that are scanned for elements.
+    SAMPLE_BYTES = 1024 * 1024
+    # Size ratio assumed for compressed inputs larger than the sample.
+    COMPRESSION_RATIO = 8
+    # One marker per SPDX 2 element (JSON and tag-value), SPDX 3 element and
+    # CycloneDX component.
+    ELEMENT_MARKERS = (b"SPDXID", b'"spdxId"', b'"bom-ref"')
+
+    # Rough peak memory per input element: the in-memory engine holds every
+    # parsed input and the merged document; the streaming engines hold only
+    # merged SPDXIDs and relationship keys.
+    IN_MEMORY_BYTES_PER_ELEMENT = 4096
+    STREAMED_BYTES_PER_ELEMENT = 256
+
+    # Below this much input, starting workers costs more than it saves.
+    PARALLEL_MIN_BYTES = 64 * 1024 * 1024
+
+    DEFAULT_MEMORY_BUDGET = 2 * 1024 * 1024 * 1024
+
+    @staticmethod
+    def default_memory_budget() -> int:
+        # Half of physical memory, where the platform reports it.
+        try:
+            physical = os.sysconf("SC_PHYS_PAGES") * os.sysconf("SC_PAGE_SIZE")
+        except (AttributeError, OSError, ValueError):
+            return MergePlanner.DEFAULT_MEMORY_BUDGET
+        return physical // 2 if physical > 0 else MergePlanner.DEFAULT_MEMORY_BUDGET
+
+    @staticmethod
+    def memory_only_reason(
+        output_format: str, columnar_store: bool = False, incremental: bool = False
+    ) -> Optional[str]:
+        # The option, if any, that only the in-memory engine supports.
+        if output_format != "json":
+            return f"--format {output_format}"
+        if columnar_store:
+            return "--columnar-store"
+        if incremental:
+            return "--incremental"
+        return None
+
+    @staticmethod
+    def estimate_input(file_path: Path) -> Tuple[int, int]:
+        # (uncompressed bytes, elements), exact for inputs within the sample.
+        try:
+            size = file_path.stat().st_size
+            with FileHandler.open_sbom(file_path) as f:
+                sample = f.read(MergePlanner.SAMPLE_BYTES + 1)
+        except OSError:
+            return 0, 0
+
+        elements = sum(sample.count(marker) for marker in MergePlanner.ELEMENT_MARKERS)
+        if len(sample) <= MergePlanner.SAMPLE_BYTES:
+            return len(sample), elements
+
+        if FileHandler.compression_of(file_path):
+            size *= MergePlanner.COMPRESSION_RATIO
+        return size, elements * size // len(sample)
+
+    @staticmethod
+    def plan(
+        input_paths: List[Path],
+        memory_budget: Optional[int] = None,
+        cpu_count: Optional[int] = None,
+        engine: str = "auto",
+        jobs: Optional[int] = None,
+        memory_only: Optional[str] = None,
+        executor: Optional[str] = None,
+    ) -> MergePlan:
+        # `engine`, `jobs` and `executor` that are given are kept as they are;
+        # `memory_only` names an option that only the in-memory engine supports.
+        memory_budget = memory_budget or MergePlanner.default_memory_budget()
+        cpu_count = cpu_count or resolve_jobs(0)
+        if jobs is not None:
+            jobs = jobs or cpu_count
+        plan = MergePlan(
+            engine=engine,
+            jobs=jobs or 1,
+            input_count=len(input_paths),
+            memory_budget=memory_budget,
+            cpu_count=cpu_count,
+        )
+        for path in input_paths:
+            size, elements = MergePlanner.estimate_input(path)
+            plan.input_bytes += size
+            plan.estimated_elements += elements
+        plan.in_memory_bytes = (
+            plan.estimated_elements * MergePlanner.IN_MEMORY_BYTES_PER_ELEMENT
+        )
+        plan.streamed_bytes = (
+            plan.estimated_elements * MergePlanner.STREAMED_BYTES_PER_ELEMENT
+        )
+        budget = format_bytes(memory_budget)
+
+        if jobs is not None:
+            plan.reasons.append(f"{jobs} worker(s), as requested")
+        elif (
+            cpu_count > 1
+            and len(input_paths) > 1
+            and plan.input_bytes >= MergePlanner.PARALLEL_MIN_BYTES
+        ):
+            plan.jobs = min(cpu_count, len(input_paths))
+            plan.reasons.append(
+                f"{plan.jobs} workers: {format_bytes(plan.input_bytes)} of input "
+                f"is worth spreading over {cpu_count} CPUs"
+            )
+        else:
+            plan.reasons.append(
+                f"1 worker: {format_bytes(plan.input_bytes)} of input is below "
+                f"the {format_bytes(MergePlanner.PARALLEL_MIN_BYTES)} worth "
+                f"parallelizing"
+                if cpu_count > 1
+                else "1 worker: only one CPU is available"
+            )
+
+        in_memory = f"in-memory estimate {format_bytes(plan.in_memory_bytes)}"
+        if engine != "auto":
+            plan.reasons.append(f"engine {engine}, as requested")
+        elif memory_only:
+            plan.engine = "memory"
+            plan.reasons.append(f"engine memory: required by {memory_only}")
+            if plan.in_memory_bytes > memory_budget:
+                plan.reasons.append(f"{in_memory} exceeds the {budget} budget")
+        elif plan.in_memory_bytes <= memory_budget:
+            plan.engine = "memory"
+            plan.reasons.append(f"engine memory: {in_memory} fits the {budget} budget")
+        elif plan.streamed_bytes <= memory_budget:
+            plan.engine = "parallel" if plan.jobs > 1 else "streaming"
+            plan.reasons.append(
+                f"engine {plan.engine}: {in_memory} exceeds the {budget} budget, "
+                f"merged IDs alone ({format_bytes(plan.streamed_bytes)}) fit"
+            )
+        else:
+            plan.engine = "sqlite"
+            plan.reasons.append(
+                f"engine sqlite: even merged IDs alone "
+                f"({format_bytes(plan.streamed_bytes)}) exceed the {budget} "
+                f"budget, so they are staged on disk"
+            )
+
+        plan.executor = executor or default_executor(plan.engine)
+        if executor is not None:
+            plan.reasons.append(f"executor {executor}, as requested")
+        elif plan.engine == "parallel":
+            plan.reasons.append(
+                f"executor {plan.executor}: parallel map and reduce tasks are "
+                + (
+                    "run on threads, as the GIL is disabled"
+                    if plan.executor == "free-threaded"
+                    else "pure Python, so threads would share the GIL"
+                )
+            )
+        return plan
+
+    @staticmethod
+    def explain(plan: MergePlan) -> List[str]:
+        lines = [
+            f"Engine: {plan.engine}, jobs: {plan.jobs}, executor: {plan.executor}",
+            f"Inputs: {plan.input_count} SBOMs, {format_bytes(plan.input_bytes)}, "
+            f"~{plan.estimated_elements} elements",
+            f"Memory: ~{format_bytes(plan.in_memory_bytes)} in memory, "
+            f"~{format_bytes(plan.streamed_bytes)} streamed, "
+            f"budget {format_bytes(plan.memory_budget)}",
+        ]
+        lines.extend(f"- {reason}" for reason in plan.reasons)
+        return lines
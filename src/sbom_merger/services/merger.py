@@ -1,49 +1,125 @@
 import time
 from pathlib import Path
-from typing import List, Dict, Set
+from typing import Any, Callable, List, Dict, Optional, Set, Tuple, cast
 from datetime import datetime
 from ..domain.models import (
+    ColumnarStore,
+    MergeContribution,
+    RelationshipIndex,
     SpdxDocument,
-    SpdxPackage,
+    BaseSpdxPackage,
+    BaseSpdxRelationship,
     SpdxRelationship,
     MergeStatistics,
     MergeResult,
 )
 from .parser import SpdxParser
+from .parse_stage import ParseStage, parse_path
+from ..infrastructure.config import Config
+from ..infrastructure.element_spool import ElementSpool
+from ..infrastructure.merge_manifest import MergeManifest
+from ..infrastructure.parse_cache import ParseCache
 from .validator import SpdxValidator
-from .id_generator import SpdxIdGenerator
+from .id_generator import CachingIdGenerator
+from ..infrastructure.id_table import IdTable
 
 
 class SbomMerger:
 
-    def __init__(self):
+    def __init__(
+        self,
+        streaming_parse: bool = False,
+        jobs: int = 1,
+        executor: str = "thread",
+        json_backend: str = "auto",
+        cache: Optional[ParseCache] = None,
+        lazy_packages: bool = False,
+        validate_on_parse: bool = False,
+        columnar_store: bool = False,
+        passthrough: bool = False,
+        manifest_path: Optional[Path] = None,
+        id_cache_size: int = CachingIdGenerator.DEFAULT_MAX_ENTRIES,
+        id_table: Optional[IdTable] = None,
+    ):
         self.parser = SpdxParser()
+        self.jobs = jobs
+        self.executor = executor
+        self.cache = cache
+        self.columnar_store = columnar_store
+        self.manifest_path = manifest_path
+        self.parse_options: Dict[str, Any] = {
+            "streaming": streaming_parse,
+            "json_backend": json_backend,
+            "lazy": lazy_packages,
+            "validate": validate_on_parse,
+            "passthrough": passthrough,
+        }
         self.validator = SpdxValidator()
-        self.id_generator = SpdxIdGenerator()
+        self.id_generator = CachingIdGenerator(id_cache_size, id_table)
 
     def merge_sboms(
         self, root_sbom_path: Path, dependency_sbom_paths: List[Path]
     ) -> MergeResult:
         start_time = time.time()
         statistics = MergeStatistics()
+        id_counts = self.id_generator.counts()
 
-        root_doc = self.parser.parse_sbom_file(root_sbom_path)
+        manifest = None
+        reused: Dict[Path, Tuple[Dict[str, Any], SpdxDocument, MergeContribution]] = {}
+        digests: Dict[Path, str] = {}
+        if self.manifest_path is not None:
+            manifest = MergeManifest(
+                self.manifest_path,
+                self.parse_options,
+                self.parse_options["json_backend"],
+            )
+            for path in [root_sbom_path, *dependency_sbom_paths]:
+                digests[path] = MergeManifest.file_hash(path)
+                entry = manifest.lookup(path, digests[path])
+                if entry is not None:
+                    reused[path] = (entry, *self._contribution_from_entry(entry))
+            statistics.inputs_reused = len(reused)
+
+        if root_sbom_path in reused:
+            root_doc = reused[root_sbom_path][1]
+        else:
+            root_doc, root_cache_hit = parse_path(
+                root_sbom_path, self.parse_options, self.cache
+            )
+            self._record_cache_use(statistics, root_cache_hit)
         statistics.root_packages_count = len(root_doc.packages)
 
-        dep_docs = []
-        for dep_path in dependency_sbom_paths:
-            try:
-                dep_doc = self.parser.parse_sbom_file(dep_path)
-                dep_docs.append(dep_doc)
-                statistics.dependency_packages_count += len(dep_doc.packages)
-            except Exception as e:
+        parse_stage = ParseStage(
+            self.jobs, self.executor, self.cache, **self.parse_options
+        )
+
+        parsed: Dict[Path, SpdxDocument] = {}
+        changed_paths = [p for p in dependency_sbom_paths if p not in reused]
+        for outcome in parse_stage.run(changed_paths):
+            self._record_cache_use(statistics, outcome.cache_hit)
+            if outcome.document is None:
                 statistics.validation_errors.append(
-                    f"Failed to parse {dep_path.name}: {str(e)}"
+                    f"Failed to parse {outcome.path.name}: {outcome.error}"
                 )
+                continue
+            parsed[outcome.path] = outcome.document
+
+        dep_paths = []
+        dep_docs = []
+        for path in dependency_sbom_paths:
+            doc = reused[path][1] if path in reused else parsed.get(path)
+            if doc is None:
+                continue
+            dep_paths.append(path)
+            dep_docs.append(doc)
+            statistics.dependency_packages_count += len(doc.packages)
 
         all_docs = [root_doc] + dep_docs
         statistics.total_sboms_processed = len(all_docs)
 
+        for doc in all_docs:
+            self._record_parse_validation(statistics, doc)
+
         errors, warnings = self.validator.validate_version_compatibility(all_docs)
         statistics.validation_errors.extend(errors)
         statistics.validation_warnings.extend(warnings)
@@ -53,118 +129,376 @@ class SbomMerger:
                 f"Cannot merge SBOMs due to validation errors: " f"{'; '.join(errors)}"
             )
 
-        merged_doc, duplicate_count = self._create_merged_document(root_doc, dep_docs)
+        if manifest is not None:
+            entries = {}
+            contributions = []
+            for path, doc in zip([root_sbom_path] + dep_paths, all_docs):
+                if path in reused:
+                    entry, _, contribution = reused[path]
+                else:
+                    contribution = self._contribution(doc, is_root=doc is root_doc)
+                    entry = self._contribution_entry(doc, contribution, digests[path])
+                contributions.append(contribution)
+                # Spooled files and snippets are not kept in the manifest, so
+                # inputs that have them are always parsed again.
+                if doc.elements is None:
+                    entries[MergeManifest.key(path)] = entry
+            merged_doc, duplicate_count, duplicate_relationships = (
+                self._fold_contributions(root_doc, dep_docs, contributions)
+            )
+            manifest.save(entries)
+        elif self.columnar_store:
+            merged_doc, duplicate_count, duplicate_relationships = (
+                self._create_columnar_document(root_doc, dep_docs)
+            )
+        else:
+            merged_doc, duplicate_count, duplicate_relationships = (
+                self._create_merged_document(root_doc, dep_docs)
+            )
 
-        doc_errors, doc_warnings = self.validator.validate_document(merged_doc)
+        if self.parse_options["validate"]:
+            doc_errors, doc_warnings = self.validator.validate_merged_document(
+                merged_doc
+            )
+        else:
+            doc_errors, doc_warnings = self.validator.validate_document(merged_doc)
         statistics.validation_errors.extend(doc_errors)
         statistics.validation_warnings.extend(doc_warnings)
 
         statistics.total_packages = len(merged_doc.packages)
         statistics.total_relationships = len(merged_doc.relationships)
         statistics.duplicate_packages_removed = duplicate_count
+        statistics.duplicate_relationships_removed = duplicate_relationships
+        self._record_id_generation(statistics, id_counts)
         statistics.processing_time_seconds = time.time() - start_time
 
         return MergeResult(merged_document=merged_doc, statistics=statistics)
 
+    @staticmethod
+    def _contribution_entry(
+        doc: SpdxDocument, contribution: MergeContribution, digest: str
+    ) -> Dict[str, Any]:
+        header = SpdxParser.document_header(doc)
+        if doc.comment:
+            header["comment"] = doc.comment
+        return {
+            "sha256": digest,
+            "source_file": doc.source_file,
+            "header": header,
+            "validation_errors": doc.validation_errors,
+            "validation_warnings": doc.validation_warnings,
+            "id_mapping": contribution.id_mapping,
+            "packages": [
+                SpdxParser.package_to_dict(pkg, spdx_id)
+                for pkg, spdx_id in contribution.packages
+            ],
+            "relationships": [
+                SpdxParser.relationship_to_dict(r) for r in contribution.relationships
+            ],
+        }
+
+    def _contribution_from_entry(
+        self, entry: Dict[str, Any]
+    ) -> Tuple[SpdxDocument, MergeContribution]:
+        # The stored packages already carry their merged SPDXIDs.
+        source = entry["source_file"]
+        lazy = self.parse_options["lazy"]
+        passthrough = self.parse_options["passthrough"]
+        packages = [
+            SpdxParser.build_package(record, source, lazy, passthrough)
+            for record in entry["packages"]
+        ]
+        contribution = MergeContribution(
+            source,
+            packages=[(pkg, pkg.spdx_id) for pkg in packages],
+            relationships=[
+                SpdxParser.build_relationship(record, source, passthrough)
+                for record in entry["relationships"]
+            ],
+            id_mapping=entry["id_mapping"],
+        )
+
+        # Stands in for the parsed input: the header feeds the merged document
+        # and version checks, the element lists only the package counts.
+        doc = SpdxParser.build_document(
+            entry["header"], packages, contribution.relationships, source
+        )
+        doc.validation_errors = entry["validation_errors"]
+        doc.validation_warnings = entry["validation_warnings"]
+        return doc, contribution
+
+    @staticmethod
+    def _record_cache_use(
+        statistics: MergeStatistics, cache_hit: Optional[bool]
+    ) -> None:
+        if cache_hit is True:
+            statistics.cache_hits += 1
+        elif cache_hit is False:
+            statistics.cache_misses += 1
+
+    def _record_id_generation(
+        self,
+        statistics: MergeStatistics,
+        start_counts: Tuple[int, ...],
+        worker_counts: Tuple[int, ...] = (0, 0, 0),
+    ) -> None:
+        # Counts since start_counts, plus those of generator copies in worker
+        # processes; newly generated IDs go to the ID table, if there is one.
+        counts = self.id_generator.counts()
+        hits, table_hits, generated = (
+            now - start + worker
+            for now, start, worker in zip(counts, start_counts, worker_counts)
+        )
+        statistics.id_cache_hits += hits
+        statistics.id_table_hits += table_hits
+        statistics.ids_generated += generated
+        self.id_generator.save_table()
+
+    @staticmethod
+    def _record_parse_validation(
+        statistics: MergeStatistics, doc: SpdxDocument
+    ) -> None:
+        for error in doc.validation_errors or []:
+            statistics.validation_errors.append(f"{doc.source_file}: {error}")
+        for warning in doc.validation_warnings or []:
+            statistics.validation_warnings.append(f"{doc.source_file}: {warning}")
+
     def _create_merged_document(
         self, root_doc: SpdxDocument, dep_docs: List[SpdxDocument]
-    ) -> tuple[SpdxDocument, int]:
-        merged_packages = []
-        merged_relationships = []
-        id_mapping: Dict[str, str] = {}
-        seen_ids: Set[str] = set()
-        duplicate_count = 0
+    ) -> tuple[SpdxDocument, int, int]:
+        contributions = [self._contribution(root_doc, is_root=True)]
+        for dep_doc in dep_docs:
+            contributions.append(self._contribution(dep_doc, is_root=False))
+        return self._fold_contributions(root_doc, dep_docs, contributions)
 
-        for pkg in root_doc.packages:
+    def _contribution(self, doc: SpdxDocument, is_root: bool) -> MergeContribution:
+        # A document's contribution depends only on the document itself, so it
+        # can be computed, stored and reused independently of the other inputs.
+        contribution = MergeContribution(doc.source_file)
+        id_mapping = contribution.id_mapping
+
+        for pkg in doc.packages:
             new_id = self.id_generator.generate_spdx_id(
                 pkg.name, pkg.version_info, pkg.external_refs
             )
             id_mapping[pkg.spdx_id] = new_id
+            contribution.packages.append((pkg, new_id))
 
-            if new_id not in seen_ids:
-                merged_pkg = SpdxPackage(
-                    name=pkg.name,
-                    spdx_id=new_id,
-                    download_location=pkg.download_location,
-                    files_analyzed=pkg.files_analyzed,
-                    version_info=pkg.version_info,
-                    license_concluded=pkg.license_concluded,
-                    copyright_text=pkg.copyright_text,
-                    external_refs=pkg.external_refs,
-                    source_sbom=pkg.source_sbom,
-                )
-                merged_packages.append(merged_pkg)
-                seen_ids.add(new_id)
+        scope = self._element_scope(doc, is_root)
+        for rel in doc.relationships:
+            contribution.relationships.append(
+                self._remap_relationship(rel, id_mapping, scope)
+            )
 
-        for dep_doc in dep_docs:
-            for pkg in dep_doc.packages:
+        return contribution
+
+    @staticmethod
+    def _remap_relationship(
+        rel: BaseSpdxRelationship,
+        id_mapping: Dict[str, str],
+        scope: Callable[[str], str],
+    ) -> SpdxRelationship:
+        element_id = id_mapping.get(rel.spdx_element_id) or scope(rel.spdx_element_id)
+        related_id = id_mapping.get(rel.related_spdx_element) or scope(
+            rel.related_spdx_element
+        )
+        return SpdxRelationship(
+            spdx_element_id=element_id,
+            related_spdx_element=related_id,
+            relationship_type=rel.relationship_type,
+            source_sbom=rel.source_sbom,
+            raw_record=rel.raw_record,
+        )
+
+    def _fold_contributions(
+        self,
+        root_doc: SpdxDocument,
+        dep_docs: List[SpdxDocument],
+        contributions: List[MergeContribution],
+    ) -> tuple[SpdxDocument, int, int]:
+        # The first contribution is the root's; packages whose merged SPDXID
+        # was already seen are dropped, and counted when a dependency has them.
+        # Relationships repeated after remapping are dropped wherever they occur.
+        store = ColumnarStore() if self.columnar_store else None
+        merged_packages: List[BaseSpdxPackage] = []
+        merged_relationships: List[SpdxRelationship] = []
+        seen_ids: Set[str] = set()
+        seen_relationships = RelationshipIndex(store.strings if store else None)
+        duplicate_count = 0
+        duplicate_relationships = 0
+
+        for position, contribution in enumerate(contributions):
+            for pkg, spdx_id in contribution.packages:
+                if spdx_id in seen_ids:
+                    if position:
+                        duplicate_count += 1
+                    continue
+                seen_ids.add(spdx_id)
+                if store is not None:
+                    store.add_package(pkg, spdx_id)
+                else:
+                    # Only kept packages are copied under their merged ID;
+                    # a duplicate's fields beyond the ID inputs are never read.
+                    merged = pkg.materialize()
+                    merged.spdx_id = spdx_id
+                    merged_packages.append(merged)
+
+            for rel in contribution.relationships:
+                if not seen_relationships.add(rel):
+                    duplicate_relationships += 1
+                elif store is not None:
+                    store.add_relationship(rel)
+                else:
+                    merged_relationships.append(rel)
+
+        merged_doc = self._merged_document(
+            root_doc,
+            len(dep_docs),
+            duplicate_count,
+            self._merge_elements(root_doc, dep_docs),
+        )
+        if store is not None:
+            merged_doc.packages = store.packages
+            merged_doc.relationships = store.relationships
+            merged_doc.store = store
+        else:
+            merged_doc.packages = merged_packages
+            merged_doc.relationships = merged_relationships
+
+        return merged_doc, duplicate_count, duplicate_relationships
+
+    def _create_columnar_document(
+        self, root_doc: SpdxDocument, dep_docs: List[SpdxDocument]
+    ) -> tuple[SpdxDocument, int, int]:
+        # Same merge as _create_merged_document, keyed by string codes: each
+        # document gets its own code -> code mapping, and the store's row index
+        # doubles as the seen-ID set.
+        store = ColumnarStore()
+        code = store.strings.code
+        seen_relationships = RelationshipIndex(store.strings)
+        duplicate_count = 0
+        duplicate_relationships = 0
+
+        for doc in [root_doc] + dep_docs:
+            id_mapping: Dict[int, int] = {}
+            for pkg in doc.packages:
                 new_id = self.id_generator.generate_spdx_id(
                     pkg.name, pkg.version_info, pkg.external_refs
                 )
+                new_code = code(new_id)
+                id_mapping[code(pkg.spdx_id)] = new_code
 
-                full_original_id = f"{dep_doc.source_file}::{pkg.spdx_id}"
-                id_mapping[full_original_id] = new_id
-
-                if new_id not in seen_ids:
-                    merged_pkg = SpdxPackage(
-                        name=pkg.name,
-                        spdx_id=new_id,
-                        download_location=pkg.download_location,
-                        files_analyzed=pkg.files_analyzed,
-                        version_info=pkg.version_info,
-                        license_concluded=pkg.license_concluded,
-                        copyright_text=pkg.copyright_text,
-                        external_refs=pkg.external_refs,
-                        source_sbom=pkg.source_sbom,
-                    )
-                    merged_packages.append(merged_pkg)
-                    seen_ids.add(new_id)
-                else:
+                if not store.has_package_code(new_code):
+                    store.add_package(pkg, new_id)
+                elif doc is not root_doc:
                     duplicate_count += 1
 
-        for rel in root_doc.relationships:
-            element_id = id_mapping.get(rel.spdx_element_id, rel.spdx_element_id)
-            related_id = id_mapping.get(
-                rel.related_spdx_element, rel.related_spdx_element
-            )
+            scope = self._element_scope(doc, is_root=doc is root_doc)
+            for rel in doc.relationships:
+                element = id_mapping.get(code(rel.spdx_element_id))
+                if element is None:
+                    element = code(scope(rel.spdx_element_id))
+                related = id_mapping.get(code(rel.related_spdx_element))
+                if related is None:
+                    related = code(scope(rel.related_spdx_element))
+                relationship_type = code(rel.relationship_type)
+                if not seen_relationships.add_codes(
+                    element, related, relationship_type
+                ):
+                    duplicate_relationships += 1
+                    continue
+                store.add_relationship_codes(
+                    element,
+                    related,
+                    relationship_type,
+                    code(rel.source_sbom),
+                    rel.raw_record,
+                )
+
+        merged_doc = self._merged_document(
+            root_doc,
+            len(dep_docs),
+            duplicate_count,
+            self._merge_elements(root_doc, dep_docs),
+        )
+        merged_doc.packages = store.packages
+        merged_doc.relationships = store.relationships
+        merged_doc.store = store
 
-            if element_id == "SPDXRef-DOCUMENT":
-                element_id = "SPDXRef-DOCUMENT"
-            if related_id == "SPDXRef-DOCUMENT":
-                related_id = "SPDXRef-DOCUMENT"
+        return merged_doc, duplicate_count, duplicate_relationships
 
-            merged_rel = SpdxRelationship(
-                spdx_element_id=element_id,
-                related_spdx_element=related_id,
-                relationship_type=rel.relationship_type,
-                source_sbom=rel.source_sbom,
-            )
-            merged_relationships.append(merged_rel)
+    def _element_scope(self, doc: SpdxDocument, is_root: bool) -> Callable[[str], str]:
+        # Root IDs are kept; a dependency's non-package IDs are prefixed with
+        # its source once it carries files or snippets that could collide.
+        if is_root or doc.elements is None:
+            return self._same_id
+        scope = doc.source_file or ""
+        return lambda element_id: self.id_generator.scope_element_id(element_id, scope)
 
-        for dep_doc in dep_docs:
-            for rel in dep_doc.relationships:
-                element_key = f"{dep_doc.source_file}::{rel.spdx_element_id}"
-                related_key = f"{dep_doc.source_file}::{rel.related_spdx_element}"
-
-                element_id = id_mapping.get(element_key, rel.spdx_element_id)
-                related_id = id_mapping.get(related_key, rel.related_spdx_element)
-
-                merged_rel = SpdxRelationship(
-                    spdx_element_id=element_id,
-                    related_spdx_element=related_id,
-                    relationship_type=rel.relationship_type,
-                    source_sbom=rel.source_sbom,
-                )
-                merged_relationships.append(merged_rel)
+    @staticmethod
+    def _same_id(element_id: str) -> str:
+        return element_id
 
+    def _merge_elements(
+        self, root_doc: SpdxDocument, dep_docs: List[SpdxDocument]
+    ) -> Optional[ElementSpool]:
+        sources = [doc for doc in [root_doc] + dep_docs if doc.elements is not None]
+        if not sources:
+            return None
+        if len(sources) == 1 and sources[0] is root_doc:
+            # Nothing to remap, so the root's spool is shared rather than copied.
+            return root_doc.elements
+
+        merged = ElementSpool()
+        for doc in sources:
+            self._append_elements(merged, doc, is_root=doc is root_doc)
+        return merged
+
+    def _append_elements(
+        self, merged: ElementSpool, doc: SpdxDocument, is_root: bool
+    ) -> None:
+        # Records are streamed from spool to spool, one at a time.
+        scope = self._element_scope(doc, is_root)
+        for section in ElementSpool.SECTIONS:
+            for record in cast(ElementSpool, doc.elements).iter_records(section):
+                if not is_root:
+                    self._scope_record(record, scope)
+                merged.append(section, record)
+
+    @staticmethod
+    def _scope_record(record: Dict[str, Any], scope: Callable[[str], str]) -> None:
+        record["SPDXID"] = scope(record.get("SPDXID", ""))
+        if "snippetFromFile" in record:
+            record["snippetFromFile"] = scope(record["snippetFromFile"])
+        for snippet_range in record.get("ranges", ()):
+            for pointer in snippet_range.values():
+                if isinstance(pointer, dict) and "reference" in pointer:
+                    pointer["reference"] = scope(pointer["reference"])
+
+    def _merged_document(
+        self,
+        root_doc: SpdxDocument,
+        dependency_count: int,
+        duplicate_count: int,
+        elements: Optional[ElementSpool],
+    ) -> SpdxDocument:
+        # A new creators list: the root's is shared with its parsed (and
+        # manifest-cached) header, which must not collect the tool entry.
         creation_info = root_doc.creation_info.copy()
         creation_info["created"] = datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%SZ")
-        if "creators" not in creation_info:
-            creation_info["creators"] = []
-        creation_info["creators"].append("Tool: merge-spdx-sboms-v1.0.0")
+        creation_info["creators"] = [
+            *creation_info.get("creators", []),
+            "Tool: merge-spdx-sboms-v1.0.0",
+        ]
+
+        # SPDX 3.0 inputs are mapped onto the 2.3 model, so the merged document
+        # keeps the root's version only when it is one the model represents.
+        spdx_version = root_doc.spdx_version
+        if not Config.is_supported_spdx_version(spdx_version):
+            spdx_version = Config.SUPPORTED_SPDX_VERSIONS[-1]
 
-        merged_doc = SpdxDocument(
-            spdx_version=root_doc.spdx_version,
+        return SpdxDocument(
+            spdx_version=spdx_version,
             data_license=root_doc.data_license,
             spdx_id="SPDXRef-DOCUMENT",
             name=f"Merged SBOM: {root_doc.name}",
@@ -172,18 +506,15 @@ class SbomMerger:
                 root_doc.name
             ),
             creation_info=creation_info,
-            packages=merged_packages,
-            relationships=merged_relationships,
             comment=(
-                f"Merged SBOM containing root and {len(dep_docs)} "
+                f"Merged SBOM containing root and {dependency_count} "
                 f"dependency SBOMs. "
                 f"{duplicate_count} duplicate packages removed. "
                 f"Original root: {root_doc.source_file}"
             ),
+            elements=elements,
         )
 
-        return merged_doc, duplicate_count
-
     def _find_main_package(self, doc: SpdxDocument) -> str:
         for rel in doc.relationships:
             if (
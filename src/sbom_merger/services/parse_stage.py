@@ -0,0 +1,173 @@
+import os
+import sys
+from collections import deque
+from concurrent.futures import (
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+)
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Deque, Dict, Iterator, List, Optional, Tuple, cast
+from ..domain.models import SpdxDocument
+from ..infrastructure.config import Config
+from ..infrastructure.parse_cache import ParseCache
+from .parser import SpdxParser
+
+
+@dataclass
+class ParseOutcome:
+    path: Path
+    document: Optional[SpdxDocument] = None
+    error: Optional[str] = None
+    cache_hit: Optional[bool] = None
+
+
+def is_free_threaded() -> bool:
+    gil_check = getattr(sys, "_is_gil_enabled", None)
+    return gil_check is not None and not gil_check()
+
+
+def resolve_jobs(jobs: int) -> int:
+    if jobs < 0:
+        raise ValueError(f"Number of jobs must be >= 0, got {jobs}")
+    return jobs or os.cpu_count() or 1
+
+
+def check_executor(kind: str) -> None:
+    # Checked when the executor is chosen, not when a pool is first needed,
+    # so that a run that happens to stay serial does not accept it silently.
+    if kind not in Config.SUPPORTED_EXECUTORS:
+        raise ValueError(
+            f"Unsupported executor: {kind}. "
+            f"Supported: {', '.join(Config.SUPPORTED_EXECUTORS)}"
+        )
+    if kind == "free-threaded" and not is_free_threaded():
+        raise ValueError(
+            "The free-threaded executor requires a Python build with the "
+            "GIL disabled"
+        )
+
+
+def default_executor(engine: str) -> str:
+    # Parsing releases the GIL often enough for threads, but the parallel
+    # engine's map and reduce tasks are pure Python: on a GIL build they only
+    # run in parallel in separate processes.
+    if engine != "parallel":
+        return "thread"
+    return "free-threaded" if is_free_threaded() else "process"
+
+
+def create_executor(kind: str, jobs: int) -> Executor:
+    check_executor(kind)
+    if kind == "process":
+        return ProcessPoolExecutor(max_workers=jobs)
+    return ThreadPoolExecutor(max_workers=jobs)
+
+
+def parse_path(
+    path: Path, parse_options: Dict[str, Any], cache: Optional[ParseCache] = None
+) -> Tuple[SpdxDocument, Optional[bool]]:
+    if cache is None:
+        return SpdxParser.parse_sbom_file(path, **parse_options), None
+
+    key = ParseCache.content_key(path, parse_options)
+    cached = cache.get(key)
+    if isinstance(cached, SpdxDocument):
+        return cached, True
+
+    document = SpdxParser.parse_sbom_file(path, **parse_options)
+    cache.put(key, document)
+    return document, False
+
+
+def _file_size(path: Path) -> int:
+    try:
+        return path.stat().st_size
+    except OSError:
+        return 0
+
+
+class ParseStage:
+
+    def __init__(
+        self,
+        jobs: int = 1,
+        executor: str = "thread",
+        cache: Optional[ParseCache] = None,
+        **parse_options,
+    ):
+        check_executor(executor)
+        self.jobs = resolve_jobs(jobs)
+        self.executor = executor
+        self.cache = cache
+        self.parse_options = parse_options
+
+    def _parse(self, path: Path) -> ParseOutcome:
+        outcome = ParseOutcome(path=path)
+        try:
+            outcome.document, outcome.cache_hit = parse_path(
+                path, self.parse_options, self.cache
+            )
+        except Exception as e:
+            outcome.error = str(e)
+        return outcome
+
+    def run(self, paths: List[Path]) -> List[ParseOutcome]:
+        if self.jobs == 1 or len(paths) < 2:
+            return [self._parse(path) for path in paths]
+
+        outcomes: List[Optional[ParseOutcome]] = [None] * len(paths)
+
+        # Largest files go first so a big straggler does not start last.
+        schedule = sorted(
+            range(len(paths)), key=lambda i: _file_size(paths[i]), reverse=True
+        )
+
+        with create_executor(self.executor, min(self.jobs, len(paths))) as pool:
+            futures = [
+                (
+                    index,
+                    pool.submit(
+                        parse_path, paths[index], self.parse_options, self.cache
+                    ),
+                )
+                for index in schedule
+            ]
+            for index, future in futures:
+                outcomes[index] = self._result(paths[index], future)
+
+        return cast(List[ParseOutcome], outcomes)
+
+    def iter_outcomes(self, paths: List[Path]) -> Iterator[ParseOutcome]:
+        # Outcomes come back in input order with at most `jobs` documents
+        # parsed ahead, so a consumer that drops each document holds a bounded
+        # number of them instead of the whole input set.
+        if self.jobs == 1 or len(paths) < 2:
+            for path in paths:
+                yield self._parse(path)
+            return
+
+        with create_executor(self.executor, min(self.jobs, len(paths))) as pool:
+            pending: Deque[Tuple[Path, Future]] = deque()
+            for path in paths:
+                pending.append(
+                    (
+                        path,
+                        pool.submit(parse_path, path, self.parse_options, self.cache),
+                    )
+                )
+                if len(pending) > self.jobs:
+                    yield self._result(*pending.popleft())
+            while pending:
+                yield self._result(*pending.popleft())
+
+    @staticmethod
+    def _result(path: Path, future: Future) -> ParseOutcome:
+        outcome = ParseOutcome(path=path)
+        try:
+            outcome.document, outcome.cache_hit = future.result()
+        except Exception as e:
+            outcome.error = str(e)
+        return outcome
@@ -1,15 +1,102 @@
-import json
+import sys
 from pathlib import Path
-from typing import Dict, Any
-from ..domain.models import SpdxDocument, SpdxPackage, SpdxRelationship
+from typing import Dict, Any, Iterator, List, Optional, TypeVar, cast
+from ..domain.models import (
+    BaseSpdxPackage,
+    BaseSpdxRelationship,
+    ColumnarStore,
+    LazySpdxPackage,
+    SpdxDocument,
+    SpdxPackage,
+    SpdxRelationship,
+)
+from ..infrastructure.element_spool import ElementSpool
+from ..infrastructure.file_handler import FileHandler
+from ..infrastructure.json_codec import get_json_codec
+from .validator import DocumentValidator
+
+T = TypeVar("T")
+
+_INTERNED_REF_KEYS = ("referenceCategory", "referenceType")
+
+
+def _intern(value: T) -> T:
+    if isinstance(value, str):
+        return cast(T, sys.intern(value))
+    return value
 
 
 class SpdxParser:
 
     @staticmethod
-    def parse_sbom_file(file_path: Path) -> SpdxDocument:
-        with open(file_path, "r", encoding="utf-8") as f:
-            data = json.load(f)
+    def parse_sbom_file(
+        file_path: Path,
+        streaming: bool = False,
+        json_backend: str = "auto",
+        lazy: bool = False,
+        validate: bool = False,
+        passthrough: bool = False,
+    ) -> SpdxDocument:
+        validator = DocumentValidator() if validate else None
+        document = SpdxParser._parse_document(
+            file_path, streaming, json_backend, lazy, validator, passthrough
+        )
+        if validator is not None:
+            errors, warnings = validator.finish(document)
+            document.validation_errors = errors
+            document.validation_warnings = warnings
+        return document
+
+    @staticmethod
+    def _parse_document(
+        file_path: Path,
+        streaming: bool,
+        json_backend: str,
+        lazy: bool,
+        validator: Optional[DocumentValidator],
+        passthrough: bool = False,
+    ) -> SpdxDocument:
+        # Passthrough keeps SPDX 2.x JSON records only; the other formats are
+        # converted field by field and have no record to write back.
+        sbom_format = FileHandler.detect_format(file_path)
+        if sbom_format == "tag-value":
+            from .tag_value import TagValueParser
+
+            return TagValueParser.parse_sbom_file(file_path, lazy, validator)
+
+        if sbom_format == "cyclonedx":
+            from .cyclonedx import CycloneDxParser
+
+            return CycloneDxParser.parse_sbom_file(
+                file_path, json_backend, lazy, validator
+            )
+
+        if sbom_format == "spdx3-jsonld":
+            from .spdx3 import Spdx3Parser
+
+            # The element graph has to be indexed as a whole, so SPDX 3.0
+            # documents are always decoded eagerly.
+            return Spdx3Parser.parse_sbom_file(file_path, json_backend, lazy, validator)
+
+        if streaming:
+            from .stream_parser import SpdxStreamParser
+
+            return SpdxStreamParser.parse_sbom_file(
+                file_path, lazy, validator, passthrough
+            )
+
+        with FileHandler.read_sbom(file_path) as buffer:
+            data = get_json_codec(json_backend).loads(buffer)
+
+        if "@graph" in data:
+            from .spdx3 import Spdx3Parser
+
+            return Spdx3Parser.build_document(data, file_path.name, lazy, validator)
+
+        if data.get("bomFormat") == "CycloneDX":
+            from .cyclonedx import CycloneDxParser
+
+            return CycloneDxParser.build_document(data, file_path.name, lazy, validator)
 
         if "sbom" in data:
             sbom_data = data["sbom"]
@@ -17,32 +104,110 @@ class SpdxParser:
             sbom_data = data
 
         packages = []
+        relationships: List[SpdxRelationship] = []
         for pkg_data in sbom_data.get("packages", []):
-            packages.append(
-                SpdxPackage(
-                    name=pkg_data.get("name", ""),
-                    spdx_id=pkg_data.get("SPDXID", ""),
-                    download_location=pkg_data.get("downloadLocation", "NOASSERTION"),
-                    files_analyzed=pkg_data.get("filesAnalyzed", False),
-                    version_info=pkg_data.get("versionInfo"),
-                    license_concluded=pkg_data.get("licenseConcluded"),
-                    copyright_text=pkg_data.get("copyrightText"),
-                    external_refs=pkg_data.get("externalRefs", []),
-                    source_sbom=file_path.name,
-                )
+            pkg = SpdxParser.build_package(pkg_data, file_path.name, lazy, passthrough)
+            if validator is not None:
+                validator.add_package(pkg)
+            packages.append(pkg)
+            relationships.extend(
+                SpdxParser.has_files_relationships(pkg_data, file_path.name)
             )
 
-        relationships = []
+        elements: Optional[ElementSpool] = None
+        for section in ElementSpool.SECTIONS:
+            for record in sbom_data.get(section, []):
+                if elements is None:
+                    elements = ElementSpool()
+                elements.append(section, record)
+
         for rel_data in sbom_data.get("relationships", []):
-            relationships.append(
-                SpdxRelationship(
-                    spdx_element_id=rel_data.get("spdxElementId", ""),
-                    related_spdx_element=rel_data.get("relatedSpdxElement", ""),
-                    relationship_type=rel_data.get("relationshipType", ""),
-                    source_sbom=file_path.name,
-                )
+            rel = SpdxParser.build_relationship(rel_data, file_path.name, passthrough)
+            if validator is not None:
+                validator.add_relationship(rel)
+            relationships.append(rel)
+
+        document = SpdxParser.build_document(
+            sbom_data, packages, relationships, file_path.name
+        )
+        document.elements = elements
+        return document
+
+    @staticmethod
+    def build_package(
+        pkg_data: Dict[str, Any],
+        source: str,
+        lazy: bool = False,
+        passthrough: bool = False,
+    ) -> BaseSpdxPackage:
+        if lazy:
+            return LazySpdxPackage(pkg_data, source, passthrough)
+
+        external_refs = pkg_data.get("externalRefs", [])
+        for ref in external_refs:
+            for key in _INTERNED_REF_KEYS:
+                if key in ref:
+                    ref[key] = _intern(ref[key])
+
+        # Strings such as SPDXIDs, NOASSERTION, license IDs and the source file
+        # name repeat across packages and relationships; interning keeps one copy.
+        # An absent filesAnalyzed means true in SPDX 2.x, and is written back so.
+        return SpdxPackage(
+            name=_intern(pkg_data.get("name", "")),
+            spdx_id=_intern(pkg_data.get("SPDXID", "")),
+            download_location=_intern(pkg_data.get("downloadLocation", "NOASSERTION")),
+            files_analyzed=pkg_data.get("filesAnalyzed", True),
+            version_info=_intern(pkg_data.get("versionInfo")),
+            license_concluded=_intern(pkg_data.get("licenseConcluded")),
+            copyright_text=_intern(pkg_data.get("copyrightText")),
+            external_refs=external_refs,
+            source_sbom=_intern(source),
+            raw_record=pkg_data if passthrough else None,
+        )
+
+    @staticmethod
+    def build_relationship(
+        rel_data: Dict[str, Any], source: str, passthrough: bool = False
+    ) -> SpdxRelationship:
+        rel = SpdxParser.make_relationship(
+            rel_data.get("spdxElementId", ""),
+            rel_data.get("relationshipType", ""),
+            rel_data.get("relatedSpdxElement", ""),
+            source,
+        )
+        if passthrough:
+            rel.raw_record = rel_data
+        return rel
+
+    @staticmethod
+    def has_files_relationships(
+        pkg_data: Dict[str, Any], source: str
+    ) -> Iterator[SpdxRelationship]:
+        # "hasFiles" is the SPDX 2.x shorthand for package CONTAINS file edges;
+        # as relationships they are remapped like any other.
+        for file_id in pkg_data.get("hasFiles", ()):
+            yield SpdxParser.make_relationship(
+                pkg_data.get("SPDXID", ""), "CONTAINS", file_id, source
             )
 
+    @staticmethod
+    def make_relationship(
+        element_id: str, relationship_type: str, related_id: str, source: str
+    ) -> SpdxRelationship:
+        return SpdxRelationship(
+            spdx_element_id=_intern(element_id),
+            related_spdx_element=_intern(related_id),
+            relationship_type=_intern(relationship_type),
+            source_sbom=_intern(source),
+        )
+
+    @staticmethod
+    def build_document(
+        sbom_data: Dict[str, Any],
+        packages: List[BaseSpdxPackage],
+        relationships: List[SpdxRelationship],
+        source: str,
+    ) -> SpdxDocument:
         return SpdxDocument(
             spdx_version=sbom_data.get("spdxVersion", ""),
             data_license=sbom_data.get("dataLicense", "CC0-1.0"),
@@ -53,51 +218,184 @@ class SpdxParser:
             packages=packages,
             relationships=relationships,
             comment=sbom_data.get("comment"),
-            source_file=file_path.name,
+            source_file=source,
         )
 
     @staticmethod
-    def serialize_to_json(document: SpdxDocument) -> Dict[str, Any]:
-        packages_data = []
-        for pkg in document.packages:
-            pkg_dict = {
-                "name": pkg.name,
-                "SPDXID": pkg.spdx_id,
-                "downloadLocation": pkg.download_location,
-                "filesAnalyzed": pkg.files_analyzed,
+    def serialize_to_tag_value(document: SpdxDocument) -> Iterator[str]:
+        from .tag_value import TagValueSerializer
+
+        return TagValueSerializer.iter_lines(document)
+
+    @staticmethod
+    def serialize_to_yaml(document: SpdxDocument) -> Iterator[str]:
+        from .writers import YamlWriter
+
+        return YamlWriter.iter_lines(document)
+
+    @staticmethod
+    def serialize_to_rdf(document: SpdxDocument) -> Iterator[str]:
+        from .writers import RdfXmlWriter
+
+        return RdfXmlWriter.iter_lines(document)
+
+    @staticmethod
+    def serialize_to_json_chunks(
+        document: SpdxDocument, json_backend: str = "auto", canonical: bool = False
+    ) -> Iterator[str]:
+        from .writers import JsonWriter
+
+        return JsonWriter.iter_chunks(document, json_backend, canonical)
+
+    @staticmethod
+    def serialize_to_spdx3(document: SpdxDocument) -> Dict[str, Any]:
+        from .spdx3 import Spdx3Serializer
+
+        return Spdx3Serializer.serialize(document)
+
+    @staticmethod
+    def package_to_dict(
+        pkg: BaseSpdxPackage, spdx_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        # `spdx_id` replaces the package's own, as when writing it merged.
+        if spdx_id is None:
+            spdx_id = pkg.spdx_id
+        if pkg.raw_record is not None:
+            # Passthrough: the source record is written back as-is apart from
+            # the rewritten SPDXID.
+            return SpdxParser.passthrough_package(pkg.raw_record, spdx_id)
+        pkg_dict = {
+            "name": pkg.name,
+            "SPDXID": spdx_id,
+            "downloadLocation": pkg.download_location,
+            "filesAnalyzed": pkg.files_analyzed,
+        }
+        if pkg.version_info:
+            pkg_dict["versionInfo"] = pkg.version_info
+        if pkg.license_concluded:
+            pkg_dict["licenseConcluded"] = pkg.license_concluded
+        if pkg.copyright_text:
+            pkg_dict["copyrightText"] = pkg.copyright_text
+        if pkg.external_refs:
+            pkg_dict["externalRefs"] = pkg.external_refs
+        return pkg_dict
+
+    @staticmethod
+    def passthrough_package(
+        raw_record: Dict[str, Any], spdx_id: Optional[str]
+    ) -> Dict[str, Any]:
+        pkg_dict = {**raw_record, "SPDXID": spdx_id}
+        # "hasFiles" entries are parsed into CONTAINS relationships.
+        pkg_dict.pop("hasFiles", None)
+        return pkg_dict
+
+    @staticmethod
+    def relationship_to_dict(rel: BaseSpdxRelationship) -> Dict[str, Any]:
+        if rel.raw_record is not None:
+            return {
+                **rel.raw_record,
+                "spdxElementId": rel.spdx_element_id,
+                "relatedSpdxElement": rel.related_spdx_element,
             }
-            if pkg.version_info:
-                pkg_dict["versionInfo"] = pkg.version_info
-            if pkg.license_concluded:
-                pkg_dict["licenseConcluded"] = pkg.license_concluded
-            if pkg.copyright_text:
-                pkg_dict["copyrightText"] = pkg.copyright_text
-            if pkg.external_refs:
-                pkg_dict["externalRefs"] = pkg.external_refs
-            packages_data.append(pkg_dict)
-
-        relationships_data = []
-        for rel in document.relationships:
-            relationships_data.append(
-                {
-                    "spdxElementId": rel.spdx_element_id,
-                    "relatedSpdxElement": rel.related_spdx_element,
-                    "relationshipType": rel.relationship_type,
-                }
-            )
+        return {
+            "spdxElementId": rel.spdx_element_id,
+            "relatedSpdxElement": rel.related_spdx_element,
+            "relationshipType": rel.relationship_type,
+        }
 
-        sbom_dict = {
+    @staticmethod
+    def document_header(document: SpdxDocument) -> Dict[str, Any]:
+        return {
             "spdxVersion": document.spdx_version,
             "dataLicense": document.data_license,
             "SPDXID": document.spdx_id,
             "name": document.name,
             "documentNamespace": document.document_namespace,
             "creationInfo": document.creation_info,
-            "packages": packages_data,
-            "relationships": relationships_data,
         }
 
+    @staticmethod
+    def store_package_dicts(store: ColumnarStore) -> List[Dict[str, Any]]:
+        # package_to_dict over the columns directly, without row views.
+        strings = store.strings
+        columns = store.package_columns
+        rows = zip(
+            columns["name"],
+            columns["spdx_id"],
+            columns["download_location"],
+            store.files_analyzed,
+            columns["version_info"],
+            columns["license_concluded"],
+            columns["copyright_text"],
+            store.external_refs,
+        )
+        packages = []
+        for row, raw in zip(rows, store.raw_records):
+            name, spdx_id, location, analyzed, version, license, text, refs = row
+            if raw is not None:
+                packages.append(SpdxParser.passthrough_package(raw, strings[spdx_id]))
+                continue
+            pkg_dict: Dict[str, Any] = {
+                "name": strings[name],
+                "SPDXID": strings[spdx_id],
+                "downloadLocation": strings[location],
+                "filesAnalyzed": bool(analyzed),
+            }
+            if strings[version]:
+                pkg_dict["versionInfo"] = strings[version]
+            if strings[license]:
+                pkg_dict["licenseConcluded"] = strings[license]
+            if strings[text]:
+                pkg_dict["copyrightText"] = strings[text]
+            if refs:
+                pkg_dict["externalRefs"] = refs
+            packages.append(pkg_dict)
+        return packages
+
+    @staticmethod
+    def store_relationship_dicts(store: ColumnarStore) -> List[Dict[str, Any]]:
+        strings = store.strings
+        rows = zip(
+            store.rel_element, store.rel_related, store.rel_type, store.rel_raw_records
+        )
+        relationships = []
+        for element, related, relationship_type, raw in rows:
+            rel_dict = {
+                "spdxElementId": strings[element],
+                "relatedSpdxElement": strings[related],
+            }
+            if raw is not None:
+                relationships.append({**raw, **rel_dict})
+            else:
+                rel_dict["relationshipType"] = strings[relationship_type]
+                relationships.append(rel_dict)
+        return relationships
+
+    @staticmethod
+    def serialize_to_json(
+        document: SpdxDocument, include_elements: bool = True
+    ) -> Dict[str, Any]:
+        sbom_dict = SpdxParser.document_header(document)
+        if document.store is not None:
+            sbom_dict["packages"] = SpdxParser.store_package_dicts(document.store)
+            sbom_dict["relationships"] = SpdxParser.store_relationship_dicts(
+                document.store
+            )
+        else:
+            sbom_dict["packages"] = [
+                SpdxParser.package_to_dict(pkg) for pkg in document.packages
+            ]
+            sbom_dict["relationships"] = [
+                SpdxParser.relationship_to_dict(rel) for rel in document.relationships
+            ]
+
         if document.comment:
             sbom_dict["comment"] = document.comment
 
+        if include_elements and document.elements is not None:
+            # Reads every spooled record; JsonWriter streams them instead.
+            for section in ElementSpool.SECTIONS:
+                if document.elements.counts[section]:
+                    sbom_dict[section] = list(document.elements.iter_records(section))
+
         return {"sbom": sbom_dict}
@@ -0,0 +1,387 @@
+import dataclasses
+import heapq
+import pickle  # nosec B403 - spill files are only written by this merge
+import tempfile
+import time
+import zlib
+from concurrent.futures import Executor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import IO, Any, Callable, Dict, Iterator, List, Optional, Tuple
+from ..domain.models import MergeResult, MergeStatistics, SpdxDocument
+from ..infrastructure.element_spool import ElementSpool
+from ..infrastructure.file_handler import FileHandler
+from ..infrastructure.id_table import IdKey
+from ..infrastructure.json_codec import get_json_codec
+from .parse_stage import create_executor, default_executor, parse_path, resolve_jobs
+from .parser import SpdxParser
+from .streaming_merger import StreamingMerger
+from .validator import DocumentValidator
+from .writers import JsonSectionWriter, JsonWriter
+
+
+@dataclass
+class MapOutcome:
+    path: Path
+    header: Optional[SpdxDocument] = None
+    error: Optional[str] = None
+    cache_hit: Optional[bool] = None
+    package_count: int = 0
+    elements: Optional[ElementSpool] = None
+
+
+def partition_of(key: str, partitions: int) -> int:
+    # crc32 rather than hash(): worker processes seed string hashing differently.
+    return zlib.crc32(key.encode("utf-8")) % partitions
+
+
+def spill_path(spill_dir: Path, kind: str, label: str, partition: int) -> Path:
+    return spill_dir / f"{kind}-{label}-{partition}.pickle"
+
+
+def iter_spill(path: Path) -> Iterator[Tuple[Any, ...]]:
+    if not path.exists():
+        return
+    with open(path, "rb") as f:
+        while True:
+            try:
+                yield pickle.load(f)  # nosec B301 - written by this merge
+            except EOFError:
+                return
+
+
+class SpillWriter:
+    # One task's records of one kind, split into a pickle stream per partition.
+
+    def __init__(self, spill_dir: Path, kind: str, label: str):
+        self.spill_dir = spill_dir
+        self.kind = kind
+        self.label = label
+        self._files: Dict[int, IO[bytes]] = {}
+
+    def write(self, partition: int, record: Tuple[Any, ...]) -> None:
+        spill = self._files.get(partition)
+        if spill is None:
+            path = spill_path(self.spill_dir, self.kind, self.label, partition)
+            spill = self._files[partition] = open(path, "wb")
+        pickle.dump(record, spill, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def close(self) -> None:
+        for spill in self._files.values():
+            spill.close()
+
+
+class PartitionedMerger(StreamingMerger):
+    # Merges across worker processes in three steps:
+    #   map     - contiguous batches of inputs are parsed, given merged IDs,
+    #             remapped and encoded; each package is spilled to the partition
+    #             of its merged SPDXID, each relationship to that of its key
+    #   reduce  - each partition drops duplicates on its own, first occurrence
+    #             in input order winning, as in the in-memory merge
+    #   merge   - the parent merges the partitions back by (input, position),
+    #             so the output is deterministic and matches the other engines
+
+    # Map batches per worker: enough to even out uneven input sizes.
+    BATCHES_PER_WORKER = 4
+
+    def __init__(self, *args, work_dir: Optional[Path] = None, **kwargs):
+        kwargs.setdefault("executor", default_executor("parallel"))
+        super().__init__(*args, **kwargs)
+        self.work_dir = work_dir
+
+    @staticmethod
+    def split_batches(paths: List[Path], batch_count: int) -> List[List[Path]]:
+        # Contiguous batches of roughly equal total size, keeping input order.
+        sizes = []
+        for path in paths:
+            try:
+                sizes.append(path.stat().st_size)
+            except OSError:
+                sizes.append(0)
+        target = sum(sizes) / max(1, batch_count)
+
+        batches: List[List[Path]] = [[]]
+        batch_size = 0
+        for path, size in zip(paths, sizes):
+            if (
+                batches[-1]
+                and batch_size + size > target
+                and len(batches) < batch_count
+            ):
+                batches.append([])
+                batch_size = 0
+            batches[-1].append(path)
+            batch_size += size
+        return batches
+
+    def merge_to_file(
+        self,
+        root_sbom_path: Path,
+        dependency_sbom_paths: List[Path],
+        output_path: Path,
+        canonical: bool = False,
+    ) -> MergeResult:
+        start_time = time.time()
+        statistics = MergeStatistics()
+        id_counts = self.id_generator.counts()
+        workers = resolve_jobs(self.jobs)
+        batches = self.split_batches(
+            [root_sbom_path, *dependency_sbom_paths],
+            workers * self.BATCHES_PER_WORKER,
+        )
+
+        with tempfile.TemporaryDirectory(dir=self.work_dir) as spill_name:
+            spill_dir = Path(spill_name)
+            pool = create_executor(self.executor, workers) if workers > 1 else None
+            try:
+                first_index = 0
+                map_tasks = []
+                for label, batch in enumerate(batches):
+                    map_tasks.append(
+                        (str(label), first_index, batch, spill_dir, workers, canonical)
+                    )
+                    first_index += len(batch)
+                outcomes: List[MapOutcome] = []
+                worker_counts = [0, 0, 0]
+                for batch_outcomes, batch_counts, new_ids in self._run(
+                    pool, self._map_batch, map_tasks
+                ):
+                    outcomes.extend(batch_outcomes)
+                    # Worker processes have their own copy of the ID generator.
+                    if pool is not None and self.executor == "process":
+                        for i, count in enumerate(batch_counts):
+                            worker_counts[i] += count
+                        self.id_generator.new_ids.update(new_ids)
+
+                headers, elements = self._collect(outcomes, statistics)
+                errors, warnings = self.validator.validate_version_compatibility(
+                    headers
+                )
+                statistics.validation_errors.extend(errors)
+                statistics.validation_warnings.extend(warnings)
+                if errors:
+                    raise ValueError(
+                        f"Cannot merge SBOMs due to validation errors: "
+                        f"{'; '.join(errors)}"
+                    )
+
+                reduce_tasks = [
+                    (spill_dir, kind, partition, len(batches))
+                    for kind in ("packages", "relationships")
+                    for partition in range(workers)
+                ]
+                reduced = self._run(pool, self._reduce_partition, reduce_tasks)
+            finally:
+                if pool is not None:
+                    pool.shutdown()
+
+            duplicate_count = sum(dropped for _, dropped in reduced[:workers])
+            duplicate_relationships = sum(dropped for _, dropped in reduced[workers:])
+            merged_doc = self._merged_document(
+                headers[0], len(headers) - 1, duplicate_count, elements
+            )
+            self._write_output(
+                merged_doc, spill_dir, workers, output_path, canonical, statistics
+            )
+
+        statistics.total_sboms_processed = len(headers)
+        statistics.duplicate_packages_removed = duplicate_count
+        statistics.duplicate_relationships_removed = duplicate_relationships
+        self._record_id_generation(statistics, id_counts, tuple(worker_counts))
+        statistics.processing_time_seconds = time.time() - start_time
+
+        return MergeResult(
+            merged_document=merged_doc,
+            statistics=statistics,
+            output_path=str(output_path),
+        )
+
+    @staticmethod
+    def _run(
+        pool: Optional[Executor], task: Callable[..., Any], arguments: List[Tuple]
+    ) -> List[Any]:
+        if pool is None:
+            return [task(*args) for args in arguments]
+        futures = [pool.submit(task, *args) for args in arguments]
+        return [future.result() for future in futures]
+
+    def _map_batch(
+        self,
+        label: str,
+        first_index: int,
+        paths: List[Path],
+        spill_dir: Path,
+        partitions: int,
+        canonical: bool,
+    ) -> Tuple[List[MapOutcome], Tuple[int, ...], Dict[IdKey, str]]:
+        # Also returns the batch's ID generation counts and the generator's
+        # new IDs, for when it runs in a worker process.
+        codec = get_json_codec(self.parse_options["json_backend"])
+        id_counts = self.id_generator.counts()
+        packages = SpillWriter(spill_dir, "packages", label)
+        relationships = SpillWriter(spill_dir, "relationships", label)
+        outcomes = []
+
+        try:
+            for index, path in enumerate(paths, first_index):
+                outcome = MapOutcome(path)
+                outcomes.append(outcome)
+                is_root = index == 0
+                try:
+                    doc, outcome.cache_hit = parse_path(
+                        path, self.parse_options, self.cache
+                    )
+                except Exception as e:
+                    # As in the other engines, only a broken root stops the merge.
+                    if is_root:
+                        raise
+                    outcome.error = str(e)
+                    continue
+
+                contribution = self._contribution(doc, is_root)
+                for position, (pkg, spdx_id) in enumerate(contribution.packages):
+                    encoded = JsonWriter.encode_element(
+                        codec, SpdxParser.package_to_dict(pkg, spdx_id), canonical
+                    )
+                    packages.write(
+                        partition_of(spdx_id, partitions),
+                        (index, position, spdx_id, pkg.name, encoded),
+                    )
+                for position, rel in enumerate(contribution.relationships):
+                    key = (
+                        rel.spdx_element_id,
+                        rel.related_spdx_element,
+                        rel.relationship_type,
+                    )
+                    encoded = JsonWriter.encode_element(
+                        codec, SpdxParser.relationship_to_dict(rel), canonical
+                    )
+                    relationships.write(
+                        partition_of("\0".join(key), partitions),
+                        (index, position, *key, encoded),
+                    )
+
+                if doc.elements is not None and not is_root:
+                    outcome.elements = ElementSpool()
+                    self._append_elements(outcome.elements, doc, is_root=False)
+                else:
+                    outcome.elements = doc.elements
+                outcome.package_count = len(doc.packages)
+                outcome.header = dataclasses.replace(
+                    doc, packages=[], relationships=[], store=None, elements=None
+                )
+        finally:
+            packages.close()
+            relationships.close()
+
+        batch_counts = tuple(
+            now - start for now, start in zip(self.id_generator.counts(), id_counts)
+        )
+        return outcomes, batch_counts, self.id_generator.new_ids
+
+    def _collect(
+        self, outcomes: List[MapOutcome], statistics: MergeStatistics
+    ) -> Tuple[List[SpdxDocument], Optional[ElementSpool]]:
+        headers: List[SpdxDocument] = []
+        elements: Optional[ElementSpool] = None
+
+        for outcome in outcomes:
+            self._record_cache_use(statistics, outcome.cache_hit)
+            if outcome.header is None:
+                statistics.validation_errors.append(
+                    f"Failed to parse {outcome.path.name}: {outcome.error}"
+                )
+                continue
+
+            if headers:
+                statistics.dependency_packages_count += outcome.package_count
+            else:
+                statistics.root_packages_count = outcome.package_count
+            if outcome.elements is not None:
+                if elements is None:
+                    elements = outcome.elements if not headers else ElementSpool()
+                if elements is not outcome.elements:
+                    elements.extend(outcome.elements)
+            headers.append(outcome.header)
+
+        for header in headers:
+            self._record_parse_validation(statistics, header)
+        return headers, elements
+
+    @staticmethod
+    def _reduce_partition(
+        spill_dir: Path, kind: str, partition: int, batch_count: int
+    ) -> Tuple[int, int]:
+        # Batches are contiguous and read in order, so records arrive in input
+        # order and the first of each key is the one the in-memory merge keeps.
+        # Packages repeated within the root are dropped without being counted.
+        seen = set()
+        kept = dropped = 0
+        merged_path = spill_path(spill_dir, kind, "merged", partition)
+
+        with open(merged_path, "wb") as merged:
+            for label in range(batch_count):
+                path = spill_path(spill_dir, kind, str(label), partition)
+                for record in iter_spill(path):
+                    key = record[2] if kind == "packages" else record[2:5]
+                    if key in seen:
+                        if kind == "relationships" or record[0]:
+                            dropped += 1
+                        continue
+                    seen.add(key)
+                    pickle.dump(record, merged, protocol=pickle.HIGHEST_PROTOCOL)
+                    kept += 1
+                path.unlink(missing_ok=True)
+
+        return kept, dropped
+
+    def _write_output(
+        self,
+        merged_doc: SpdxDocument,
+        spill_dir: Path,
+        partitions: int,
+        output_path: Path,
+        canonical: bool,
+        statistics: MergeStatistics,
+    ) -> None:
+        json_backend = self.parse_options["json_backend"]
+        packages = JsonSectionWriter(json_backend, canonical)
+        relationships = JsonSectionWriter(json_backend, canonical)
+        validator = DocumentValidator(check_packages=not self.parse_options["validate"])
+
+        def merged(kind: str) -> Iterator[Tuple[Any, ...]]:
+            # (input, position) leads every record and is unique, so tuple order
+            # is input order.
+            return heapq.merge(
+                *(
+                    iter_spill(spill_path(spill_dir, kind, "merged", partition))
+                    for partition in range(partitions)
+                )
+            )
+
+        try:
+            for _, _, spdx_id, name, encoded in merged("packages"):
+                validator.add_package_id(spdx_id, name)
+                packages.append_encoded(encoded)
+            for _, _, element_id, related_id, _, encoded in merged("relationships"):
+                validator.add_endpoints(element_id, related_id)
+                relationships.append_encoded(encoded)
+
+            doc_errors, doc_warnings = validator.finish(merged_doc)
+            statistics.validation_errors.extend(doc_errors)
+            statistics.validation_warnings.extend(doc_warnings)
+
+            FileHandler.save_lines(
+                JsonWriter.iter_chunks(
+                    merged_doc,
+                    json_backend,
+                    canonical,
+                    {"packages": packages, "relationships": relationships},
+                ),
+                output_path,
+            )
+            statistics.total_packages = packages.count
+            statistics.total_relationships = relationships.count
+        finally:
+            packages.close()
+            relationships.close()
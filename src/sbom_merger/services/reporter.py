@@ -1,6 +1,7 @@
 from pathlib import Path
 from typing import Optional, Dict
 from ..domain.models import MergeResult
+from .merge_planner import format_bytes
 
 
 class MergeReporter:
@@ -30,13 +31,48 @@ class MergeReporter:
         report_lines.append(
             f"- **Duplicate Packages Removed:** {stats.duplicate_packages_removed}"
         )
+        report_lines.append(
+            f"- **Duplicate Relationships Removed:** "
+            f"{stats.duplicate_relationships_removed}"
+        )
         report_lines.append(f"- **Total Relationships:** {stats.total_relationships}")
+        if stats.cache_hits or stats.cache_misses:
+            report_lines.append(
+                f"- **Parse Cache:** {stats.cache_hits} hits, "
+                f"{stats.cache_misses} misses"
+            )
+        if stats.id_cache_hits or stats.id_table_hits or stats.ids_generated:
+            report_lines.append(
+                f"- **Package ID Reuse:** {stats.id_hit_rate:.1%} "
+                f"({stats.id_cache_hits} cached, {stats.id_table_hits} from ID "
+                f"table, {stats.ids_generated} generated)"
+            )
         report_lines.append(
             f"- **Processing Time:** {stats.processing_time_seconds:.2f} seconds\n"
         )
 
         report_lines.append("---\n")
 
+        if result.plan:
+            plan = result.plan
+            report_lines.append("## Merge Plan\n")
+            report_lines.append(f"- **Engine:** {plan.engine}")
+            report_lines.append(f"- **Workers:** {plan.jobs}")
+            report_lines.append(
+                f"- **Inputs Scanned:** {plan.input_count} SBOMs, "
+                f"{format_bytes(plan.input_bytes)}, "
+                f"~{plan.estimated_elements} elements"
+            )
+            report_lines.append(
+                f"- **Memory Estimate:** {format_bytes(plan.in_memory_bytes)} in "
+                f"memory, {format_bytes(plan.streamed_bytes)} streamed, budget "
+                f"{format_bytes(plan.memory_budget)}\n"
+            )
+            for reason in plan.reasons:
+                report_lines.append(f"- {reason}")
+            report_lines.append("")
+            report_lines.append("---\n")
+
         report_lines.append("## Validation Results\n")
 
         if not stats.validation_errors and not stats.validation_warnings:
@@ -0,0 +1,419 @@
+import re
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from ..domain.models import BaseSpdxPackage, SpdxDocument, SpdxRelationship
+from ..infrastructure.file_handler import FileHandler
+from ..infrastructure.json_codec import get_json_codec
+from .parser import SpdxParser
+from .validator import DocumentValidator
+
+SPDX3_CONTEXT = "https://spdx.org/rdf/3.0.1/spdx-context.jsonld"
+SPDX3_SPEC_VERSION = "3.0.1"
+DOCUMENT_REF = "SPDXRef-DOCUMENT"
+CREATION_INFO_ID = "_:creationinfo"
+
+PACKAGE_TYPES = {"software_Package", "Package"}
+AGENT_TYPES = {"Person": "Person", "Organization": "Organization", "Tool": "Tool"}
+LICENSE_RELATIONSHIPS = {"hasConcludedLicense": "licenseConcluded"}
+
+# SPDX 2.3 relationship types as SPDX 3.0 ones, after the 3.0 migration guide:
+# (3.0 type, whether from and to swap, lifecycle scope). Most *_OF types have
+# no 3.0 counterpart of their own and become the reverse edge; dependency and
+# tool types for one lifecycle phase become a LifecycleScopedRelationship.
+SPDX3_RELATIONSHIP_TYPES: Dict[str, Tuple[str, bool, Optional[str]]] = {
+    "AMENDS": ("amendedBy", True, None),
+    "ANCESTOR_OF": ("ancestorOf", False, None),
+    "BUILD_DEPENDENCY_OF": ("dependsOn", True, "build"),
+    "BUILD_TOOL_OF": ("usesTool", True, "build"),
+    "CONTAINED_BY": ("contains", True, None),
+    "CONTAINS": ("contains", False, None),
+    "COPY_OF": ("copiedTo", True, None),
+    "DATA_FILE_OF": ("hasDataFile", True, None),
+    "DEPENDENCY_MANIFEST_OF": ("hasDependencyManifest", True, None),
+    "DEPENDENCY_OF": ("dependsOn", True, None),
+    "DEPENDS_ON": ("dependsOn", False, None),
+    "DESCENDANT_OF": ("descendantOf", False, None),
+    "DESCRIBED_BY": ("describes", True, None),
+    "DESCRIBES": ("describes", False, None),
+    "DEV_DEPENDENCY_OF": ("dependsOn", True, "development"),
+    "DEV_TOOL_OF": ("usesTool", True, "development"),
+    "DISTRIBUTION_ARTIFACT": ("hasDistributionArtifact", False, None),
+    "DOCUMENTATION_OF": ("hasDocumentation", True, None),
+    "DYNAMIC_LINK": ("hasDynamicLink", False, None),
+    "EXAMPLE_OF": ("hasExample", True, None),
+    "EXPANDED_FROM_ARCHIVE": ("expandsTo", True, None),
+    "FILE_ADDED": ("hasAddedFile", False, None),
+    "FILE_DELETED": ("hasDeletedFile", False, None),
+    "FILE_MODIFIED": ("modifiedBy", True, None),
+    "GENERATED_FROM": ("generates", True, None),
+    "GENERATES": ("generates", False, None),
+    "HAS_PREREQUISITE": ("hasPrerequisite", False, None),
+    "METAFILE_OF": ("hasMetadata", True, None),
+    "OPTIONAL_COMPONENT_OF": ("hasOptionalComponent", True, None),
+    "OPTIONAL_DEPENDENCY_OF": ("hasOptionalDependency", True, None),
+    "OTHER": ("other", False, None),
+    "PATCH_APPLIED": ("patchedBy", True, None),
+    "PATCH_FOR": ("patchedBy", True, None),
+    "PREREQUISITE_FOR": ("hasPrerequisite", True, None),
+    "PROVIDED_DEPENDENCY_OF": ("hasProvidedDependency", True, None),
+    "REQUIREMENT_DESCRIPTION_FOR": ("hasRequirement", True, None),
+    "RUNTIME_DEPENDENCY_OF": ("dependsOn", True, "runtime"),
+    "SPECIFICATION_FOR": ("hasSpecification", True, None),
+    "STATIC_LINK": ("hasStaticLink", False, None),
+    "TEST_CASE_OF": ("hasTestCase", True, None),
+    "TEST_DEPENDENCY_OF": ("dependsOn", True, "test"),
+    "TEST_OF": ("hasTest", True, None),
+    "TEST_TOOL_OF": ("usesTool", True, "test"),
+    "VARIANT_OF": ("hasVariant", True, None),
+}
+
+# The reverse, for reading: a 3.0 (type, scope) as a 2.3 type and whether from
+# and to swap back. Where several 2.3 types share one, the unswapped one wins.
+SPDX2_RELATIONSHIP_TYPES: Dict[Tuple[str, Optional[str]], Tuple[str, bool]] = {}
+for _spdx2_type, (_spdx3_type, _swap, _scope) in SPDX3_RELATIONSHIP_TYPES.items():
+    if not _swap or (_spdx3_type, _scope) not in SPDX2_RELATIONSHIP_TYPES:
+        SPDX2_RELATIONSHIP_TYPES[(_spdx3_type, _scope)] = (_spdx2_type, _swap)
+
+_CAMEL_BOUNDARY = re.compile(r"(?<!^)(?=[A-Z])")
+
+
+def _to_spdx2_relationship_type(
+    relationship_type: str, scope: Optional[str] = None
+) -> Tuple[str, bool]:
+    for key in ((relationship_type, scope), (relationship_type, None)):
+        if key in SPDX2_RELATIONSHIP_TYPES:
+            return SPDX2_RELATIONSHIP_TYPES[key]
+    # 3.0-only types (affects, hasInput, ...) keep their name, upper-cased.
+    return _CAMEL_BOUNDARY.sub("_", relationship_type).upper(), False
+
+
+def _as_list(value: Any) -> List[Any]:
+    if value is None:
+        return []
+    return value if isinstance(value, list) else [value]
+
+
+def _element_id(element: Dict[str, Any]) -> Optional[str]:
+    return element.get("spdxId") or element.get("@id")
+
+
+class Spdx3Parser:
+
+    @staticmethod
+    def is_spdx3(data: Any) -> bool:
+        return isinstance(data, dict) and "@graph" in data
+
+    @staticmethod
+    def parse_sbom_file(
+        file_path: Path,
+        json_backend: str = "auto",
+        lazy: bool = False,
+        validator: Optional[DocumentValidator] = None,
+    ) -> SpdxDocument:
+        with FileHandler.read_sbom(file_path) as buffer:
+            data = get_json_codec(json_backend).loads(buffer)
+        return Spdx3Parser.build_document(data, file_path.name, lazy, validator)
+
+    @staticmethod
+    def build_document(
+        data: Dict[str, Any],
+        source: str,
+        lazy: bool = False,
+        validator: Optional[DocumentValidator] = None,
+    ) -> SpdxDocument:
+        # Single pass over the graph: every element is indexed by its ID so that
+        # relationship endpoints and references resolve in constant time.
+        index: Dict[str, Dict[str, Any]] = {}
+        document_element: Dict[str, Any] = {}
+        package_ids: List[str] = []
+        relationship_elements: List[Dict[str, Any]] = []
+
+        for element in data.get("@graph", []):
+            element_type = element.get("type") or element.get("@type")
+            element_id = _element_id(element)
+            if element_id:
+                index[element_id] = element
+
+            if element_type == "SpdxDocument":
+                document_element = element
+            elif element_type in PACKAGE_TYPES and element_id:
+                package_ids.append(element_id)
+            elif element_type in ("Relationship", "LifecycleScopedRelationship"):
+                relationship_elements.append(element)
+
+        document_id = _element_id(document_element) or ""
+        prefix = f"{document_id}#"
+
+        def local_id(iri: str) -> str:
+            # Elements minted in the document's own namespace map back to the
+            # short SPDX 2.3 identifiers; foreign IRIs are kept verbatim.
+            if iri == document_id:
+                return DOCUMENT_REF
+            if document_id and iri.startswith(prefix):
+                return iri[len(prefix) :]
+            return iri
+
+        package_records = {
+            element_id: Spdx3Parser._package_record(
+                index[element_id], local_id(element_id)
+            )
+            for element_id in package_ids
+        }
+
+        relationships: List[SpdxRelationship] = []
+        for root_id in _as_list(document_element.get("rootElement")):
+            relationships.append(
+                SpdxParser.make_relationship(
+                    DOCUMENT_REF, "DESCRIBES", local_id(root_id), source
+                )
+            )
+
+        for element in relationship_elements:
+            relationship_type = element.get("relationshipType", "")
+            from_id = element.get("from", "")
+            targets = _as_list(element.get("to"))
+
+            license_field = LICENSE_RELATIONSHIPS.get(relationship_type)
+            if license_field:
+                if from_id in package_records and targets:
+                    package_records[from_id][license_field] = (
+                        Spdx3Parser._license_expression(index, targets[0])
+                    )
+                continue
+
+            spdx2_type, swap = _to_spdx2_relationship_type(
+                relationship_type, element.get("scope")
+            )
+            for target in targets:
+                element_id, related_id = local_id(from_id), local_id(target)
+                if swap:
+                    element_id, related_id = related_id, element_id
+                relationships.append(
+                    SpdxParser.make_relationship(
+                        element_id, spdx2_type, related_id, source
+                    )
+                )
+
+        packages: List[BaseSpdxPackage] = [
+            SpdxParser.build_package(record, source, lazy)
+            for record in package_records.values()
+        ]
+
+        creation_info = Spdx3Parser._creation_info(
+            index, document_element.get("creationInfo")
+        )
+        header = {
+            "spdxVersion": f"SPDX-{creation_info.pop('specVersion', '3.0')}",
+            "dataLicense": Spdx3Parser._license_expression(
+                index, document_element.get("dataLicense", "CC0-1.0")
+            ),
+            "SPDXID": DOCUMENT_REF,
+            "name": document_element.get("name", ""),
+            "documentNamespace": document_id,
+            "creationInfo": creation_info,
+            "comment": document_element.get("comment"),
+        }
+        if validator is not None:
+            # Conversion builds its own element lists; feed them to the
+            # validator before the document is assembled.
+            for pkg in packages:
+                validator.add_package(pkg)
+            for rel in relationships:
+                validator.add_relationship(rel)
+        return SpdxParser.build_document(header, packages, relationships, source)
+
+    @staticmethod
+    def _package_record(element: Dict[str, Any], spdx_id: str) -> Dict[str, Any]:
+        record: Dict[str, Any] = {
+            "name": element.get("name", ""),
+            "SPDXID": spdx_id,
+            "downloadLocation": element.get("software_downloadLocation", "NOASSERTION"),
+            # SPDX 3 drops filesAnalyzed; converted packages claim no analysis.
+            "filesAnalyzed": False,
+        }
+        if "software_packageVersion" in element:
+            record["versionInfo"] = element["software_packageVersion"]
+        if "software_copyrightText" in element:
+            record["copyrightText"] = element["software_copyrightText"]
+
+        purl = element.get("software_packageUrl")
+        for identifier in _as_list(element.get("externalIdentifier")):
+            if identifier.get("externalIdentifierType") == "packageUrl":
+                purl = purl or identifier.get("identifier")
+        if purl:
+            record["externalRefs"] = [
+                {
+                    "referenceCategory": "PACKAGE-MANAGER",
+                    "referenceType": "purl",
+                    "referenceLocator": purl,
+                }
+            ]
+        return record
+
+    @staticmethod
+    def _license_expression(index: Dict[str, Dict[str, Any]], value: Any) -> str:
+        element = index.get(value) if isinstance(value, str) else value
+        if isinstance(element, dict):
+            expression = element.get(
+                "simplelicensing_licenseExpression", element.get("name", "")
+            )
+            return str(expression)
+
+        text = str(value)
+        # Listed licenses are referenced by IRI, e.g. https://spdx.org/licenses/MIT
+        return text.rsplit("/", 1)[-1] if text.startswith("http") else text
+
+    @staticmethod
+    def _creation_info(
+        index: Dict[str, Dict[str, Any]], reference: Any
+    ) -> Dict[str, Any]:
+        element = index.get(reference) if isinstance(reference, str) else reference
+        if not isinstance(element, dict):
+            return {}
+
+        creators = []
+        for agent_ref in _as_list(element.get("createdBy")) + _as_list(
+            element.get("createdUsing")
+        ):
+            agent = index.get(agent_ref, {}) if isinstance(agent_ref, str) else {}
+            kind = AGENT_TYPES.get(agent.get("type", ""), "Organization")
+            creators.append(f"{kind}: {agent.get('name', agent_ref)}")
+
+        creation_info: Dict[str, Any] = {"creators": creators}
+        for key in ("created", "specVersion", "comment"):
+            if key in element:
+                creation_info[key] = element[key]
+        return creation_info
+
+
+class Spdx3Serializer:
+
+    @staticmethod
+    def serialize(document: SpdxDocument) -> Dict[str, Any]:
+        namespace = document.document_namespace.rstrip("#")
+
+        def iri(spdx_id: str) -> str:
+            if spdx_id == document.spdx_id:
+                return namespace
+            if "://" in spdx_id:
+                return spdx_id
+            return f"{namespace}#{spdx_id}"
+
+        graph: List[Dict[str, Any]] = []
+        created_by: List[str] = []
+        created_using: List[str] = []
+        for index, creator in enumerate(document.creation_info.get("creators", [])):
+            kind, _, name = creator.partition(":")
+            kind = kind.strip() if kind.strip() in AGENT_TYPES else "Organization"
+            agent_id = f"{namespace}#SPDXRef-Agent-{index}"
+            graph.append(
+                {
+                    "type": kind,
+                    "spdxId": agent_id,
+                    "creationInfo": CREATION_INFO_ID,
+                    "name": name.strip() or creator,
+                }
+            )
+            (created_using if kind == "Tool" else created_by).append(agent_id)
+
+        creation_info: Dict[str, Any] = {
+            "type": "CreationInfo",
+            "@id": CREATION_INFO_ID,
+            "specVersion": SPDX3_SPEC_VERSION,
+            "created": document.creation_info.get("created", ""),
+            "createdBy": created_by,
+        }
+        if created_using:
+            creation_info["createdUsing"] = created_using
+        graph.insert(0, creation_info)
+
+        root_elements = []
+        relationships: List[Dict[str, Any]] = []
+        for index, rel in enumerate(document.relationships):
+            spdx3_type, swap, scope = SPDX3_RELATIONSHIP_TYPES.get(
+                rel.relationship_type, ("other", False, None)
+            )
+            from_id, to_id = rel.spdx_element_id, rel.related_spdx_element
+            if swap:
+                from_id, to_id = to_id, from_id
+            if from_id == document.spdx_id and spdx3_type == "describes":
+                # Read back as DESCRIBES, so no separate Relationship element.
+                root_elements.append(iri(to_id))
+                continue
+
+            relationship: Dict[str, Any] = {
+                "type": "LifecycleScopedRelationship" if scope else "Relationship",
+                "spdxId": f"{namespace}#SPDXRef-Relationship-{index}",
+                "creationInfo": CREATION_INFO_ID,
+                "from": iri(from_id),
+                "relationshipType": spdx3_type,
+                "to": [iri(to_id)],
+            }
+            if scope:
+                relationship["scope"] = scope
+            if rel.relationship_type not in SPDX3_RELATIONSHIP_TYPES:
+                # PACKAGE_OF and other types 3.0 dropped.
+                relationship["comment"] = (
+                    f"SPDX 2.3 relationship type {rel.relationship_type}"
+                )
+            relationships.append(relationship)
+
+        spdx_document: Dict[str, Any] = {
+            "type": "SpdxDocument",
+            "spdxId": namespace,
+            "creationInfo": CREATION_INFO_ID,
+            "name": document.name,
+            "dataLicense": document.data_license,
+            "profileConformance": ["core", "software"],
+            "rootElement": root_elements,
+        }
+        if document.comment:
+            spdx_document["comment"] = document.comment
+        graph.append(spdx_document)
+
+        license_count = 0
+        for pkg in document.packages:
+            graph.append(Spdx3Serializer._package_element(pkg, iri(pkg.spdx_id)))
+            if pkg.license_concluded:
+                license_id = f"{namespace}#SPDXRef-License-{license_count}"
+                graph.append(
+                    {
+                        "type": "simplelicensing_LicenseExpression",
+                        "spdxId": license_id,
+                        "creationInfo": CREATION_INFO_ID,
+                        "simplelicensing_licenseExpression": pkg.license_concluded,
+                    }
+                )
+                relationships.append(
+                    {
+                        "type": "Relationship",
+                        "spdxId": f"{namespace}#SPDXRef-Relationship-L{license_count}",
+                        "creationInfo": CREATION_INFO_ID,
+                        "from": iri(pkg.spdx_id),
+                        "relationshipType": "hasConcludedLicense",
+                        "to": [license_id],
+                    }
+                )
+                license_count += 1
+
+        graph.extend(relationships)
+        return {"@context": SPDX3_CONTEXT, "@graph": graph}
+
+    @staticmethod
+    def _package_element(pkg: BaseSpdxPackage, spdx_id: str) -> Dict[str, Any]:
+        element: Dict[str, Any] = {
+            "type": "software_Package",
+            "spdxId": spdx_id,
+            "creationInfo": CREATION_INFO_ID,
+            "name": pkg.name,
+            "software_downloadLocation": pkg.download_location,
+        }
+        if pkg.version_info:
+            element["software_packageVersion"] = pkg.version_info
+        if pkg.copyright_text:
+            element["software_copyrightText"] = pkg.copyright_text
+        for ref in pkg.external_refs:
+            if ref.get("referenceType") == "purl":
+                element["software_packageUrl"] = ref.get("referenceLocator")
+                break
+        return element
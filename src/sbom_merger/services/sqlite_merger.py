@@ -0,0 +1,147 @@
+import itertools
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+from ..domain.models import BaseSpdxPackage, BaseSpdxRelationship, SpdxDocument
+from ..infrastructure.json_codec import get_json_codec
+from ..infrastructure.sqlite_store import SqliteMergeStore
+from .parser import SpdxParser
+from .streaming_merger import MergeSink, StreamingMerger
+from .validator import SpdxValidator
+from .writers import EncodedSection, JsonWriter
+
+
+class SqliteSection:
+    # A staged table read back as an encoded output section.
+
+    def __init__(self, store: SqliteMergeStore, table: str, count: int):
+        self.store = store
+        self.table = table
+        self.count = count
+
+    def iter_chunks(self) -> Iterator[str]:
+        for position, record in enumerate(self.store.iter_records(self.table)):
+            yield ",\n" if position else "\n"
+            yield record
+
+
+class SqliteMergeSink(MergeSink):
+    # Same contract as MergeSink, with the seen IDs, the relationship index and
+    # the encoded records all kept in a SqliteMergeStore instead of memory.
+
+    def __init__(
+        self,
+        json_backend: str,
+        canonical: bool,
+        check_packages: bool = True,
+        expected_ids: int = 1024,
+        directory: Optional[Path] = None,
+    ):
+        self.codec = get_json_codec(json_backend)
+        self.canonical = canonical
+        self.check_packages = check_packages
+        self.store = SqliteMergeStore(expected_ids, directory)
+        self.errors: List[str] = []
+
+    # The dedup key is probed first, so duplicates are never encoded.
+
+    def add_package(self, pkg: BaseSpdxPackage, spdx_id: str) -> bool:
+        if self.store.has_package(spdx_id):
+            return False
+        record = JsonWriter.encode_element(
+            self.codec, SpdxParser.package_to_dict(pkg, spdx_id), self.canonical
+        )
+        self.store.insert_package(spdx_id, record)
+        # Merged IDs are generated and deduplicated, so of the per-package
+        # checks only the name can fail.
+        if self.check_packages and not pkg.name:
+            self.errors.append(f"Package with SPDXID '{spdx_id}' has no name")
+        return True
+
+    def add_relationship(self, rel: BaseSpdxRelationship) -> bool:
+        key = (rel.spdx_element_id, rel.related_spdx_element, rel.relationship_type)
+        if self.store.has_relationship(*key):
+            return False
+        record = JsonWriter.encode_element(
+            self.codec, SpdxParser.relationship_to_dict(rel), self.canonical
+        )
+        self.store.insert_relationship(*key, record)
+        return True
+
+    @property
+    def package_count(self) -> int:
+        return self.store.package_count
+
+    @property
+    def relationship_count(self) -> int:
+        return self.store.relationship_count
+
+    def finish(self, document: SpdxDocument) -> Tuple[List[str], List[str]]:
+        errors, warnings = SpdxValidator.validate_header(document)
+        if not self.package_count:
+            warnings.append("Document contains no packages")
+        errors.extend(self.errors)
+
+        element_ids: Iterator[str] = iter([document.spdx_id])
+        if document.elements is not None:
+            element_ids = itertools.chain(element_ids, document.elements.element_ids())
+        self.store.add_element_ids(element_ids)
+
+        for element_id, related_id, resolved in self.store.iter_dangling_endpoints():
+            warnings.extend(
+                SpdxValidator.dangling_endpoint_warnings(
+                    element_id, related_id, resolved
+                )
+            )
+
+        return errors, warnings
+
+    def sections(self) -> Dict[str, EncodedSection]:
+        return {
+            "packages": SqliteSection(self.store, "packages", self.package_count),
+            "relationships": SqliteSection(
+                self.store, "relationships", self.relationship_count
+            ),
+        }
+
+    def close(self) -> None:
+        self.store.close()
+
+
+class SqliteMerger(StreamingMerger):
+    # Out-of-core variant of StreamingMerger: the state that grows with the
+    # merged document is staged in SQLite on disk (in `work_dir`, by default
+    # the system temporary directory).
+
+    # Rough size of one package or relationship in an input file, used to
+    # size the Bloom filters when no estimate is given.
+    BYTES_PER_ID = 256
+
+    def __init__(
+        self,
+        *args,
+        work_dir: Optional[Path] = None,
+        expected_ids: Optional[int] = None,
+        **kwargs,
+    ):
+        super().__init__(*args, **kwargs)
+        self.work_dir = work_dir
+        self.expected_ids = expected_ids
+
+    @staticmethod
+    def estimate_ids(input_paths: List[Path]) -> int:
+        total = 0
+        for path in input_paths:
+            try:
+                total += path.stat().st_size
+            except OSError:
+                continue
+        return max(1024, total // SqliteMerger.BYTES_PER_ID)
+
+    def _create_sink(self, canonical: bool, input_paths: List[Path]) -> MergeSink:
+        return SqliteMergeSink(
+            self.parse_options["json_backend"],
+            canonical,
+            check_packages=not self.parse_options["validate"],
+            expected_ids=self.expected_ids or self.estimate_ids(input_paths),
+            directory=self.work_dir,
+        )
@@ -0,0 +1,234 @@
+import io
+import json
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, TextIO, Tuple
+from ..domain.models import BaseSpdxPackage, SpdxDocument, SpdxRelationship
+from ..infrastructure.element_spool import ElementSpool
+from ..infrastructure.file_handler import FileHandler
+from .parser import SpdxParser
+from .validator import DocumentValidator
+
+HEADER_EVENT = "header"
+DOCUMENT_EVENT = "document"
+PACKAGE_EVENT = "package"
+RELATIONSHIP_EVENT = "relationship"
+ELEMENT_EVENT = "element"
+# Follows the last element of a "packages", "relationships", "files" or
+# "snippets" array, with the array's key.
+SECTION_END_EVENT = "section-end"
+
+SbomEvent = Tuple[str, Any]
+
+_WHITESPACE = " \t\n\r"
+
+
+class JsonTokenReader:
+    # Only the unconsumed tail of the input is buffered, so memory stays bounded
+    # by the largest single value decoded rather than by the size of the file.
+
+    def __init__(self, stream: TextIO, chunk_size: int = 64 * 1024):
+        self._stream = stream
+        self._chunk_size = chunk_size
+        self._decoder = json.JSONDecoder()
+        self._buf = ""
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self) -> bool:
+        if self._eof:
+            return False
+
+        pending = len(self._buf) - self._pos
+        chunk = self._stream.read(max(self._chunk_size, pending))
+        if not chunk:
+            self._eof = True
+            return False
+
+        self._buf = self._buf[self._pos :] + chunk
+        self._pos = 0
+        return True
+
+    def peek(self) -> str:
+        while True:
+            buf = self._buf
+            pos = self._pos
+            end = len(buf)
+            while pos < end and buf[pos] in _WHITESPACE:
+                pos += 1
+            self._pos = pos
+            if pos < end:
+                return buf[pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, char: str) -> None:
+        if self.peek() != char:
+            raise json.JSONDecodeError(f"Expecting '{char}'", self._buf, self._pos)
+        self._pos += 1
+
+    def next_member(self, closing: str) -> bool:
+        char = self.peek()
+        if char == ",":
+            self._pos += 1
+            return True
+        if char == closing:
+            self._pos += 1
+            return False
+        raise json.JSONDecodeError(
+            f"Expecting ',' or '{closing}'", self._buf, self._pos
+        )
+
+    def expect_end(self) -> None:
+        if self.peek():
+            raise json.JSONDecodeError("Extra data", self._buf, self._pos)
+
+    def read_value(self) -> Any:
+        self.peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError:
+                if self._fill():
+                    continue
+                raise
+
+            # A scalar ending exactly at the buffer boundary may be truncated.
+            if end == len(self._buf) and self._fill():
+                continue
+
+            self._pos = end
+            return value
+
+    def read_key(self) -> str:
+        if self.peek() != '"':
+            raise json.JSONDecodeError(
+                "Expecting property name enclosed in double quotes",
+                self._buf,
+                self._pos,
+            )
+        key: str = self.read_value()
+        self.expect(":")
+        return key
+
+    def iter_array(self) -> Iterator[Any]:
+        self.expect("[")
+        if self.peek() == "]":
+            self._pos += 1
+            return
+
+        while True:
+            yield self.read_value()
+            if not self.next_member("]"):
+                return
+
+
+class SpdxStreamParser:
+
+    CHUNK_SIZE = 64 * 1024
+
+    @staticmethod
+    def iter_events(
+        file_path: Path,
+        chunk_size: int = CHUNK_SIZE,
+        lazy: bool = False,
+        passthrough: bool = False,
+    ) -> Iterator[SbomEvent]:
+        with io.TextIOWrapper(FileHandler.open_sbom(file_path), encoding="utf-8") as f:
+            reader = JsonTokenReader(f, chunk_size)
+            yield from SpdxStreamParser._iter_object(
+                reader, file_path.name, True, lazy, passthrough
+            )
+            reader.expect_end()
+
+    @staticmethod
+    def _iter_object(
+        reader: JsonTokenReader,
+        source: str,
+        top_level: bool,
+        lazy: bool,
+        passthrough: bool,
+    ) -> Iterator[SbomEvent]:
+        reader.expect("{")
+        if reader.peek() == "}":
+            reader.next_member("}")
+            return
+
+        while True:
+            key = reader.read_key()
+            char = reader.peek()
+
+            if top_level and key == "sbom" and char == "{":
+                yield DOCUMENT_EVENT, None
+                yield from SpdxStreamParser._iter_object(
+                    reader, source, False, lazy, passthrough
+                )
+            elif key == "packages" and char == "[":
+                for pkg_data in reader.iter_array():
+                    yield PACKAGE_EVENT, SpdxParser.build_package(
+                        pkg_data, source, lazy, passthrough
+                    )
+                    for rel in SpdxParser.has_files_relationships(pkg_data, source):
+                        yield RELATIONSHIP_EVENT, rel
+                yield SECTION_END_EVENT, key
+            elif key == "relationships" and char == "[":
+                for rel_data in reader.iter_array():
+                    yield RELATIONSHIP_EVENT, SpdxParser.build_relationship(
+                        rel_data, source, passthrough
+                    )
+                yield SECTION_END_EVENT, key
+            elif key in ElementSpool.SECTIONS and char == "[":
+                for record in reader.iter_array():
+                    yield ELEMENT_EVENT, (key, record)
+                yield SECTION_END_EVENT, key
+            else:
+                yield HEADER_EVENT, (key, reader.read_value())
+
+            if not reader.next_member("}"):
+                return
+
+    @staticmethod
+    def parse_sbom_file(
+        file_path: Path,
+        lazy: bool = False,
+        validator: Optional[DocumentValidator] = None,
+        passthrough: bool = False,
+    ) -> SpdxDocument:
+        header: Dict[str, Any] = {}
+        packages: List[BaseSpdxPackage] = []
+        relationships: List[SpdxRelationship] = []
+        elements: Optional[ElementSpool] = None
+
+        for kind, value in SpdxStreamParser.iter_events(
+            file_path, lazy=lazy, passthrough=passthrough
+        ):
+            if kind == PACKAGE_EVENT:
+                packages.append(value)
+                if validator is not None:
+                    validator.add_package(value)
+            elif kind == RELATIONSHIP_EVENT:
+                relationships.append(value)
+                if validator is not None:
+                    validator.add_relationship(value)
+            elif kind == ELEMENT_EVENT:
+                if elements is None:
+                    elements = ElementSpool()
+                elements.append(*value)
+            elif kind == SECTION_END_EVENT:
+                continue
+            elif kind == DOCUMENT_EVENT:
+                # Wrapped layout: only the contents of "sbom" describe the document.
+                header.clear()
+                packages.clear()
+                relationships.clear()
+                elements = None
+                if validator is not None:
+                    validator.reset()
+            else:
+                key, header_value = value
+                header[key] = header_value
+
+        document = SpdxParser.build_document(
+            header, packages, relationships, file_path.name
+        )
+        document.elements = elements
+        return document
@@ -0,0 +1,348 @@
+import dataclasses
+import pickle  # nosec B403 - the spool is only written by this merge
+import tempfile
+import time
+from pathlib import Path
+from typing import IO, Any, Dict, Iterator, List, Optional, Set, Tuple
+from ..domain.models import (
+    MergeResult,
+    MergeStatistics,
+    RelationshipIndex,
+    SpdxDocument,
+    BaseSpdxPackage,
+    BaseSpdxRelationship,
+)
+from ..infrastructure.element_spool import ElementSpool
+from ..infrastructure.file_handler import FileHandler
+from .merger import SbomMerger
+from .parse_stage import ParseStage, parse_path
+from .parser import SpdxParser
+from .stream_parser import (
+    DOCUMENT_EVENT,
+    ELEMENT_EVENT,
+    PACKAGE_EVENT,
+    RELATIONSHIP_EVENT,
+    SECTION_END_EVENT,
+    SbomEvent,
+    SpdxStreamParser,
+)
+from .tag_value import TagValueParser
+from .validator import DocumentValidator
+from .writers import EncodedSection, JsonSectionWriter, JsonWriter
+
+
+class RelationshipSpool:
+    # Relationships held back until the packages they may refer to have been
+    # read, pickled to an anonymous temporary file rather than kept as objects.
+
+    def __init__(self) -> None:
+        self._file: Optional[IO[bytes]] = None
+        self.count = 0
+
+    def append(self, rel: BaseSpdxRelationship) -> None:
+        if self._file is None:
+            self._file = tempfile.TemporaryFile()
+        pickle.dump(rel, self._file, protocol=pickle.HIGHEST_PROTOCOL)
+        self.count += 1
+
+    def drain(self) -> Iterator[BaseSpdxRelationship]:
+        # In the order appended; the spool is empty afterwards.
+        spool, self._file = self._file, None
+        self.count = 0
+        if spool is None:
+            return
+        with spool:
+            spool.seek(0)
+            while True:
+                try:
+                    yield pickle.load(spool)  # nosec B301 - written above
+                except EOFError:
+                    return
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class MergeSink:
+    # Takes the merged packages and relationships in output order: drops
+    # duplicates, validates incrementally and encodes what is kept into the
+    # output sections.
+
+    def __init__(self, json_backend: str, canonical: bool, check_packages: bool = True):
+        self.packages = JsonSectionWriter(json_backend, canonical)
+        self.relationships = JsonSectionWriter(json_backend, canonical)
+        self.validator = DocumentValidator(check_packages)
+        self.seen_ids: Set[str] = set()
+        self.seen_relationships = RelationshipIndex()
+
+    def add_package(self, pkg: BaseSpdxPackage, spdx_id: str) -> bool:
+        # `spdx_id` is the package's merged SPDXID.
+        if spdx_id in self.seen_ids:
+            return False
+        self.seen_ids.add(spdx_id)
+        self.validator.add_package_id(spdx_id, pkg.name)
+        self.packages.append(SpdxParser.package_to_dict(pkg, spdx_id))
+        return True
+
+    def add_relationship(self, rel: BaseSpdxRelationship) -> bool:
+        if not self.seen_relationships.add(rel):
+            return False
+        self.validator.add_relationship(rel)
+        self.relationships.append(SpdxParser.relationship_to_dict(rel))
+        return True
+
+    @property
+    def package_count(self) -> int:
+        return self.packages.count
+
+    @property
+    def relationship_count(self) -> int:
+        return self.relationships.count
+
+    def finish(self, document: SpdxDocument) -> Tuple[List[str], List[str]]:
+        return self.validator.finish(document)
+
+    def sections(self) -> Dict[str, EncodedSection]:
+        return {"packages": self.packages, "relationships": self.relationships}
+
+    def close(self) -> None:
+        self.packages.close()
+        self.relationships.close()
+
+
+class StreamingMerger(SbomMerger):
+    # Merges straight into a JSON output file. Packages are encoded as soon as
+    # they pass dedup and relationships once their endpoints are remapped, so
+    # what stays in memory is the set of merged SPDXIDs rather than the merged
+    # document. An SPDX JSON or tag-value root, typically the largest input,
+    # is folded from parser events without ever being a document; the
+    # dependencies are parsed, folded and dropped one at a time.
+
+    def merge_to_file(
+        self,
+        root_sbom_path: Path,
+        dependency_sbom_paths: List[Path],
+        output_path: Path,
+        canonical: bool = False,
+    ) -> MergeResult:
+        start_time = time.time()
+        statistics = MergeStatistics()
+        id_counts = self.id_generator.counts()
+        json_backend = self.parse_options["json_backend"]
+        sink = self._create_sink(canonical, [root_sbom_path, *dependency_sbom_paths])
+        headers: List[SpdxDocument] = []
+        elements: Optional[ElementSpool] = None
+        duplicate_count = 0
+        duplicate_relationships = 0
+
+        try:
+            root, statistics.root_packages_count, duplicate_relationships = (
+                self._fold_root(root_sbom_path, sink, statistics)
+            )
+            # The root's spool is the first and is appended to in place.
+            elements = root.elements
+            headers.append(dataclasses.replace(root, elements=None))
+
+            for doc in self._iter_documents(dependency_sbom_paths, statistics):
+                statistics.dependency_packages_count += len(doc.packages)
+                duplicates, relationship_duplicates = self._fold_document(
+                    doc, sink, is_root=False
+                )
+                duplicate_count += duplicates
+                duplicate_relationships += relationship_duplicates
+
+                if doc.elements is not None:
+                    if elements is None:
+                        elements = ElementSpool()
+                    self._append_elements(elements, doc, is_root=False)
+
+                # Only the header is kept: for version checks, per-input
+                # validation results and the merged document's header.
+                headers.append(
+                    dataclasses.replace(
+                        doc, packages=[], relationships=[], store=None, elements=None
+                    )
+                )
+
+            statistics.total_sboms_processed = len(headers)
+            for header in headers:
+                self._record_parse_validation(statistics, header)
+
+            errors, warnings = self.validator.validate_version_compatibility(headers)
+            statistics.validation_errors.extend(errors)
+            statistics.validation_warnings.extend(warnings)
+            if errors:
+                raise ValueError(
+                    f"Cannot merge SBOMs due to validation errors: "
+                    f"{'; '.join(errors)}"
+                )
+
+            merged_doc = self._merged_document(
+                headers[0], len(headers) - 1, duplicate_count, elements
+            )
+            doc_errors, doc_warnings = sink.finish(merged_doc)
+            statistics.validation_errors.extend(doc_errors)
+            statistics.validation_warnings.extend(doc_warnings)
+
+            FileHandler.save_lines(
+                JsonWriter.iter_chunks(
+                    merged_doc, json_backend, canonical, sink.sections()
+                ),
+                output_path,
+            )
+            statistics.total_packages = sink.package_count
+            statistics.total_relationships = sink.relationship_count
+        finally:
+            sink.close()
+
+        statistics.duplicate_packages_removed = duplicate_count
+        statistics.duplicate_relationships_removed = duplicate_relationships
+        self._record_id_generation(statistics, id_counts)
+        statistics.processing_time_seconds = time.time() - start_time
+
+        return MergeResult(
+            merged_document=merged_doc,
+            statistics=statistics,
+            output_path=str(output_path),
+        )
+
+    def _create_sink(self, canonical: bool, input_paths: List[Path]) -> MergeSink:
+        return MergeSink(
+            self.parse_options["json_backend"],
+            canonical,
+            check_packages=not self.parse_options["validate"],
+        )
+
+    def _fold_document(
+        self, doc: SpdxDocument, sink: MergeSink, is_root: bool
+    ) -> Tuple[int, int]:
+        # Returns the duplicate packages and relationships dropped; packages
+        # repeated within the root are not counted.
+        duplicate_count = duplicate_relationships = 0
+        contribution = self._contribution(doc, is_root)
+        for pkg, spdx_id in contribution.packages:
+            if not sink.add_package(pkg, spdx_id) and not is_root:
+                duplicate_count += 1
+        for rel in contribution.relationships:
+            if not sink.add_relationship(rel):
+                duplicate_relationships += 1
+        return duplicate_count, duplicate_relationships
+
+    def _root_events(self, path: Path) -> Optional[Iterator[SbomEvent]]:
+        sbom_format = FileHandler.detect_format(path)
+        if sbom_format == "json":
+            return SpdxStreamParser.iter_events(
+                path,
+                lazy=self.parse_options["lazy"],
+                passthrough=self.parse_options["passthrough"],
+            )
+        if sbom_format == "tag-value":
+            return TagValueParser.iter_events(path, lazy=self.parse_options["lazy"])
+        return None
+
+    def _fold_root(
+        self, path: Path, sink: MergeSink, statistics: MergeStatistics
+    ) -> Tuple[SpdxDocument, int, int]:
+        # Returns the root's header document (with its spooled elements), its
+        # package count and the duplicate relationships dropped. Other formats
+        # are parsed into a document first, through the parse cache.
+        events = self._root_events(path)
+        if events is None:
+            doc, cache_hit = parse_path(path, self.parse_options, self.cache)
+            self._record_cache_use(statistics, cache_hit)
+            _, duplicate_relationships = self._fold_document(doc, sink, is_root=True)
+            header = dataclasses.replace(doc, packages=[], relationships=[], store=None)
+            return header, len(doc.packages), duplicate_relationships
+        return self._fold_events(path, events, sink)
+
+    def _fold_events(
+        self, path: Path, events: Iterator[SbomEvent], sink: MergeSink
+    ) -> Tuple[SpdxDocument, int, int]:
+        # Packages go to the sink as they are read. Relationships are held in
+        # a spool until the packages array has ended (tag-value: until the
+        # end of the file), as they may refer to packages not read yet, and
+        # go straight to the sink after that. What is held in memory is one
+        # element, the header and the root's ID mapping.
+        header: Dict[str, Any] = {}
+        id_mapping: Dict[str, str] = {}
+        pending = RelationshipSpool()
+        packages_read = False
+        elements: Optional[ElementSpool] = None
+        package_count = duplicate_relationships = 0
+        validator = DocumentValidator() if self.parse_options["validate"] else None
+
+        def add_relationship(rel: BaseSpdxRelationship) -> None:
+            nonlocal duplicate_relationships
+            if not sink.add_relationship(
+                self._remap_relationship(rel, id_mapping, self._same_id)
+            ):
+                duplicate_relationships += 1
+
+        try:
+            for kind, value in events:
+                if kind == PACKAGE_EVENT:
+                    spdx_id = self.id_generator.generate_spdx_id(
+                        value.name, value.version_info, value.external_refs
+                    )
+                    id_mapping[value.spdx_id] = spdx_id
+                    sink.add_package(value, spdx_id)
+                    package_count += 1
+                    if validator is not None:
+                        validator.add_package(value)
+                elif kind == RELATIONSHIP_EVENT:
+                    if validator is not None:
+                        validator.add_relationship(value)
+                    if packages_read:
+                        add_relationship(value)
+                    else:
+                        pending.append(value)
+                elif kind == SECTION_END_EVENT:
+                    if value == "packages":
+                        packages_read = True
+                        for rel in pending.drain():
+                            add_relationship(rel)
+                elif kind == ELEMENT_EVENT:
+                    if elements is None:
+                        elements = ElementSpool()
+                    elements.append(*value)
+                elif kind == DOCUMENT_EVENT:
+                    # The parser drops what precedes an "sbom" wrapper; here
+                    # it would already be merged.
+                    if package_count or pending.count or packages_read or elements:
+                        raise ValueError(
+                            f'{path.name}: elements found outside the "sbom" object'
+                        )
+                    header.clear()
+                else:
+                    key, header_value = value
+                    header[key] = header_value
+
+            for rel in pending.drain():
+                add_relationship(rel)
+        finally:
+            pending.close()
+
+        document = SpdxParser.build_document(header, [], [], path.name)
+        document.elements = elements
+        if validator is not None:
+            errors, warnings = validator.finish(document)
+            document.validation_errors = errors
+            document.validation_warnings = warnings
+        return document, package_count, duplicate_relationships
+
+    def _iter_documents(
+        self, dependency_sbom_paths: List[Path], statistics: MergeStatistics
+    ) -> Iterator[SpdxDocument]:
+        parse_stage = ParseStage(
+            self.jobs, self.executor, self.cache, **self.parse_options
+        )
+        for outcome in parse_stage.iter_outcomes(dependency_sbom_paths):
+            self._record_cache_use(statistics, outcome.cache_hit)
+            if outcome.document is None:
+                statistics.validation_errors.append(
+                    f"Failed to parse {outcome.path.name}: {outcome.error}"
+                )
+                continue
+            yield outcome.document
@@ -0,0 +1,423 @@
+import io
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+from ..domain.models import BaseSpdxPackage, SpdxDocument, SpdxRelationship
+from ..infrastructure.element_spool import ElementSpool
+from ..infrastructure.file_handler import FileHandler
+from .parser import SpdxParser
+from .validator import DocumentValidator
+from .stream_parser import (
+    ELEMENT_EVENT,
+    HEADER_EVENT,
+    PACKAGE_EVENT,
+    RELATIONSHIP_EVENT,
+    SbomEvent,
+)
+
+DOCUMENT_TAGS = {
+    "SPDXVersion": "spdxVersion",
+    "DataLicense": "dataLicense",
+    "SPDXID": "SPDXID",
+    "DocumentName": "name",
+    "DocumentNamespace": "documentNamespace",
+    "DocumentComment": "comment",
+}
+
+CREATION_INFO_TAGS = {
+    "Created": "created",
+    "LicenseListVersion": "licenseListVersion",
+    "CreatorComment": "comment",
+}
+
+PACKAGE_TAGS = {
+    "SPDXID": "SPDXID",
+    "PackageVersion": "versionInfo",
+    "PackageFileName": "packageFileName",
+    "PackageSupplier": "supplier",
+    "PackageOriginator": "originator",
+    "PackageDownloadLocation": "downloadLocation",
+    "PackageHomePage": "homepage",
+    "PackageSourceInfo": "sourceInfo",
+    "PackageLicenseConcluded": "licenseConcluded",
+    "PackageLicenseDeclared": "licenseDeclared",
+    "PackageLicenseComments": "licenseComments",
+    "PackageCopyrightText": "copyrightText",
+    "PackageSummary": "summary",
+    "PackageDescription": "description",
+    "PackageComment": "comment",
+    "PrimaryPackagePurpose": "primaryPackagePurpose",
+}
+
+# File and snippet fields, read into and written from spooled JSON records;
+# the list-valued fields repeat their tag once per item.
+FILE_TAGS = {
+    "LicenseConcluded": "licenseConcluded",
+    "LicenseComments": "licenseComments",
+    "FileCopyrightText": "copyrightText",
+    "FileComment": "comment",
+    "FileNotice": "noticeText",
+}
+FILE_LIST_TAGS = {
+    "FileType": "fileTypes",
+    "LicenseInfoInFile": "licenseInfoInFiles",
+    "FileContributor": "fileContributors",
+    "FileAttributionText": "attributionTexts",
+}
+SNIPPET_TAGS = {
+    "SnippetFromFileSPDXID": "snippetFromFile",
+    "SnippetLicenseConcluded": "licenseConcluded",
+    "SnippetLicenseComments": "licenseComments",
+    "SnippetCopyrightText": "copyrightText",
+    "SnippetComment": "comment",
+    "SnippetName": "name",
+}
+SNIPPET_LIST_TAGS = {
+    "LicenseInfoInSnippet": "licenseInfoInSnippets",
+    "SnippetAttributionText": "attributionTexts",
+}
+
+SNIPPET_RANGE_TAGS = {
+    "SnippetByteRange": "offset",
+    "SnippetLineRange": "lineNumber",
+}
+
+# Tags that open an element, and the spool section a File or Snippet goes to.
+ELEMENT_TAGS = {"FileName": "files", "SnippetSPDXID": "snippets"}
+# Tags that open an element this reader does not model; their fields are skipped.
+OTHER_ELEMENT_TAGS = {"LicenseID"}
+
+TEXT_OPEN = "<text>"
+TEXT_CLOSE = "</text>"
+
+
+class TagValueParser:
+
+    @staticmethod
+    def iter_tags(lines: Iterable[str]) -> Iterator[Tuple[str, str]]:
+        text_tag: Optional[str] = None
+        text_lines: List[str] = []
+
+        for raw_line in lines:
+            line = raw_line.rstrip("\r\n")
+
+            if text_tag is not None:
+                if TEXT_CLOSE in line:
+                    text_lines.append(line[: line.index(TEXT_CLOSE)])
+                    yield text_tag, "\n".join(text_lines)
+                    text_tag = None
+                else:
+                    text_lines.append(line)
+                continue
+
+            stripped = line.strip()
+            if not stripped or stripped.startswith("#") or ":" not in stripped:
+                continue
+
+            tag, value = stripped.split(":", 1)
+            value = value.strip()
+
+            if value.startswith(TEXT_OPEN):
+                value = value[len(TEXT_OPEN) :]
+                if TEXT_CLOSE in value:
+                    yield tag, value[: value.index(TEXT_CLOSE)]
+                else:
+                    text_tag = tag
+                    text_lines = [value]
+                continue
+
+            yield tag, value
+
+        if text_tag is not None:
+            raise ValueError(f"Unterminated {TEXT_OPEN} block for tag '{text_tag}'")
+
+    @staticmethod
+    def iter_events(file_path: Path, lazy: bool = False) -> Iterator[SbomEvent]:
+        with io.TextIOWrapper(FileHandler.open_sbom(file_path), encoding="utf-8") as f:
+            yield from TagValueParser.iter_stream_events(f, file_path.name, lazy)
+
+    @staticmethod
+    def iter_stream_events(
+        stream: TextIO, source: str, lazy: bool = False
+    ) -> Iterator[SbomEvent]:
+        # Files and snippets are read into SPDX JSON records, as the JSON
+        # parsers spool them.
+        creation_info: Optional[Dict[str, Any]] = None
+        package: Optional[Dict[str, Any]] = None
+        element: Optional[Tuple[str, Dict[str, Any]]] = None
+        in_other_element = False
+
+        for tag, value in TagValueParser.iter_tags(stream):
+            if tag == "Relationship":
+                yield RELATIONSHIP_EVENT, TagValueParser._build_relationship(
+                    value, source
+                )
+                continue
+
+            if tag == "PackageName" or tag in ELEMENT_TAGS or tag in OTHER_ELEMENT_TAGS:
+                if package is not None:
+                    yield PACKAGE_EVENT, SpdxParser.build_package(package, source, lazy)
+                if element is not None:
+                    yield ELEMENT_EVENT, TagValueParser._finish_element(*element)
+                package = {"name": value} if tag == "PackageName" else None
+                element = None
+                if tag == "FileName":
+                    element = ("files", {"fileName": value})
+                elif tag == "SnippetSPDXID":
+                    element = ("snippets", {"SPDXID": value})
+                in_other_element = tag in OTHER_ELEMENT_TAGS
+                continue
+
+            if package is not None:
+                TagValueParser._apply_package_tag(package, tag, value)
+            elif element is not None:
+                TagValueParser._apply_element_tag(*element, tag, value)
+            elif in_other_element:
+                continue
+            elif tag in DOCUMENT_TAGS:
+                yield HEADER_EVENT, (DOCUMENT_TAGS[tag], value)
+            elif tag == "Creator" or tag in CREATION_INFO_TAGS:
+                if creation_info is None:
+                    creation_info = {}
+                    # Later creation tags update the same dict in place.
+                    yield HEADER_EVENT, ("creationInfo", creation_info)
+                if tag == "Creator":
+                    creation_info.setdefault("creators", []).append(value)
+                else:
+                    creation_info[CREATION_INFO_TAGS[tag]] = value
+
+        if package is not None:
+            yield PACKAGE_EVENT, SpdxParser.build_package(package, source, lazy)
+        if element is not None:
+            yield ELEMENT_EVENT, TagValueParser._finish_element(*element)
+
+    @staticmethod
+    def _apply_element_tag(
+        section: str, record: Dict[str, Any], tag: str, value: str
+    ) -> None:
+        if section == "files":
+            tags, list_tags = FILE_TAGS, FILE_LIST_TAGS
+        else:
+            tags, list_tags = SNIPPET_TAGS, SNIPPET_LIST_TAGS
+
+        if tag == "SPDXID":
+            record["SPDXID"] = value
+        elif tag in tags:
+            record[tags[tag]] = value
+        elif tag in list_tags:
+            record.setdefault(list_tags[tag], []).append(value)
+        elif tag == "FileChecksum" and section == "files":
+            algorithm, _, checksum = value.partition(":")
+            record.setdefault("checksums", []).append(
+                {"algorithm": algorithm.strip(), "checksumValue": checksum.strip()}
+            )
+        elif tag in SNIPPET_RANGE_TAGS and section == "snippets":
+            key = SNIPPET_RANGE_TAGS[tag]
+            start, _, end = value.partition(":")
+            record.setdefault("ranges", []).append(
+                {
+                    "startPointer": {key: int(start)},
+                    "endPointer": {key: int(end)},
+                }
+            )
+
+    @staticmethod
+    def _finish_element(
+        section: str, record: Dict[str, Any]
+    ) -> Tuple[str, Dict[str, Any]]:
+        # Range pointers refer to the snippet's file, which may be given after
+        # the ranges.
+        if "snippetFromFile" in record:
+            for snippet_range in record.get("ranges", ()):
+                for pointer in snippet_range.values():
+                    pointer["reference"] = record["snippetFromFile"]
+        return section, record
+
+    @staticmethod
+    def _apply_package_tag(package: Dict[str, Any], tag: str, value: str) -> None:
+        if tag in PACKAGE_TAGS:
+            package[PACKAGE_TAGS[tag]] = value
+        elif tag == "FilesAnalyzed":
+            package["filesAnalyzed"] = value.lower() == "true"
+        elif tag == "ExternalRef":
+            parts = value.split(None, 2)
+            if len(parts) == 3:
+                package.setdefault("externalRefs", []).append(
+                    {
+                        "referenceCategory": parts[0],
+                        "referenceType": parts[1],
+                        "referenceLocator": parts[2],
+                    }
+                )
+        elif tag == "PackageChecksum":
+            algorithm, _, checksum = value.partition(":")
+            package.setdefault("checksums", []).append(
+                {"algorithm": algorithm.strip(), "checksumValue": checksum.strip()}
+            )
+
+    @staticmethod
+    def _build_relationship(value: str, source: str) -> SpdxRelationship:
+        parts = value.split()
+        if len(parts) != 3:
+            raise ValueError(f"Invalid Relationship value: '{value}'")
+
+        element_id, relationship_type, related_id = parts
+        return SpdxParser.make_relationship(
+            element_id, relationship_type, related_id, source
+        )
+
+    @staticmethod
+    def parse_sbom_file(
+        file_path: Path,
+        lazy: bool = False,
+        validator: Optional[DocumentValidator] = None,
+    ) -> SpdxDocument:
+        header: Dict[str, Any] = {}
+        packages: List[BaseSpdxPackage] = []
+        relationships: List[SpdxRelationship] = []
+        elements: Optional[ElementSpool] = None
+
+        for kind, value in TagValueParser.iter_events(file_path, lazy=lazy):
+            if kind == PACKAGE_EVENT:
+                packages.append(value)
+                if validator is not None:
+                    validator.add_package(value)
+            elif kind == RELATIONSHIP_EVENT:
+                relationships.append(value)
+                if validator is not None:
+                    validator.add_relationship(value)
+            elif kind == ELEMENT_EVENT:
+                if elements is None:
+                    elements = ElementSpool()
+                elements.append(*value)
+            else:
+                key, header_value = value
+                header[key] = header_value
+
+        document = SpdxParser.build_document(
+            header, packages, relationships, file_path.name
+        )
+        document.elements = elements
+        return document
+
+
+class TagValueSerializer:
+
+    @staticmethod
+    def _format_value(value: Any) -> str:
+        if isinstance(value, bool):
+            return "true" if value else "false"
+        text = str(value)
+        if "\n" in text:
+            return f"{TEXT_OPEN}{text}{TEXT_CLOSE}"
+        return text
+
+    @staticmethod
+    def _line(tag: str, value: Any) -> str:
+        return f"{tag}: {TagValueSerializer._format_value(value)}\n"
+
+    @staticmethod
+    def iter_lines(document: SpdxDocument) -> Iterator[str]:
+        line = TagValueSerializer._line
+
+        yield line("SPDXVersion", document.spdx_version)
+        yield line("DataLicense", document.data_license)
+        yield line("SPDXID", document.spdx_id)
+        yield line("DocumentName", document.name)
+        yield line("DocumentNamespace", document.document_namespace)
+        for creator in document.creation_info.get("creators", []):
+            yield line("Creator", creator)
+        for tag, key in CREATION_INFO_TAGS.items():
+            if document.creation_info.get(key):
+                yield line(tag, document.creation_info[key])
+        if document.comment:
+            yield line("DocumentComment", document.comment)
+
+        for pkg in document.packages:
+            yield "\n"
+            yield from TagValueSerializer.iter_package_lines(pkg)
+
+        if document.elements is not None:
+            for record in document.elements.iter_records("files"):
+                yield "\n"
+                yield from TagValueSerializer.iter_file_lines(record)
+            for record in document.elements.iter_records("snippets"):
+                yield "\n"
+                yield from TagValueSerializer.iter_snippet_lines(record)
+
+        if document.relationships:
+            yield "\n"
+        for rel in document.relationships:
+            yield line(
+                "Relationship",
+                f"{rel.spdx_element_id} {rel.relationship_type} "
+                f"{rel.related_spdx_element}",
+            )
+
+    @staticmethod
+    def iter_package_lines(pkg: BaseSpdxPackage) -> Iterator[str]:
+        line = TagValueSerializer._line
+
+        yield line("PackageName", pkg.name)
+        yield line("SPDXID", pkg.spdx_id)
+        if pkg.version_info:
+            yield line("PackageVersion", pkg.version_info)
+        yield line("PackageDownloadLocation", pkg.download_location)
+        yield line("FilesAnalyzed", pkg.files_analyzed)
+        if pkg.license_concluded:
+            yield line("PackageLicenseConcluded", pkg.license_concluded)
+        if pkg.copyright_text:
+            yield line("PackageCopyrightText", pkg.copyright_text)
+        for ref in pkg.external_refs:
+            yield line(
+                "ExternalRef",
+                f"{ref.get('referenceCategory', '')} "
+                f"{ref.get('referenceType', '')} "
+                f"{ref.get('referenceLocator', '')}",
+            )
+
+    @staticmethod
+    def _iter_record_lines(
+        record: Dict[str, Any], tags: Dict[str, str], list_tags: Dict[str, str]
+    ) -> Iterator[str]:
+        line = TagValueSerializer._line
+        for tag, key in tags.items():
+            if record.get(key):
+                yield line(tag, record[key])
+        for tag, key in list_tags.items():
+            for value in record.get(key, []):
+                yield line(tag, value)
+
+    @staticmethod
+    def iter_file_lines(record: Dict[str, Any]) -> Iterator[str]:
+        line = TagValueSerializer._line
+
+        yield line("FileName", record.get("fileName", ""))
+        yield line("SPDXID", record.get("SPDXID", ""))
+        for checksum in record.get("checksums", []):
+            yield line(
+                "FileChecksum",
+                f"{checksum.get('algorithm', '')}: "
+                f"{checksum.get('checksumValue', '')}",
+            )
+        yield from TagValueSerializer._iter_record_lines(
+            record, FILE_TAGS, FILE_LIST_TAGS
+        )
+
+    @staticmethod
+    def iter_snippet_lines(record: Dict[str, Any]) -> Iterator[str]:
+        line = TagValueSerializer._line
+
+        yield line("SnippetSPDXID", record.get("SPDXID", ""))
+        yield from TagValueSerializer._iter_record_lines(
+            record, SNIPPET_TAGS, SNIPPET_LIST_TAGS
+        )
+        for snippet_range in record.get("ranges", []):
+            start = snippet_range.get("startPointer", {})
+            end = snippet_range.get("endPointer", {})
+            if "offset" in start:
+                yield line("SnippetByteRange", f"{start['offset']}:{end.get('offset')}")
+            elif "lineNumber" in start:
+                yield line(
+                    "SnippetLineRange",
+                    f"{start['lineNumber']}:{end.get('lineNumber')}",
+                )
@@ -1,12 +1,75 @@
-from typing import List, Tuple
-from ..domain.models import SpdxDocument
+from typing import List, Set, Tuple
+from ..domain.models import (
+    ColumnarStore,
+    SpdxDocument,
+    BaseSpdxPackage,
+    BaseSpdxRelationship,
+)
 from ..infrastructure.config import Config
 
 
+class DocumentValidator:
+    # Accumulates per-document checks while packages and relationships are
+    # produced, so a parser can validate in the same pass that builds them.
+
+    def __init__(self, check_packages: bool = True) -> None:
+        self.check_packages = check_packages
+        self.reset()
+
+    def reset(self) -> None:
+        self._errors: List[str] = []
+        self._package_count = 0
+        self._spdx_ids: Set[str] = set()
+        self._endpoints: List[Tuple[str, str]] = []
+
+    def add_package(self, pkg: BaseSpdxPackage) -> None:
+        self.add_package_id(pkg.spdx_id, pkg.name)
+
+    def add_package_id(self, spdx_id: str, name: str) -> None:
+        self._package_count += 1
+        if not self.check_packages:
+            self._spdx_ids.add(spdx_id)
+            return
+        if not spdx_id:
+            self._errors.append(f"Package '{name}' is missing SPDXID")
+        elif spdx_id in self._spdx_ids:
+            self._errors.append(f"Duplicate SPDXID found: {spdx_id}")
+        else:
+            self._spdx_ids.add(spdx_id)
+
+        if not name:
+            self._errors.append(f"Package with SPDXID '{spdx_id}' has no name")
+
+    def add_relationship(self, rel: BaseSpdxRelationship) -> None:
+        self.add_endpoints(rel.spdx_element_id, rel.related_spdx_element)
+
+    def add_endpoints(self, element_id: str, related_id: str) -> None:
+        # Endpoints not yet known are resolved in finish(): relationships may
+        # precede the packages they reference.
+        if element_id not in self._spdx_ids or related_id not in self._spdx_ids:
+            self._endpoints.append((element_id, related_id))
+
+    def finish(self, document: SpdxDocument) -> Tuple[List[str], List[str]]:
+        errors, warnings = SpdxValidator.validate_header(document)
+        if not self._package_count:
+            warnings.append("Document contains no packages")
+        errors.extend(self._errors)
+
+        known_ids = self._spdx_ids | SpdxValidator.element_ids(document)
+        for element_id, related_id in self._endpoints:
+            warnings.extend(
+                SpdxValidator.dangling_endpoint_warnings(
+                    element_id, related_id, known_ids
+                )
+            )
+
+        return errors, warnings
+
+
 class SpdxValidator:
 
     @staticmethod
-    def validate_document(document: SpdxDocument) -> Tuple[List[str], List[str]]:
+    def validate_header(document: SpdxDocument) -> Tuple[List[str], List[str]]:
         errors = []
         warnings = []
 
@@ -31,39 +94,122 @@ class SpdxValidator:
         if not document.name:
             warnings.append("Document name is empty")
 
-        if not document.packages:
-            warnings.append("Document contains no packages")
+        return errors, warnings
+
+    @staticmethod
+    def element_ids(document: SpdxDocument) -> Set[str]:
+        # Relationship endpoints that are not packages: the document itself and
+        # its spooled files and snippets, read back once for the check.
+        ids = {document.spdx_id}
+        if document.elements is not None:
+            ids.update(document.elements.element_ids())
+        return ids
+
+    @staticmethod
+    def dangling_endpoint_warnings(
+        element_id: str, related_id: str, known_ids: Set[str]
+    ) -> List[str]:
+        warnings = []
+        if element_id not in known_ids:
+            warnings.append(
+                f"Relationship references unknown SPDXID: "
+                f"{element_id}. "
+                f"Relationship element '{element_id}' "
+                f"not found in document packages"
+            )
+        if related_id not in known_ids:
+            warnings.append(
+                f"Relationship references unknown SPDXID: "
+                f"{related_id}. "
+                f"Related element '{related_id}' "
+                f"not found in document packages"
+            )
+        return warnings
 
-        spdx_ids = set()
+    @staticmethod
+    def validate_document(document: SpdxDocument) -> Tuple[List[str], List[str]]:
+        if document.store is not None:
+            return SpdxValidator.validate_store(document, document.store)
+        validator = DocumentValidator()
         for pkg in document.packages:
-            if not pkg.spdx_id:
-                errors.append(f"Package '{pkg.name}' is missing SPDXID")
-            elif pkg.spdx_id in spdx_ids:
-                errors.append(f"Duplicate SPDXID found: {pkg.spdx_id}")
-            else:
-                spdx_ids.add(pkg.spdx_id)
+            validator.add_package(pkg)
+        for rel in document.relationships:
+            validator.add_relationship(rel)
+        return validator.finish(document)
 
-            if not pkg.name:
-                errors.append(f"Package with SPDXID '{pkg.spdx_id}' has no name")
+    @staticmethod
+    def validate_merged_document(
+        document: SpdxDocument,
+    ) -> Tuple[List[str], List[str]]:
+        # For documents whose inputs were validated on parse: per-package checks
+        # already ran there, so only the header and the relationship endpoints
+        # remapped across documents are checked here.
+        if document.store is not None:
+            return SpdxValidator.validate_store(
+                document, document.store, check_packages=False
+            )
+        errors, warnings = SpdxValidator.validate_header(document)
+        if not document.packages:
+            warnings.append("Document contains no packages")
 
-        all_ids = {pkg.spdx_id for pkg in document.packages}
-        all_ids.add(document.spdx_id)
+        ids = {pkg.spdx_id for pkg in document.packages}
+        ids |= SpdxValidator.element_ids(document)
 
         for rel in document.relationships:
-            if rel.spdx_element_id not in all_ids:
-                warnings.append(
-                    f"Relationship references unknown SPDXID: "
-                    f"{rel.spdx_element_id}. "
-                    f"Relationship element '{rel.spdx_element_id}' "
-                    f"not found in document packages"
+            warnings.extend(
+                SpdxValidator.dangling_endpoint_warnings(
+                    rel.spdx_element_id, rel.related_spdx_element, ids
                 )
-            if rel.related_spdx_element not in all_ids:
-                warnings.append(
-                    f"Relationship references unknown SPDXID: "
-                    f"{rel.related_spdx_element}. "
-                    f"Related element '{rel.related_spdx_element}' "
-                    f"not found in document packages"
+            )
+
+        return errors, warnings
+
+    @staticmethod
+    def validate_store(
+        document: SpdxDocument, store: ColumnarStore, check_packages: bool = True
+    ) -> Tuple[List[str], List[str]]:
+        # Same checks and messages as validate_document, run on string codes so
+        # no row objects are created.
+        errors, warnings = SpdxValidator.validate_header(document)
+        if not store.package_count:
+            warnings.append("Document contains no packages")
+
+        strings = store.strings
+        columns = store.package_columns
+        known: Set[int] = set()
+        for name_code, id_code in zip(columns["name"], columns["spdx_id"]):
+            if not check_packages:
+                known.add(id_code)
+                continue
+            spdx_id = strings[id_code]
+            if not spdx_id:
+                errors.append(f"Package '{strings[name_code]}' is missing SPDXID")
+            elif id_code in known:
+                errors.append(f"Duplicate SPDXID found: {spdx_id}")
+            else:
+                known.add(id_code)
+            if not strings[name_code]:
+                errors.append(f"Package with SPDXID '{spdx_id}' has no name")
+
+        for element_id in SpdxValidator.element_ids(document):
+            element_code = strings.find(element_id)
+            if element_code is not None:
+                known.add(element_code)
+
+        for element, related in zip(store.rel_element, store.rel_related):
+            if element in known and related in known:
+                continue
+            element_id, related_id = str(strings[element]), str(strings[related])
+            resolved = {
+                spdx_id
+                for spdx_id, code in ((element_id, element), (related_id, related))
+                if code in known
+            }
+            warnings.extend(
+                SpdxValidator.dangling_endpoint_warnings(
+                    element_id, related_id, resolved
                 )
+            )
 
         return errors, warnings
 
@@ -83,8 +229,8 @@ class SpdxValidator:
             )
 
         for doc in documents:
-            if not Config.is_supported_spdx_version(doc.spdx_version):
-                supported_versions = Config.SUPPORTED_SPDX_VERSIONS
+            if not Config.is_ingestible_spdx_version(doc.spdx_version):
+                supported_versions = Config.INGESTIBLE_SPDX_VERSIONS
                 supported = ", ".join(supported_versions)
                 errors.append(
                     f"Unsupported SPDX version: {doc.spdx_version}. "
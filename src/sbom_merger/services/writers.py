@@ -0,0 +1,488 @@
+import json
+import re
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Protocol, cast
+from xml.sax.saxutils import escape, quoteattr
+from ..domain.models import BaseSpdxPackage, BaseSpdxRelationship, SpdxDocument
+from ..infrastructure.element_spool import ElementSpool
+from ..infrastructure.file_handler import FileHandler
+from ..infrastructure.json_codec import JsonCodec, get_json_codec
+from .parser import SpdxParser
+
+_PLAIN_KEY = re.compile(r"^[A-Za-z_][A-Za-z0-9_-]*$")
+
+
+class YamlWriter:
+
+    @staticmethod
+    def _scalar(value: Any) -> str:
+        # JSON scalars are valid YAML flow scalars, so quoting and escaping
+        # can reuse the JSON encoder.
+        return json.dumps(value, ensure_ascii=False)
+
+    @staticmethod
+    def _key(key: str) -> str:
+        return key if _PLAIN_KEY.match(key) else YamlWriter._scalar(key)
+
+    @staticmethod
+    def iter_node(value: Any, indent: int = 0) -> Iterator[str]:
+        pad = " " * indent
+
+        if isinstance(value, dict):
+            for key, item in value.items():
+                key_text = YamlWriter._key(str(key))
+                if isinstance(item, (dict, list)) and item:
+                    yield f"{pad}{key_text}:\n"
+                    # Block sequences may sit at the same indent as their key.
+                    child_indent = indent + 2 if isinstance(item, dict) else indent
+                    yield from YamlWriter.iter_node(item, child_indent)
+                elif isinstance(item, dict):
+                    yield f"{pad}{key_text}: {{}}\n"
+                elif isinstance(item, list):
+                    yield f"{pad}{key_text}: []\n"
+                else:
+                    yield f"{pad}{key_text}: {YamlWriter._scalar(item)}\n"
+        elif isinstance(value, list):
+            for item in value:
+                if isinstance(item, (dict, list)) and item:
+                    lines = YamlWriter.iter_node(item, indent + 2)
+                    first = next(lines)
+                    yield f"{pad}- {first[indent + 2:]}"
+                    yield from lines
+                else:
+                    yield f"{pad}- {YamlWriter._scalar(item)}\n"
+        else:
+            yield f"{pad}{YamlWriter._scalar(value)}\n"
+
+    @staticmethod
+    def iter_lines(document: SpdxDocument) -> Iterator[str]:
+        header = SpdxParser.document_header(document)
+        if document.comment:
+            header["comment"] = document.comment
+        yield from YamlWriter.iter_node(header)
+
+        # Packages and relationships are rendered one element at a time.
+        yield "packages:\n" if document.packages else "packages: []\n"
+        for pkg in document.packages:
+            yield from YamlWriter.iter_node([SpdxParser.package_to_dict(pkg)])
+
+        yield "relationships:\n" if document.relationships else "relationships: []\n"
+        for rel in document.relationships:
+            yield from YamlWriter.iter_node([SpdxParser.relationship_to_dict(rel)])
+
+        if document.elements is not None:
+            for section in ElementSpool.SECTIONS:
+                if document.elements.counts[section]:
+                    yield f"{section}:\n"
+                    for record in document.elements.iter_records(section):
+                        yield from YamlWriter.iter_node([record])
+
+
+class JsonWriter:
+    # Writes the wrapped SPDX JSON document member by member, so spooled files
+    # and snippets are encoded one record at a time instead of being collected
+    # into a single tree for the codec.
+
+    INDENT = "  "
+
+    @staticmethod
+    def _encode(codec: JsonCodec, value: Any, canonical: bool, depth: int) -> str:
+        text = codec.dumps(value, canonical=canonical).decode("utf-8")
+        # Encoded strings escape newlines, so every newline is layout.
+        return text.replace("\n", "\n" + JsonWriter.INDENT * depth)
+
+    @staticmethod
+    def encode_element(
+        codec: JsonCodec, record: Dict[str, Any], canonical: bool
+    ) -> str:
+        # One element of a top-level array, indented for its place in the output.
+        return JsonWriter.INDENT * 3 + JsonWriter._encode(codec, record, canonical, 3)
+
+    @staticmethod
+    def iter_chunks(
+        document: SpdxDocument,
+        json_backend: str = "auto",
+        canonical: bool = False,
+        sections: Optional[Dict[str, "EncodedSection"]] = None,
+    ) -> Iterator[str]:
+        # Members in `sections` were encoded ahead of time and are copied in
+        # place of the document's own (empty) lists.
+        sections = {key: s for key, s in (sections or {}).items() if s.count}
+        codec = get_json_codec(json_backend)
+        members: Dict[str, Any] = SpdxParser.serialize_to_json(
+            document, include_elements=False
+        )["sbom"]
+
+        spooled = []
+        if document.elements is not None:
+            spooled = [
+                section
+                for section in ElementSpool.SECTIONS
+                if document.elements.counts[section]
+            ]
+        keys = list(members) + spooled
+        if canonical:
+            keys.sort()
+
+        pad = JsonWriter.INDENT * 2
+        yield '{\n  "sbom": {'
+        for index, key in enumerate(keys):
+            yield ",\n" if index else "\n"
+            yield f"{pad}{json.dumps(key)}: "
+            if key in sections:
+                yield "["
+                yield from sections[key].iter_chunks()
+                yield f"\n{pad}]"
+                continue
+            if key not in spooled:
+                yield JsonWriter._encode(codec, members[key], canonical, 2)
+                continue
+
+            yield "["
+            records = cast(ElementSpool, document.elements).iter_records(key)
+            for position, record in enumerate(records):
+                yield ",\n" if position else "\n"
+                yield JsonWriter.encode_element(codec, record, canonical)
+            yield f"\n{pad}]"
+        yield "\n  }\n}"
+
+
+class EncodedSection(Protocol):
+    # Array members encoded ahead of time: `count` records whose text, each
+    # preceded by its separator and indentation, comes from iter_chunks().
+
+    count: int
+
+    def iter_chunks(self) -> Iterator[str]: ...
+
+
+class JsonSectionWriter:
+    # One top-level array of the wrapped SPDX JSON document, encoded record by
+    # record into a temporary file as the records are produced.
+
+    READ_SIZE = 1024 * 1024
+
+    def __init__(self, json_backend: str = "auto", canonical: bool = False):
+        self.codec = get_json_codec(json_backend)
+        self.canonical = canonical
+        self.count = 0
+        self._file = tempfile.TemporaryFile("w+", encoding="utf-8")
+
+    def append(self, record: Dict[str, Any]) -> None:
+        self.append_encoded(
+            JsonWriter.encode_element(self.codec, record, self.canonical)
+        )
+
+    def append_encoded(self, text: str) -> None:
+        self._file.write(",\n" if self.count else "\n")
+        self._file.write(text)
+        self.count += 1
+
+    def iter_chunks(self) -> Iterator[str]:
+        self._file.seek(0)
+        while chunk := self._file.read(self.READ_SIZE):
+            yield chunk
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class RdfXmlWriter:
+
+    RDF_NS = "http://www.w3.org/1999/02/22-rdf-syntax-ns#"
+    RDFS_NS = "http://www.w3.org/2000/01/rdf-schema#"
+    SPDX_NS = "http://spdx.org/rdf/terms#"
+    LICENSES_NS = "http://spdx.org/licenses/"
+    REFERENCES_NS = "http://spdx.org/rdf/references/"
+    POINTER_NS = "http://www.w3.org/2009/pointers#"
+    XSD_BOOLEAN = "http://www.w3.org/2001/XMLSchema#boolean"
+
+    SPECIAL_VALUES = {"NOASSERTION": "noassertion", "NONE": "none"}
+    REFERENCE_CATEGORIES = {
+        "PACKAGE-MANAGER": "packageManager",
+        "PACKAGE_MANAGER": "packageManager",
+        "SECURITY": "security",
+        "PERSISTENT-ID": "persistentId",
+        "PERSISTENT_ID": "persistentId",
+        "OTHER": "other",
+    }
+
+    @staticmethod
+    def _text(tag: str, value: Any, indent: int) -> str:
+        return f"{' ' * indent}<{tag}>{escape(str(value))}</{tag}>\n"
+
+    @staticmethod
+    def _resource(tag: str, uri: str, indent: int) -> str:
+        return f"{' ' * indent}<{tag} rdf:resource={quoteattr(uri)}/>\n"
+
+    @staticmethod
+    def _uri(namespace: str, spdx_id: str) -> str:
+        return spdx_id if "://" in spdx_id else f"{namespace}#{spdx_id}"
+
+    @staticmethod
+    def _camel_case(value: str) -> str:
+        head, *rest = value.lower().split("_")
+        return head + "".join(part.capitalize() for part in rest)
+
+    @staticmethod
+    def _license(tag: str, value: str, indent: int) -> str:
+        if value in RdfXmlWriter.SPECIAL_VALUES:
+            uri = RdfXmlWriter.SPDX_NS + RdfXmlWriter.SPECIAL_VALUES[value]
+            return RdfXmlWriter._resource(tag, uri, indent)
+        if " " not in value and not value.startswith("LicenseRef-"):
+            return RdfXmlWriter._resource(tag, RdfXmlWriter.LICENSES_NS + value, indent)
+        # Compound expressions are kept as a literal rather than expanded into
+        # nested conjunctive/disjunctive license sets.
+        return RdfXmlWriter._text(tag, value, indent)
+
+    @staticmethod
+    def _download_location(value: str, indent: int) -> str:
+        if value in RdfXmlWriter.SPECIAL_VALUES:
+            uri = RdfXmlWriter.SPDX_NS + RdfXmlWriter.SPECIAL_VALUES[value]
+            return RdfXmlWriter._resource("spdx:downloadLocation", uri, indent)
+        return RdfXmlWriter._text("spdx:downloadLocation", value, indent)
+
+    @staticmethod
+    def iter_lines(document: SpdxDocument) -> Iterator[str]:
+        namespace = document.document_namespace
+        text = RdfXmlWriter._text
+        resource = RdfXmlWriter._resource
+
+        yield '<?xml version="1.0" encoding="utf-8"?>\n'
+        yield (
+            f'<rdf:RDF xmlns:rdf="{RdfXmlWriter.RDF_NS}" '
+            f'xmlns:rdfs="{RdfXmlWriter.RDFS_NS}" '
+            f'xmlns:spdx="{RdfXmlWriter.SPDX_NS}" '
+            f'xmlns:ptr="{RdfXmlWriter.POINTER_NS}">\n'
+        )
+
+        about = quoteattr(RdfXmlWriter._uri(namespace, document.spdx_id))
+        yield f"  <spdx:SpdxDocument rdf:about={about}>\n"
+        yield text("spdx:specVersion", document.spdx_version, 4)
+        yield resource(
+            "spdx:dataLicense", RdfXmlWriter.LICENSES_NS + document.data_license, 4
+        )
+        yield text("spdx:name", document.name, 4)
+        yield "    <spdx:creationInfo>\n      <spdx:CreationInfo>\n"
+        for creator in document.creation_info.get("creators", []):
+            yield text("spdx:creator", creator, 8)
+        if document.creation_info.get("created"):
+            yield text("spdx:created", document.creation_info["created"], 8)
+        if document.creation_info.get("licenseListVersion"):
+            yield text(
+                "spdx:licenseListVersion",
+                document.creation_info["licenseListVersion"],
+                8,
+            )
+        yield "      </spdx:CreationInfo>\n    </spdx:creationInfo>\n"
+        if document.comment:
+            yield text("rdfs:comment", document.comment, 4)
+        yield "  </spdx:SpdxDocument>\n"
+
+        for pkg in document.packages:
+            yield from RdfXmlWriter.iter_package_lines(pkg, namespace)
+
+        if document.elements is not None:
+            for record in document.elements.iter_records("files"):
+                yield from RdfXmlWriter.iter_file_lines(record, namespace)
+            for record in document.elements.iter_records("snippets"):
+                yield from RdfXmlWriter.iter_snippet_lines(record, namespace)
+
+        for rel in document.relationships:
+            yield from RdfXmlWriter.iter_relationship_lines(rel, namespace)
+
+        yield "</rdf:RDF>\n"
+
+    @staticmethod
+    def iter_package_lines(pkg: BaseSpdxPackage, namespace: str) -> Iterator[str]:
+        text = RdfXmlWriter._text
+
+        about = quoteattr(RdfXmlWriter._uri(namespace, pkg.spdx_id))
+        yield f"  <spdx:Package rdf:about={about}>\n"
+        yield text("spdx:name", pkg.name, 4)
+        if pkg.version_info:
+            yield text("spdx:versionInfo", pkg.version_info, 4)
+        yield RdfXmlWriter._download_location(pkg.download_location, 4)
+        yield (
+            f'    <spdx:filesAnalyzed rdf:datatype="{RdfXmlWriter.XSD_BOOLEAN}">'
+            f"{'true' if pkg.files_analyzed else 'false'}</spdx:filesAnalyzed>\n"
+        )
+        if pkg.license_concluded:
+            yield RdfXmlWriter._license(
+                "spdx:licenseConcluded", pkg.license_concluded, 4
+            )
+        if pkg.copyright_text:
+            yield text("spdx:copyrightText", pkg.copyright_text, 4)
+        for ref in pkg.external_refs:
+            yield from RdfXmlWriter._iter_external_ref_lines(ref)
+        yield "  </spdx:Package>\n"
+
+    @staticmethod
+    def _iter_external_ref_lines(ref: Dict[str, Any]) -> Iterator[str]:
+        category = ref.get("referenceCategory", "OTHER")
+        category_name = RdfXmlWriter.REFERENCE_CATEGORIES.get(category, "other")
+        reference_type = ref.get("referenceType", "")
+        if "://" not in reference_type:
+            reference_type = RdfXmlWriter.REFERENCES_NS + reference_type
+
+        yield "    <spdx:externalRef>\n      <spdx:ExternalRef>\n"
+        yield RdfXmlWriter._resource(
+            "spdx:referenceCategory",
+            f"{RdfXmlWriter.SPDX_NS}referenceCategory_{category_name}",
+            8,
+        )
+        yield RdfXmlWriter._resource("spdx:referenceType", reference_type, 8)
+        yield RdfXmlWriter._text(
+            "spdx:referenceLocator", ref.get("referenceLocator", ""), 8
+        )
+        yield "      </spdx:ExternalRef>\n    </spdx:externalRef>\n"
+
+    @staticmethod
+    def iter_file_lines(record: Dict[str, Any], namespace: str) -> Iterator[str]:
+        text = RdfXmlWriter._text
+        license_ = RdfXmlWriter._license
+
+        about = quoteattr(RdfXmlWriter._uri(namespace, record.get("SPDXID", "")))
+        yield f"  <spdx:File rdf:about={about}>\n"
+        yield text("spdx:fileName", record.get("fileName", ""), 4)
+        for checksum in record.get("checksums", []):
+            # SHA3-256 is checksumAlgorithm_sha3_256, BLAKE2b-256 ..._blake2b256.
+            algorithm = checksum.get("algorithm", "").lower()
+            algorithm = algorithm.replace("blake2b-", "blake2b").replace("-", "_")
+            yield "    <spdx:checksum>\n      <spdx:Checksum>\n"
+            yield RdfXmlWriter._resource(
+                "spdx:algorithm",
+                f"{RdfXmlWriter.SPDX_NS}checksumAlgorithm_{algorithm}",
+                8,
+            )
+            yield text("spdx:checksumValue", checksum.get("checksumValue", ""), 8)
+            yield "      </spdx:Checksum>\n    </spdx:checksum>\n"
+        for file_type in record.get("fileTypes", []):
+            yield RdfXmlWriter._resource(
+                "spdx:fileType",
+                f"{RdfXmlWriter.SPDX_NS}fileType_{file_type.lower()}",
+                4,
+            )
+        if record.get("licenseConcluded"):
+            yield license_("spdx:licenseConcluded", record["licenseConcluded"], 4)
+        for value in record.get("licenseInfoInFiles", []):
+            yield license_("spdx:licenseInfoInFile", value, 4)
+        yield from RdfXmlWriter._iter_element_text_lines(record)
+        if record.get("noticeText"):
+            yield text("spdx:noticeText", record["noticeText"], 4)
+        for contributor in record.get("fileContributors", []):
+            yield text("spdx:fileContributor", contributor, 4)
+        yield "  </spdx:File>\n"
+
+    @staticmethod
+    def iter_snippet_lines(record: Dict[str, Any], namespace: str) -> Iterator[str]:
+        text = RdfXmlWriter._text
+        uri = RdfXmlWriter._uri
+
+        about = quoteattr(uri(namespace, record.get("SPDXID", "")))
+        yield f"  <spdx:Snippet rdf:about={about}>\n"
+        yield RdfXmlWriter._resource(
+            "spdx:snippetFromFile", uri(namespace, record.get("snippetFromFile", "")), 4
+        )
+        for snippet_range in record.get("ranges", []):
+            yield "    <spdx:range>\n      <ptr:StartEndPointer>\n"
+            for tag in ("startPointer", "endPointer"):
+                pointer = snippet_range.get(tag, {})
+                if "offset" in pointer:
+                    kind, field, value = (
+                        "ByteOffsetPointer",
+                        "offset",
+                        pointer["offset"],
+                    )
+                else:
+                    kind, field = "LineCharPointer", "lineNumber"
+                    value = pointer.get("lineNumber")
+                yield f"        <ptr:{tag}>\n          <ptr:{kind}>\n"
+                yield RdfXmlWriter._resource(
+                    "ptr:reference", uri(namespace, pointer.get("reference", "")), 12
+                )
+                yield text(f"ptr:{field}", value, 12)
+                yield f"          </ptr:{kind}>\n        </ptr:{tag}>\n"
+            yield "      </ptr:StartEndPointer>\n    </spdx:range>\n"
+        if record.get("licenseConcluded"):
+            yield RdfXmlWriter._license(
+                "spdx:licenseConcluded", record["licenseConcluded"], 4
+            )
+        for value in record.get("licenseInfoInSnippets", []):
+            yield RdfXmlWriter._license("spdx:licenseInfoInSnippet", value, 4)
+        if record.get("name"):
+            yield text("spdx:name", record["name"], 4)
+        yield from RdfXmlWriter._iter_element_text_lines(record)
+        yield "  </spdx:Snippet>\n"
+
+    @staticmethod
+    def _iter_element_text_lines(record: Dict[str, Any]) -> Iterator[str]:
+        # Text properties files and snippets have in common.
+        text = RdfXmlWriter._text
+        if record.get("licenseComments"):
+            yield text("spdx:licenseComments", record["licenseComments"], 4)
+        if record.get("copyrightText"):
+            yield text("spdx:copyrightText", record["copyrightText"], 4)
+        if record.get("comment"):
+            yield text("rdfs:comment", record["comment"], 4)
+        for attribution in record.get("attributionTexts", []):
+            yield text("spdx:attributionText", attribution, 4)
+
+    @staticmethod
+    def iter_relationship_lines(
+        rel: BaseSpdxRelationship, namespace: str
+    ) -> Iterator[str]:
+        # RDF/XML allows a subject to be described more than once, so each
+        # relationship is written on its own without grouping by element.
+        subject = quoteattr(RdfXmlWriter._uri(namespace, rel.spdx_element_id))
+        relationship_type = RdfXmlWriter._camel_case(rel.relationship_type)
+
+        yield f"  <rdf:Description rdf:about={subject}>\n"
+        yield "    <spdx:relationship>\n      <spdx:Relationship>\n"
+        yield RdfXmlWriter._resource(
+            "spdx:relationshipType",
+            f"{RdfXmlWriter.SPDX_NS}relationshipType_{relationship_type}",
+            8,
+        )
+        yield RdfXmlWriter._resource(
+            "spdx:relatedSpdxElement",
+            RdfXmlWriter._uri(namespace, rel.related_spdx_element),
+            8,
+        )
+        yield "      </spdx:Relationship>\n    </spdx:relationship>\n"
+        yield "  </rdf:Description>\n"
+
+
+# Formats written line by line while the document is serialized.
+LINE_SERIALIZERS = {
+    "tag-value": SpdxParser.serialize_to_tag_value,
+    "yaml": SpdxParser.serialize_to_yaml,
+    "rdf": SpdxParser.serialize_to_rdf,
+}
+
+
+def save_merged_document(
+    document: SpdxDocument,
+    output_path: Path,
+    output_format: str,
+    json_backend: str,
+    canonical_json: bool,
+) -> None:
+    if output_format in LINE_SERIALIZERS:
+        FileHandler.save_lines(LINE_SERIALIZERS[output_format](document), output_path)
+    elif output_format == "json" and document.elements is not None:
+        # Files and snippets are streamed from their spool into the output.
+        FileHandler.save_lines(
+            SpdxParser.serialize_to_json_chunks(document, json_backend, canonical_json),
+            output_path,
+        )
+    else:
+        if output_format == "spdx3-jsonld":
+            serialized = SpdxParser.serialize_to_spdx3(document)
+        else:
+            serialized = SpdxParser.serialize_to_json(document)
+
+        FileHandler.save_merged_sbom(
+            serialized, output_path, json_backend, canonical=canonical_json
+        )
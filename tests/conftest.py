@@ -2,6 +2,7 @@ import pytest
 from pathlib import Path
 import json
 import tempfile
+from sbom_merger.domain.models import SpdxDocument, SpdxPackage, SpdxRelationship
 
 
 @pytest.fixture
@@ -122,3 +123,72 @@ def temp_sbom_dir(sample_root_sbom, sample_dependency_sbom):
             json.dump(sample_dependency_sbom, f)
 
         yield deps_dir
+
+
+@pytest.fixture
+def sbom_dir(request, temp_sbom_dir, sample_dependency_sbom):
+    # The file-writing engines' inputs: copies of the dependency (1 unless
+    # parametrized indirectly) for duplicate packages and relationships, a
+    # spooled file, a relationship that points nowhere and an unreadable SBOM.
+    sbom = sample_dependency_sbom["sbom"]
+    sbom["files"] = [{"SPDXID": "SPDXRef-File-1", "fileName": "./setup.py"}]
+    sbom["relationships"] += [
+        {
+            "spdxElementId": "SPDXRef-requests-main",
+            "relatedSpdxElement": "SPDXRef-File-1",
+            "relationshipType": "CONTAINS",
+        },
+        {
+            "spdxElementId": "SPDXRef-requests-main",
+            "relatedSpdxElement": "SPDXRef-missing",
+            "relationshipType": "DEPENDS_ON",
+        },
+    ]
+    copies = getattr(request, "param", 1)
+    for i in range(copies):
+        name = "copy.json" if copies == 1 else f"copy{i}.json"
+        (temp_sbom_dir / name).write_text(json.dumps(sample_dependency_sbom))
+    (temp_sbom_dir / "broken.json").write_text("{")
+    return temp_sbom_dir
+
+
+def sbom_inputs(sbom_dir):
+    # The root SBOM next to a dependencies directory, and the dependencies.
+    root = next(sbom_dir.parent.glob("*_root.*"))
+    return root, sorted(sbom_dir.glob("*.json"))
+
+
+def merge_to_file(merger, sbom_dir, name, canonical=False):
+    # Runs a file-writing engine over `sbom_dir`; the result and output text.
+    output_path = sbom_dir.parent / name
+    result = merger.merge_to_file(*sbom_inputs(sbom_dir), output_path, canonical)
+    return result, output_path.read_text()
+
+
+def make_document(packages, relationships):
+    # Packages and relationships as objects, or as package names and
+    # (element, type, related) name triples, which get SPDXRef-<name> IDs.
+    return SpdxDocument(
+        spdx_version="SPDX-2.3",
+        data_license="CC0-1.0",
+        spdx_id="SPDXRef-DOCUMENT",
+        name="doc",
+        document_namespace="https://example.com/doc",
+        creation_info={},
+        packages=[
+            (
+                SpdxPackage(name=pkg, spdx_id=f"SPDXRef-{pkg}", version_info="1.0")
+                if isinstance(pkg, str)
+                else pkg
+            )
+            for pkg in packages
+        ],
+        relationships=[
+            (
+                SpdxRelationship(f"SPDXRef-{rel[0]}", f"SPDXRef-{rel[2]}", rel[1])
+                if isinstance(rel, tuple)
+                else rel
+            )
+            for rel in relationships
+        ],
+    )
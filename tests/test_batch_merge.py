@@ -0,0 +1,162 @@
+import json
+import pytest
+from click.testing import CliRunner
+from sbom_merger.cli import cli
+from sbom_merger.infrastructure.id_table import IdTable
+from sbom_merger.infrastructure.parse_cache import MemoryParseCache
+from sbom_merger.services.batch_merger import BatchMerger
+
+
+@pytest.fixture
+def export_root(tmp_path, sample_root_sbom, sample_dependency_sbom):
+    # Three projects sharing one dependency SBOM, and one without a root SBOM.
+    for project in ("alpha", "beta", "gamma"):
+        deps_dir = tmp_path / project / "dependencies"
+        deps_dir.mkdir(parents=True)
+        (tmp_path / project / f"{project}_root.json").write_text(
+            json.dumps(sample_root_sbom)
+        )
+        (deps_dir / "psf_requests_main.json").write_text(
+            json.dumps(sample_dependency_sbom)
+        )
+    (tmp_path / "broken" / "dependencies").mkdir(parents=True)
+    (tmp_path / "notes").mkdir()
+    return tmp_path
+
+
+def test_discover_projects(export_root):
+    projects = BatchMerger.discover_projects(export_root)
+
+    assert [p.parent.name for p in projects] == ["alpha", "beta", "broken", "gamma"]
+    with pytest.raises(FileNotFoundError):
+        BatchMerger.discover_projects(export_root / "missing")
+
+
+@pytest.mark.parametrize(
+    "args",
+    [
+        [],
+        ["--jobs", "2", "--executor", "process"],
+        ["--jobs", "1", "--engine", "streaming", "--canonical-json"],
+    ],
+)
+def test_cli_batch_merges_every_project(export_root, args):
+    result = CliRunner().invoke(
+        cli, ["batch", str(export_root), *args], catch_exceptions=False
+    )
+
+    assert result.exit_code == 1
+    assert "3 merged, 1 failed" in result.output
+    index = json.loads((export_root / "merge_index.json").read_text())
+    assert (index["projects"], index["merged"], index["failed"]) == (4, 3, 1)
+
+    by_project = {entry["project"]: entry for entry in index["results"]}
+    assert by_project["broken"]["status"] == "failed"
+    assert "No root SBOM found" in by_project["broken"]["error"]
+    assert by_project["broken"]["statistics"] is None
+    for project in ("alpha", "beta", "gamma"):
+        entry = by_project[project]
+        assert entry["status"] == "merged"
+        assert entry["statistics"]["total_sboms_processed"] == 2
+        assert entry["statistics"]["validation_errors"] == 0
+        output = json.loads(
+            (export_root / project / f"{project}_merged.json").read_text()
+        )
+        assert len(output["sbom"]["packages"]) == 4
+        assert entry["report"].endswith(f"{project}_merged_merge_report.md")
+
+
+def test_cli_batch_shares_parsed_dependencies(export_root, tmp_path_factory):
+    output_dir = tmp_path_factory.mktemp("merged")
+    result = CliRunner().invoke(
+        cli,
+        [
+            "batch",
+            str(export_root),
+            "--jobs",
+            "1",
+            "--output-dir",
+            str(output_dir),
+            "--index",
+            str(output_dir / "index.json"),
+        ],
+    )
+
+    results = json.loads((output_dir / "index.json").read_text())["results"]
+    hits = [
+        entry["statistics"]["cache_hits"] for entry in results if entry["statistics"]
+    ]
+    assert hits == [0, 1, 1]
+    assert result.exit_code == 1
+    assert sorted(p.name for p in output_dir.glob("*_merged.json")) == [
+        "alpha_merged.json",
+        "beta_merged.json",
+        "gamma_merged.json",
+    ]
+
+
+def test_batch_reads_the_id_table_once(export_root, tmp_path_factory, monkeypatch):
+    reads = []
+    read = IdTable._read
+    monkeypatch.setattr(IdTable, "_read", lambda self: reads.append(1) or read(self))
+    table = IdTable(tmp_path_factory.mktemp("ids") / "ids.sqlite")
+    merger = BatchMerger(
+        output_dir=tmp_path_factory.mktemp("merged"), jobs=1, id_table=table
+    )
+
+    outcomes = list(merger.run(BatchMerger.discover_projects(export_root)))
+
+    assert len(reads) == 1
+    # IDs saved by the first project are found by the next ones.
+    table_hits = [o.statistics.id_table_hits for o in outcomes if o.statistics]
+    assert table_hits[0] == 0 and table_hits[1] == table_hits[2] > 0
+
+
+def test_cli_batch_succeeds_when_every_project_merges(export_root):
+    (export_root / "broken" / "dependencies").rmdir()
+
+    result = CliRunner().invoke(cli, ["batch", str(export_root), "--jobs", "2"])
+
+    assert result.exit_code == 0
+    assert "3 merged, 0 failed" in result.output
+
+
+def test_cli_batch_rejects_empty_export(tmp_path):
+    result = CliRunner().invoke(cli, ["batch", str(tmp_path)])
+
+    assert result.exit_code == 1
+    assert "No <project>/dependencies" in result.output
+
+
+def test_cli_batch_engine_requires_json(export_root):
+    result = CliRunner().invoke(
+        cli, ["batch", str(export_root), "--engine", "sqlite", "--format", "yaml"]
+    )
+
+    assert result.exit_code == 2
+    assert "only writes --format json" in result.output
+
+
+def test_cli_defaults_to_merge_command(temp_sbom_dir):
+    result = CliRunner().invoke(cli, ["--dependencies-dir", str(temp_sbom_dir)])
+    assert result.exit_code == 0
+    assert "Merge completed" in result.output
+
+    help_result = CliRunner().invoke(cli, ["--help"])
+    assert "batch" in help_result.output and "merge" in help_result.output
+    assert "--dependencies-dir" in CliRunner().invoke(cli, ["merge", "--help"]).output
+
+
+def test_memory_parse_cache_evicts_least_recently_used():
+    cache = MemoryParseCache(max_bytes=200)
+    cache.put("a", "x" * 60)
+    cache.put("b", "y" * 60)
+    assert cache.get("a") == "x" * 60
+    cache.put("c", "z" * 60)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == "x" * 60
+    cache.put("a", [1])
+    assert cache.get("a") == [1]
+    assert cache.get("missing") is None
+    assert cache.total_size() < 200
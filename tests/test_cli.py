@@ -55,3 +55,40 @@ def test_cli_invalid_dependencies_dir():
     )
     assert result.exit_code != 0
     assert "Error" in result.output
+
+
+def test_cli_parallel_parse_options(temp_sbom_dir):
+    runner = CliRunner()
+    result = runner.invoke(
+        main,
+        [
+            "--dependencies-dir",
+            str(temp_sbom_dir),
+            "--jobs",
+            "2",
+            "--executor",
+            "process",
+            "--streaming-parse",
+        ],
+        catch_exceptions=False,
+    )
+
+    assert result.exit_code == 0
+    assert "Merge completed" in result.output
+
+
+def test_cli_id_table_reuses_ids_across_runs(temp_sbom_dir):
+    runner = CliRunner()
+    table = temp_sbom_dir.parent / "ids.sqlite"
+    args = ["--dependencies-dir", str(temp_sbom_dir), "--id-table", str(table)]
+
+    first = runner.invoke(main, args, catch_exceptions=False)
+    second = runner.invoke(main, [*args, "--id-cache-size", "0"])
+
+    assert first.exit_code == second.exit_code == 0
+    assert "0 from ID table" in first.output
+    assert "Package IDs: 100% reused (0 cached, 4 from ID table, 0 generated)" in (
+        second.output
+    )
+    report = temp_sbom_dir.parent / "test_user_test_repo_merged_merge_report.md"
+    assert "**Package ID Reuse:** 100.0%" in report.read_text()
@@ -0,0 +1,123 @@
+import pickle
+import pytest
+from click.testing import CliRunner
+from sbom_merger.cli import main
+from sbom_merger.domain.models import (
+    ColumnarStore,
+    SpdxPackage,
+    SpdxRelationship,
+    StoredSpdxPackage,
+    StringTable,
+)
+from sbom_merger.services.merger import SbomMerger
+from sbom_merger.services.parser import SpdxParser
+from sbom_merger.services.validator import SpdxValidator
+from .conftest import make_document
+
+
+def test_string_table_interns_values():
+    table = StringTable()
+
+    assert table.code("a") == table.code("a") == 0
+    assert table.code("b") == 1
+    assert table.code(None) == -1
+    assert (table[0], table[-1], len(table)) == ("a", None, 2)
+    assert table.find("b") == 1 and table.find("c") is None
+
+
+def test_store_rows_read_and_write_through_columns():
+    pkg = SpdxPackage(
+        name="a",
+        spdx_id="SPDXRef-a",
+        version_info="1.0",
+        files_analyzed=True,
+        external_refs=[{"referenceType": "purl", "referenceLocator": "pkg:pypi/a"}],
+    )
+    store = ColumnarStore()
+    store.add_package(pkg, "SPDXRef-pypi-a")
+    store.add_relationship(
+        SpdxRelationship("SPDXRef-DOCUMENT", "SPDXRef-pypi-a", "DESCRIBES")
+    )
+
+    row = store.packages[0]
+    assert isinstance(row, StoredSpdxPackage)
+    assert (row.spdx_id, row.name, row.version_info) == ("SPDXRef-pypi-a", "a", "1.0")
+    assert row.files_analyzed and row.purl == "pkg:pypi/a"
+    assert store.row_of("SPDXRef-pypi-a") == 0 and store.row_of("x") is None
+    assert store.relationships[-1].related_spdx_element == "SPDXRef-pypi-a"
+    assert [r.relationship_type for r in store.relationships[:1]] == ["DESCRIBES"]
+    with pytest.raises(IndexError):
+        store.packages[1]
+
+    row.license_concluded = "MIT"
+    row.files_analyzed = False
+    row.external_refs = []
+    assert row.materialize() == SpdxPackage(
+        name="a",
+        spdx_id="SPDXRef-pypi-a",
+        version_info="1.0",
+        license_concluded="MIT",
+    )
+    restored = pickle.loads(pickle.dumps(row))
+    assert restored.materialize() == row.materialize()
+
+
+def test_store_validation_matches_object_validation():
+    doc = make_document(
+        [
+            SpdxPackage(name="a", spdx_id="SPDXRef-a"),
+            SpdxPackage(name="a-again", spdx_id="SPDXRef-a"),
+            SpdxPackage(name="", spdx_id="SPDXRef-nameless"),
+            SpdxPackage(name="no-id", spdx_id=""),
+        ],
+        [
+            SpdxRelationship("SPDXRef-DOCUMENT", "SPDXRef-a", "DESCRIBES"),
+            SpdxRelationship("SPDXRef-gone", "SPDXRef-missing", "DEPENDS_ON"),
+        ],
+    )
+    store = ColumnarStore.from_document(doc)
+    stored = make_document(store.packages, store.relationships)
+    stored.store = store
+
+    assert SpdxValidator.validate_document(stored) == (
+        SpdxValidator.validate_document(doc)
+    )
+    assert SpdxValidator.validate_merged_document(stored) == (
+        SpdxValidator.validate_merged_document(doc)
+    )
+    assert SpdxParser.serialize_to_json(stored) == SpdxParser.serialize_to_json(doc)
+
+
+def test_columnar_merge_matches_object_merge(temp_sbom_dir):
+    root = next(temp_sbom_dir.parent.glob("*_root.json"))
+    deps = sorted(temp_sbom_dir.glob("*.json"))
+
+    expected = SbomMerger().merge_sboms(root, deps)
+    result = SbomMerger(columnar_store=True).merge_sboms(root, deps)
+
+    merged = result.merged_document
+    assert merged.store is not None
+    assert len(merged.packages) == len(expected.merged_document.packages)
+    for key in ("packages", "relationships"):
+        assert SpdxParser.serialize_to_json(merged)["sbom"][key] == (
+            SpdxParser.serialize_to_json(expected.merged_document)["sbom"][key]
+        )
+    assert result.statistics.duplicate_packages_removed == (
+        expected.statistics.duplicate_packages_removed
+    )
+    assert result.statistics.validation_errors == (
+        expected.statistics.validation_errors
+    )
+    # Row views stand in for packages wherever the object model is expected.
+    tag_value = "".join(SpdxParser.serialize_to_tag_value(merged))
+    assert tag_value.count("PackageName: ") == len(merged.packages)
+
+
+def test_cli_columnar_store(temp_sbom_dir):
+    result = CliRunner().invoke(
+        main,
+        ["--dependencies-dir", str(temp_sbom_dir), "--columnar-store"],
+        catch_exceptions=False,
+    )
+
+    assert result.exit_code == 0
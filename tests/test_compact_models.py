@@ -0,0 +1,108 @@
+import pickle
+import sys
+import pytest
+from sbom_merger.domain.models import (
+    BaseSpdxPackage,
+    BaseSpdxRelationship,
+    ColumnarStore,
+    LazySpdxPackage,
+    SpdxPackage,
+    SpdxRelationship,
+)
+from sbom_merger.services.merger import SbomMerger
+from sbom_merger.services.parser import SpdxParser
+
+
+def test_models_are_slotted():
+    pkg = SpdxPackage(name="a", spdx_id="SPDXRef-a")
+    rel = SpdxRelationship("SPDXRef-DOCUMENT", "SPDXRef-a", "DESCRIBES")
+
+    for obj in (pkg, rel):
+        assert not hasattr(obj, "__dict__")
+        with pytest.raises(AttributeError):
+            obj.unexpected = 1
+
+
+def test_parser_interns_repeated_strings():
+    records = [
+        {
+            "name": "".join(["pkg", "-a"]),
+            "SPDXID": "".join(["SPDXRef-", "a"]),
+            "licenseConcluded": "".join(["M", "IT"]),
+            "externalRefs": [{"referenceType": "".join(["pu", "rl"])}],
+        }
+        for _ in range(2)
+    ]
+    first, second = (
+        SpdxParser.build_package(record, "".join(["dep", ".json"]))
+        for record in records
+    )
+    rel = SpdxParser.build_relationship(
+        {"spdxElementId": "".join(["SPDXRef-", "a"]), "relationshipType": "DESCRIBES"},
+        "dep.json",
+    )
+
+    assert first.spdx_id is second.spdx_id is rel.spdx_element_id
+    assert first.license_concluded is second.license_concluded
+    assert first.source_sbom is second.source_sbom is rel.source_sbom
+    assert (
+        first.external_refs[0]["referenceType"]
+        is second.external_refs[0]["referenceType"]
+    )
+    assert first.version_info is None
+
+
+def test_views_do_not_carry_package_slots():
+    pkg = SpdxPackage(name="a", spdx_id="SPDXRef-a", version_info="1.0")
+    lazy = LazySpdxPackage({"name": "a", "SPDXID": "SPDXRef-a"}, "dep.json")
+
+    assert isinstance(lazy, BaseSpdxPackage)
+    # The view keeps three references, not a slot for every field.
+    assert sys.getsizeof(lazy) < sys.getsizeof(pkg)
+    assert lazy.materialize() == SpdxPackage(
+        name="a", spdx_id="SPDXRef-a", files_analyzed=True, source_sbom="dep.json"
+    )
+    assert "name='a'" in repr(lazy)
+
+
+def test_stored_relationships_do_not_carry_relationship_slots():
+    rel = SpdxRelationship("SPDXRef-a", "SPDXRef-b", "DEPENDS_ON", "dep.json")
+    store = ColumnarStore()
+    store.add_relationship(rel)
+    stored = store.relationships[0]
+
+    assert isinstance(stored, BaseSpdxRelationship)
+    assert not isinstance(stored, SpdxRelationship)
+    # The view keeps its store and row, not a slot for every field.
+    assert sys.getsizeof(stored) < sys.getsizeof(rel)
+    assert stored == store.relationship(0) and stored != rel
+    assert repr(stored) == repr(rel).replace(
+        "SpdxRelationship", "StoredSpdxRelationship", 1
+    )
+
+
+def test_lazy_package_pickles():
+    pkg = LazySpdxPackage({"name": "a", "SPDXID": "SPDXRef-a"}, "dep.json")
+
+    restored = pickle.loads(pickle.dumps(pkg))
+    assert (restored.name, restored.spdx_id, restored.source_sbom) == (
+        "a",
+        "SPDXRef-a",
+        "dep.json",
+    )
+
+
+@pytest.mark.parametrize("lazy", [False, True])
+def test_merge_copies_packages_under_merged_ids(temp_sbom_dir, lazy):
+    root = next(temp_sbom_dir.parent.glob("*_root.json"))
+    deps = list(temp_sbom_dir.glob("*.json"))
+
+    result = SbomMerger(lazy_packages=lazy).merge_sboms(root, deps)
+
+    # Plain copies, so the parsed packages (and lazy records) can be freed.
+    packages = result.merged_document.packages
+    assert all(type(p) is SpdxPackage for p in packages)
+    serialized = SpdxParser.serialize_to_json(result.merged_document)
+    assert [p["SPDXID"] for p in serialized["sbom"]["packages"]] == [
+        p.spdx_id for p in packages
+    ]
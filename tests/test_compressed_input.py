@@ -0,0 +1,126 @@
+import gzip
+import json
+import lzma
+import tempfile
+from pathlib import Path
+import pytest
+from sbom_merger.infrastructure.file_handler import FileHandler
+from sbom_merger.services.merger import SbomMerger
+from sbom_merger.services.parser import SpdxParser
+
+
+def _compress_gzip(data):
+    return gzip.compress(data)
+
+
+def _compress_xz(data):
+    return lzma.compress(data)
+
+
+def _compress_zstd(data):
+    zstandard = pytest.importorskip("zstandard")
+    return zstandard.ZstdCompressor().compress(data)
+
+
+COMPRESSORS = {".gz": _compress_gzip, ".xz": _compress_xz, ".zst": _compress_zstd}
+
+
+@pytest.fixture
+def compressed_sbom_dir(sample_root_sbom, sample_dependency_sbom):
+    with tempfile.TemporaryDirectory() as tmpdir:
+        project_dir = Path(tmpdir) / "test_user_test_repo"
+        deps_dir = project_dir / "dependencies"
+        deps_dir.mkdir(parents=True)
+
+        root = json.dumps(sample_root_sbom).encode()
+        (project_dir / "test_user_test_repo_root.json.gz").write_bytes(
+            gzip.compress(root)
+        )
+
+        dep = json.dumps(sample_dependency_sbom).encode()
+        (deps_dir / "psf_requests_main.json.xz").write_bytes(lzma.compress(dep))
+        (deps_dir / "plain.json").write_bytes(dep)
+        (deps_dir / "notes.txt.gz").write_bytes(gzip.compress(b"ignored"))
+        yield deps_dir
+
+
+@pytest.mark.parametrize("suffix", sorted(COMPRESSORS))
+@pytest.mark.parametrize("streaming", [False, True])
+def test_parse_compressed_sbom(sample_root_sbom, suffix, streaming):
+    payload = COMPRESSORS[suffix](json.dumps(sample_root_sbom).encode())
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = Path(tmpdir) / f"project_root.json{suffix}"
+        path.write_bytes(payload)
+        plain = Path(tmpdir) / "project_root.json"
+        plain.write_text(json.dumps(sample_root_sbom))
+
+        doc = SpdxParser.parse_sbom_file(path, streaming=streaming)
+        expected = SpdxParser.parse_sbom_file(plain)
+
+        assert [(p.spdx_id, p.name) for p in doc.packages] == [
+            (p.spdx_id, p.name) for p in expected.packages
+        ]
+        assert {p.source_sbom for p in doc.packages} == {path.name}
+        assert doc.source_file == path.name
+        assert len(doc.relationships) == len(expected.relationships)
+
+
+@pytest.mark.parametrize("suffix", sorted(COMPRESSORS))
+@pytest.mark.parametrize("streaming", [False, True])
+def test_parse_multi_frame_sbom(sample_root_sbom, suffix, streaming):
+    # Two independently compressed halves, as pzstd or `cat a.zst b.zst` write.
+    data = json.dumps(sample_root_sbom).encode()
+    middle = len(data) // 2
+    compress = COMPRESSORS[suffix]
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = Path(tmpdir) / f"project_root.json{suffix}"
+        path.write_bytes(compress(data[:middle]) + compress(data[middle:]))
+
+        # One sized read, as the planner's sample read does, crosses frames.
+        with FileHandler.open_sbom(path) as f:
+            assert f.read(len(data) + 1) == data
+        doc = SpdxParser.parse_sbom_file(path, streaming=streaming)
+        assert len(doc.packages) == 2
+
+
+def test_discover_compressed_sboms(compressed_sbom_dir):
+    root_sbom, dep_sboms = FileHandler.discover_sbom_files(compressed_sbom_dir)
+
+    assert root_sbom.name == "test_user_test_repo_root.json.gz"
+    assert sorted(p.name for p in dep_sboms) == [
+        "plain.json",
+        "psf_requests_main.json.xz",
+    ]
+
+
+def test_merge_compressed_sboms(compressed_sbom_dir):
+    root_sbom, dep_sboms = FileHandler.discover_sbom_files(compressed_sbom_dir)
+
+    result = SbomMerger().merge_sboms(root_sbom, dep_sboms)
+
+    assert result.statistics.total_sboms_processed == 3
+    assert not result.statistics.validation_errors
+
+
+def test_output_path_strips_compression_suffix():
+    root = Path("/tmp/project/project_root.json.zst")
+    assert FileHandler.get_output_path(root).name == "project_merged.json"
+    assert FileHandler.sbom_stem(Path("a_root.json")) == "a_root"
+
+
+def test_zstd_without_backend_raises(monkeypatch):
+    import builtins
+
+    real_import = builtins.__import__
+
+    def fake_import(name, *args, **kwargs):
+        if name in ("zstandard", "compression"):
+            raise ImportError(name)
+        return real_import(name, *args, **kwargs)
+
+    monkeypatch.setattr(builtins, "__import__", fake_import)
+
+    with pytest.raises(ValueError, match="zstandard"):
+        FileHandler.open_sbom(Path("dep.json.zst"))
@@ -116,4 +116,5 @@ def test_config_supported_versions():
 
 def test_config_supported_formats():
     assert Config.is_supported_output_format("json")
-    assert not Config.is_supported_output_format("yaml")
+    assert Config.is_supported_output_format("yaml")
+    assert not Config.is_supported_output_format("xml")
@@ -0,0 +1,153 @@
+import json
+import tempfile
+from pathlib import Path
+import pytest
+from sbom_merger.infrastructure.file_handler import FileHandler
+from sbom_merger.services.cyclonedx import CycloneDxParser
+from sbom_merger.services.merger import SbomMerger
+from sbom_merger.services.parser import SpdxParser
+
+CYCLONEDX_SBOM = {
+    "bomFormat": "CycloneDX",
+    "specVersion": "1.5",
+    "serialNumber": "urn:uuid:3e671687-395b-41f5-a30f-a58921a69b79",
+    "metadata": {
+        "timestamp": "2025-12-11T00:00:00Z",
+        "tools": {"components": [{"name": "cdxgen", "version": "10.0.0"}]},
+        "authors": [{"name": "Jane Doe"}],
+        "supplier": {"name": "Vendor"},
+        "component": {
+            "bom-ref": "pkg:npm/app@1.0.0",
+            "name": "app",
+            "version": "1.0.0",
+            "purl": "pkg:npm/app@1.0.0",
+        },
+    },
+    "components": [
+        {
+            "bom-ref": "pkg:npm/express@4.18.2",
+            "name": "express",
+            "version": "4.18.2",
+            "purl": "pkg:npm/express@4.18.2",
+            "cpe": "cpe:2.3:a:expressjs:express:4.18.2:*:*:*:*:*:*:*",
+            "licenses": [{"license": {"id": "MIT"}}],
+            "copyright": "Copyright TJ",
+            "externalReferences": [
+                {"type": "website", "url": "https://expressjs.com"},
+                {"type": "distribution", "url": "https://registry.npmjs.org/express"},
+            ],
+            "components": [
+                {
+                    "bom-ref": "pkg:npm/express-router@1.0.0",
+                    "name": "express-router",
+                    "licenses": [
+                        {"license": {"id": "MIT"}},
+                        {"license": {"name": "Custom License"}},
+                        {"expression": "Apache-2.0 OR BSD-3-Clause"},
+                    ],
+                }
+            ],
+        },
+        {"bom-ref": "pkg:npm/express@4.18.2", "name": "duplicate-ref"},
+        {"name": "no-ref"},
+    ],
+    "dependencies": [
+        {"ref": "pkg:npm/app@1.0.0", "dependsOn": ["pkg:npm/express@4.18.2"]},
+        {"ref": "pkg:npm/express@4.18.2", "dependsOn": ["pkg:npm/missing@0.1"]},
+    ],
+}
+
+
+@pytest.fixture
+def cyclonedx_file():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = Path(tmpdir) / "vendor_app.cdx.json"
+        path.write_text(json.dumps(CYCLONEDX_SBOM))
+        yield path
+
+
+def test_parse_cyclonedx_document(cyclonedx_file):
+    assert FileHandler.detect_format(cyclonedx_file) == "cyclonedx"
+    doc = SpdxParser.parse_sbom_file(cyclonedx_file, streaming=True)
+
+    assert doc.spdx_version == "SPDX-2.3"
+    assert doc.name == "app"
+    assert doc.document_namespace == CYCLONEDX_SBOM["serialNumber"]
+    assert doc.comment == "Converted from CycloneDX 1.5"
+    assert doc.creation_info == {
+        "creators": [
+            "Tool: cdxgen 10.0.0",
+            "Person: Jane Doe",
+            "Organization: Vendor",
+        ],
+        "created": "2025-12-11T00:00:00Z",
+    }
+
+    assert [p.spdx_id for p in doc.packages] == [
+        "SPDXRef-pkg-npm-app-1.0.0",
+        "SPDXRef-pkg-npm-express-4.18.2",
+        "SPDXRef-pkg-npm-express-router-1.0.0",
+        "SPDXRef-component-4",
+    ]
+    express = doc.packages[1]
+    assert express.license_concluded == "MIT"
+    assert express.download_location == "https://registry.npmjs.org/express"
+    assert express.copyright_text == "Copyright TJ"
+    assert [r["referenceType"] for r in express.external_refs] == ["purl", "cpe23Type"]
+    assert doc.packages[2].license_concluded == (
+        "MIT AND LicenseRef-Custom-License AND (Apache-2.0 OR BSD-3-Clause)"
+    )
+    assert doc.packages[3].download_location == "NOASSERTION"
+
+    assert [
+        (r.spdx_element_id, r.relationship_type, r.related_spdx_element)
+        for r in doc.relationships
+    ] == [
+        ("SPDXRef-DOCUMENT", "DESCRIBES", "SPDXRef-pkg-npm-app-1.0.0"),
+        (
+            "SPDXRef-pkg-npm-express-4.18.2",
+            "CONTAINS",
+            "SPDXRef-pkg-npm-express-router-1.0.0",
+        ),
+        ("SPDXRef-pkg-npm-app-1.0.0", "DEPENDS_ON", "SPDXRef-pkg-npm-express-4.18.2"),
+        ("SPDXRef-pkg-npm-express-4.18.2", "DEPENDS_ON", "SPDXRef-pkg-npm-missing-0.1"),
+    ]
+
+
+def test_minimal_bom_and_detection_after_load(cyclonedx_file):
+    minimal = {
+        "bomFormat": "CycloneDX",
+        "specVersion": "1.4",
+        "metadata": {"tools": [{"vendor": "x", "name": "syft"}]},
+        "components": [
+            {"bom-ref": "a/b", "name": "b"},
+            {"bom-ref": "a:b", "name": "c"},
+        ],
+    }
+    doc = CycloneDxParser.build_document(minimal, "min.json", lazy=True)
+
+    assert doc.name == "min.json"
+    assert doc.document_namespace == "urn:cyclonedx:min.json"
+    assert doc.creation_info["creators"] == ["Tool: syft"]
+    assert [p.spdx_id for p in doc.packages] == ["SPDXRef-a-b", "SPDXRef-a-b-1"]
+    assert doc.relationships == []
+    assert CycloneDxParser.is_cyclonedx(minimal)
+
+    FileHandler.SNIFF_BYTES, saved = 0, FileHandler.SNIFF_BYTES
+    try:
+        doc = SpdxParser.parse_sbom_file(cyclonedx_file)
+    finally:
+        FileHandler.SNIFF_BYTES = saved
+    assert doc.comment == "Converted from CycloneDX 1.5"
+
+
+def test_merge_mixed_format_directory(temp_sbom_dir, cyclonedx_file):
+    (temp_sbom_dir / cyclonedx_file.name).write_bytes(cyclonedx_file.read_bytes())
+
+    root_sbom, dep_sboms = FileHandler.discover_sbom_files(temp_sbom_dir)
+    assert cyclonedx_file.name in [p.name for p in dep_sboms]
+
+    result = SbomMerger().merge_sboms(root_sbom, dep_sboms)
+    names = {p.name for p in result.merged_document.packages}
+    assert {"app", "express", "express-router"} <= names
+    assert result.statistics.validation_errors == []
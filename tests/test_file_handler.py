@@ -96,3 +96,22 @@ def test_get_output_path_without_output_dir():
 
         assert result.parent == root_sbom.parent
         assert "merged" in result.name
+
+
+def test_map_file_returns_file_contents():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = Path(tmpdir) / "sbom.json"
+        path.write_bytes(b'{"sbom": {}}')
+
+        with FileHandler.map_file(path) as buffer:
+            assert bytes(buffer) == b'{"sbom": {}}'
+            assert json.loads(str(buffer, "utf-8")) == {"sbom": {}}
+
+
+def test_map_file_empty_file():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = Path(tmpdir) / "empty.json"
+        path.write_bytes(b"")
+
+        with FileHandler.map_file(path) as buffer:
+            assert buffer == b""
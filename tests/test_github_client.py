@@ -135,3 +135,23 @@ def test_create_release_failure(mock_session_class, github_client):
         github_client.create_release(
             owner="test", repo="test-repo", tag_name="v1.0.0", name="Release v1.0.0"
         )
+
+
+def test_upload_file_encodes_mapped_content(github_client):
+    import base64
+
+    mock_session = Mock()
+    mock_session.get.return_value.status_code = 404
+    mock_session.put.return_value.status_code = 201
+    github_client.session = mock_session
+
+    with tempfile.NamedTemporaryFile(mode="wb", suffix=".json", delete=False) as f:
+        f.write('{"name": "café"}'.encode("utf-8"))
+        temp_file = f.name
+
+    try:
+        github_client.upload_file_to_repo("test", "repo", Path(temp_file), "t.json")
+        sent = mock_session.put.call_args.kwargs["json"]["content"]
+        assert base64.b64decode(sent).decode("utf-8") == '{"name": "café"}'
+    finally:
+        Path(temp_file).unlink()
@@ -0,0 +1,177 @@
+import json
+import random
+from array import array
+import pytest
+from click.testing import CliRunner
+from sbom_merger.cli import cli
+from sbom_merger.domain.models import SpdxPackage
+from sbom_merger.services.graph_index import DependencyGraph, compress
+from .conftest import make_document
+
+
+@pytest.fixture
+def graph():
+    # app -> web -> http -> tls, app -> cli -> http; docs is described but
+    # nothing depends on it, and tls's license file is not a dependency.
+    document = make_document(
+        ["app", "web", "cli", "http", "tls", "docs"],
+        [
+            ("DOCUMENT", "DESCRIBES", "app"),
+            ("DOCUMENT", "DESCRIBES", "docs"),
+            ("app", "DEPENDS_ON", "web"),
+            ("cli", "DEPENDENCY_OF", "app"),
+            ("web", "DEPENDS_ON", "http"),
+            ("http", "DEV_DEPENDENCY_OF", "web"),
+            ("cli", "DEPENDS_ON", "http"),
+            ("http", "DEPENDS_ON", "tls"),
+            ("tls", "CONTAINS", "LICENSE"),
+        ],
+    )
+    return DependencyGraph.from_document(document)
+
+
+def test_compress_groups_edges_by_source():
+    offsets, adjacency = compress(3, array("i", [2, 0, 2, 1]), array("i", [0, 1, 1, 2]))
+
+    assert list(offsets) == [0, 1, 2, 4]
+    assert list(adjacency) == [1, 2, 0, 1]
+
+
+def test_from_document_indexes_dependency_edges(graph):
+    assert graph.node_count == 6
+    assert graph.edge_count == 5
+    assert [graph.spdx_id(root) for root in graph.roots] == [
+        "SPDXRef-app",
+        "SPDXRef-docs",
+    ]
+    assert graph.label("SPDXRef-http") == "http 1.0"
+    assert graph.label("SPDXRef-DOCUMENT") == ""
+
+
+def test_direct_and_bounded_queries(graph):
+    assert graph.dependencies("app") == {"SPDXRef-web": 1, "SPDXRef-cli": 1}
+    assert graph.dependents("SPDXRef-http") == {"SPDXRef-web": 1, "SPDXRef-cli": 1}
+    assert graph.dependents("tls", max_depth=2) == {
+        "SPDXRef-http": 1,
+        "SPDXRef-web": 2,
+        "SPDXRef-cli": 2,
+    }
+    assert graph.dependencies("tls") == {}
+
+
+def test_reachable_defaults_to_the_roots(graph):
+    assert graph.reachable() == {
+        "SPDXRef-web": 1,
+        "SPDXRef-cli": 1,
+        "SPDXRef-http": 2,
+        "SPDXRef-tls": 3,
+    }
+    assert list(graph.reachable("tls", reverse=True)) == [
+        "SPDXRef-http",
+        "SPDXRef-web",
+        "SPDXRef-cli",
+        "SPDXRef-app",
+    ]
+
+
+def test_shortest_path_and_depth(graph):
+    assert graph.shortest_path("app", "tls") == [
+        "SPDXRef-app",
+        "SPDXRef-web",
+        "SPDXRef-http",
+        "SPDXRef-tls",
+    ]
+    assert graph.shortest_path("tls", "app") is None
+    assert graph.shortest_path("web", "web") == ["SPDXRef-web"]
+    assert graph.depth("tls") == 3
+    assert graph.depth("docs") == 0
+    assert graph.path_from_root("cli") == ["SPDXRef-app", "SPDXRef-cli"]
+
+
+def test_shortest_paths_match_breadth_first_depths():
+    rng = random.Random(7)
+    names = [f"p{i}" for i in range(60)]
+    edges = [(rng.choice(names), "DEPENDS_ON", rng.choice(names)) for _ in range(150)]
+    graph = DependencyGraph.from_document(make_document(names, edges))
+
+    for source in names[:10]:
+        depths = graph.reachable(source)
+        for target in names:
+            path = graph.shortest_path(source, target)
+            if target == source:
+                assert path == [f"SPDXRef-{source}"]
+            elif f"SPDXRef-{target}" in depths:
+                assert path is not None
+                assert len(path) - 1 == depths[f"SPDXRef-{target}"]
+                for element, related in zip(path, path[1:]):
+                    assert related in graph.dependencies(element)
+            else:
+                assert path is None
+
+
+def test_node_lookup_by_name():
+    document = make_document(
+        ["app", "lib"], [("DOCUMENT", "DESCRIBES", "app"), ("app", "DEPENDS_ON", "lib")]
+    )
+    document.packages.append(SpdxPackage(name="lib", spdx_id="SPDXRef-lib-2"))
+    graph = DependencyGraph.from_document(document)
+
+    assert graph.node("app") == graph.node("SPDXRef-app")
+    with pytest.raises(ValueError, match="ambiguous: SPDXRef-lib, SPDXRef-lib-2"):
+        graph.node("lib")
+    with pytest.raises(ValueError, match="No element or package named missing"):
+        graph.node("missing")
+
+
+@pytest.fixture
+def merged_sbom(temp_sbom_dir):
+    result = CliRunner().invoke(cli, ["--dependencies-dir", str(temp_sbom_dir)])
+    assert result.exit_code == 0
+    return str(temp_sbom_dir.parent / "test_user_test_repo_merged.json")
+
+
+def test_cli_query_dependencies_and_reachable(merged_sbom):
+    result = CliRunner().invoke(cli, ["query", merged_sbom, "dependents", "urllib3"])
+    assert result.exit_code == 0
+    assert result.output.split() == ["1", "SPDXRef-unknown-requests-ec7242", "requests"]
+
+    result = CliRunner().invoke(cli, ["query", merged_sbom, "reachable", "--json"])
+    assert result.exit_code == 0
+    assert json.loads(result.output) == [
+        {"spdxId": "SPDXRef-pypi-requests-ec7242", "package": "requests", "depth": 1},
+        {
+            "spdxId": "SPDXRef-pypi-urllib3-c7f9a5",
+            "package": "urllib3 2.0.0",
+            "depth": 1,
+        },
+    ]
+
+    result = CliRunner().invoke(
+        cli, ["query", merged_sbom, "dependencies", "root-project", "--max-depth", "0"]
+    )
+    assert result.output.split()[1] == "SPDXRef-pypi-requests-ec7242"
+
+
+def test_cli_query_path_and_depth(merged_sbom):
+    result = CliRunner().invoke(cli, ["query", merged_sbom, "depth", "urllib3"])
+    assert result.exit_code == 0
+    assert result.output.splitlines()[-1].split()[:2] == [
+        "1",
+        "SPDXRef-pypi-urllib3-c7f9a5",
+    ]
+
+    result = CliRunner().invoke(
+        cli, ["query", merged_sbom, "path", "root-project", "urllib3"]
+    )
+    assert result.exit_code == 1
+    assert "urllib3 is not reachable from root-project" in result.output
+
+
+def test_cli_query_rejects_bad_arguments(merged_sbom):
+    result = CliRunner().invoke(cli, ["query", merged_sbom, "path", "urllib3"])
+    assert result.exit_code == 2
+    assert "path takes 2 package(s)" in result.output
+
+    result = CliRunner().invoke(cli, ["query", merged_sbom, "dependents", "requests"])
+    assert result.exit_code == 1
+    assert "Package name requests is ambiguous" in result.output
@@ -1,4 +1,9 @@
-from sbom_merger.services.id_generator import SpdxIdGenerator
+import pickle
+import pytest
+from sbom_merger.infrastructure.id_table import IdTable
+from sbom_merger.services.id_generator import CachingIdGenerator, SpdxIdGenerator
+
+PYPI = [{"referenceType": "purl", "referenceLocator": "pkg:pypi/requests@2.31.0"}]
 
 
 def test_sanitize_name():
@@ -42,3 +47,93 @@ def test_generate_document_namespace():
 
     assert namespace.startswith("https://spdx.org/spdxdocs/merged-sbom/")
     assert len(namespace) > 50
+
+
+@pytest.mark.parametrize("version", ["2.31.0", None, ""])
+def test_caching_generator_matches_uncached_ids(version):
+    generator = CachingIdGenerator(max_entries=2)
+    expected = SpdxIdGenerator.generate_spdx_id("requests", version, PYPI)
+
+    assert generator.generate_spdx_id("requests", version, PYPI) == expected
+    assert generator.generate_spdx_id("requests", version, PYPI) == expected
+    assert generator.counts() == (1, 0, 1)
+
+
+def test_caching_generator_evicts_least_recently_used():
+    generator = CachingIdGenerator(max_entries=2)
+    for name in ["a", "b", "a", "c", "b"]:
+        generator.generate_spdx_id(name, "1.0", PYPI)
+
+    # "b" was evicted by "c", so only the second "a" was a hit.
+    assert generator.counts() == (1, 0, 4)
+
+
+def test_id_table_is_reused_across_generators(tmp_path):
+    table = IdTable(tmp_path / "ids.sqlite")
+    first = CachingIdGenerator(table=table)
+    spdx_id = first.generate_spdx_id("requests", "2.31.0", PYPI)
+    first.save_table()
+    first.save_table()
+
+    second = CachingIdGenerator(table=IdTable(tmp_path / "ids.sqlite"))
+    assert second.generate_spdx_id("requests", "2.31.0", PYPI) == spdx_id
+    assert second.counts() == (0, 1, 0)
+    assert second.new_ids == {}
+
+
+def test_id_table_discards_other_formats(tmp_path, monkeypatch):
+    path = tmp_path / "ids.sqlite"
+    IdTable(path).save([(("requests", "1.0", "pypi"), "SPDXRef-old")])
+    assert IdTable(path).load() == {("requests", "1.0", "pypi"): "SPDXRef-old"}
+
+    monkeypatch.setattr(IdTable, "FORMAT_VERSION", IdTable.FORMAT_VERSION + 1)
+    assert IdTable(path).load() == {}
+    assert IdTable(tmp_path / "missing.sqlite").load() == {}
+
+
+def test_id_table_tolerates_unusable_files(tmp_path):
+    path = tmp_path / "ids.sqlite"
+    path.write_text("not a database")
+
+    assert IdTable(path).load() == {}
+    IdTable(path).save([(("requests", "1.0", "pypi"), "SPDXRef-x")])
+    IdTable(tmp_path).save([(("requests", "1.0", "pypi"), "SPDXRef-x")])
+
+
+def test_caching_generator_pickles_without_its_cache(tmp_path):
+    generator = CachingIdGenerator(table=IdTable(tmp_path / "ids.sqlite"))
+    generator.generate_spdx_id("requests", "2.31.0", PYPI)
+
+    copy = pickle.loads(pickle.dumps(generator))
+    assert copy.new_ids == generator.new_ids
+    copy.generate_spdx_id("requests", "2.31.0", PYPI)
+    assert copy.counts() == (0, 0, 1)
+
+
+def test_caching_generator_parses_the_ecosystem_on_misses(monkeypatch):
+    parsed = []
+    ecosystem = SpdxIdGenerator.purl_ecosystem
+    monkeypatch.setattr(
+        SpdxIdGenerator,
+        "purl_ecosystem",
+        staticmethod(lambda purl: parsed.append(purl) or ecosystem(purl)),
+    )
+    generator = CachingIdGenerator()
+    for _ in range(3):
+        generator.generate_spdx_id("requests", "2.31.0", PYPI)
+
+    assert parsed == ["pkg:pypi/requests@2.31.0"]
+    assert generator.counts() == (2, 0, 1)
+
+
+def test_id_table_loads_once_and_pickles_without_its_ids(tmp_path):
+    table = IdTable(tmp_path / "ids.sqlite")
+    table.save([(("requests", "1.0", "pypi"), "SPDXRef-a")])
+    ids = table.load()
+    table.save([(("urllib3", "2.0", "pypi"), "SPDXRef-b")])
+
+    assert table.load() is ids
+    assert ids[("urllib3", "2.0", "pypi")] == "SPDXRef-b"
+    assert CachingIdGenerator(table=table).known_ids is ids
+    copy = pickle.loads(pickle.dumps(table))
+    assert copy._ids is None and copy.load() == ids
@@ -0,0 +1,124 @@
+import json
+import pytest
+from click.testing import CliRunner
+from sbom_merger.cli import main
+from sbom_merger.infrastructure.merge_manifest import MergeManifest
+from sbom_merger.services.merger import SbomMerger
+from sbom_merger.services.parser import SpdxParser
+
+
+def dependency(name, version):
+    return {
+        "sbom": {
+            "spdxVersion": "SPDX-2.3",
+            "SPDXID": "SPDXRef-DOCUMENT",
+            "name": name,
+            "documentNamespace": f"https://example.com/{name}",
+            "creationInfo": {},
+            "packages": [
+                {"name": name, "SPDXID": "SPDXRef-main", "versionInfo": version}
+            ],
+            "relationships": [
+                {
+                    "spdxElementId": "SPDXRef-DOCUMENT",
+                    "relatedSpdxElement": "SPDXRef-main",
+                    "relationshipType": "DESCRIBES",
+                }
+            ],
+        }
+    }
+
+
+def write_dependency(sbom_dir, name, version):
+    (sbom_dir / f"{name}.json").write_text(json.dumps(dependency(name, version)))
+
+
+def merge(sbom_dir, manifest_path=None, **options):
+    root = next(sbom_dir.parent.glob("*_root.json"))
+    deps = sorted(sbom_dir.glob("*.json"))
+    return SbomMerger(manifest_path=manifest_path, **options).merge_sboms(root, deps)
+
+
+def elements(result):
+    sbom = SpdxParser.serialize_to_json(result.merged_document)["sbom"]
+    return sbom["packages"], sbom["relationships"]
+
+
+def serialized(result):
+    # The whole merged document, less what differs on every run.
+    sbom = SpdxParser.serialize_to_json(result.merged_document)["sbom"]
+    del sbom["documentNamespace"]
+    sbom["creationInfo"] = {
+        key: value for key, value in sbom["creationInfo"].items() if key != "created"
+    }
+    return sbom
+
+
+@pytest.fixture
+def manifest_path(temp_sbom_dir):
+    write_dependency(temp_sbom_dir, "six", "1.16.0")
+    return temp_sbom_dir.parent / "merged.manifest.json"
+
+
+def test_unchanged_inputs_are_reused(temp_sbom_dir, manifest_path):
+    first = merge(temp_sbom_dir, manifest_path)
+    assert first.statistics.inputs_reused == 0
+    assert manifest_path.exists()
+
+    for _ in range(2):
+        again = merge(temp_sbom_dir, manifest_path)
+        assert again.statistics.inputs_reused == 3
+        assert again.statistics.dependency_packages_count == 3
+        assert serialized(again) == serialized(first)
+    assert (
+        serialized(first)["creationInfo"]["creators"].count(
+            "Tool: merge-spdx-sboms-v1.0.0"
+        )
+        == 1
+    )
+
+
+@pytest.mark.parametrize("options", [{}, {"columnar_store": True}])
+@pytest.mark.parametrize("change, reused", [("modify", 2), ("add", 3), ("remove", 2)])
+def test_changed_inputs_match_full_merge(
+    temp_sbom_dir, manifest_path, options, change, reused
+):
+    merge(temp_sbom_dir, manifest_path, **options)
+
+    if change == "modify":
+        write_dependency(temp_sbom_dir, "six", "1.17.0")
+    elif change == "add":
+        write_dependency(temp_sbom_dir, "attrs", "23.2.0")
+    else:
+        (temp_sbom_dir / "six.json").unlink()
+
+    incremental = merge(temp_sbom_dir, manifest_path, **options)
+    assert incremental.statistics.inputs_reused == reused
+    assert elements(incremental) == elements(merge(temp_sbom_dir, **options))
+
+
+def test_changed_options_invalidate_manifest(temp_sbom_dir, manifest_path):
+    merge(temp_sbom_dir, manifest_path)
+
+    result = merge(temp_sbom_dir, manifest_path, passthrough=True)
+    assert result.statistics.inputs_reused == 0
+
+
+def test_unreadable_manifest_is_ignored(temp_sbom_dir, manifest_path):
+    manifest_path.write_text("{not json")
+
+    result = merge(temp_sbom_dir, manifest_path)
+    assert result.statistics.inputs_reused == 0
+    assert json.loads(manifest_path.read_text())["version"] == (
+        MergeManifest.FORMAT_VERSION
+    )
+
+
+def test_cli_incremental(temp_sbom_dir):
+    args = ["--dependencies-dir", str(temp_sbom_dir), "--incremental"]
+    CliRunner().invoke(main, args, catch_exceptions=False)
+    result = CliRunner().invoke(main, args, catch_exceptions=False)
+
+    assert result.exit_code == 0
+    assert "Unchanged inputs reused: 2" in result.output
+    assert (temp_sbom_dir.parent / "test_user_test_repo_merged.manifest.json").exists()
@@ -0,0 +1,87 @@
+import json
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+import pytest
+from sbom_merger.infrastructure import json_codec
+from sbom_merger.infrastructure.file_handler import FileHandler
+from sbom_merger.infrastructure.json_codec import (
+    StdlibJsonCodec,
+    available_json_backends,
+    get_json_codec,
+)
+from sbom_merger.services.parser import SpdxParser
+
+DOCUMENT = {
+    "sbom": {
+        "spdxVersion": "SPDX-2.3",
+        "name": "café ☃",
+        "packages": [{"name": "a", "externalRefs": [], "filesAnalyzed": False}],
+        "relationships": [],
+        "creationInfo": {},
+        "count": 3,
+        "ratio": 0.5,
+        "comment": None,
+    }
+}
+
+
+def test_stdlib_codec_default_matches_json_dump():
+    codec = get_json_codec("stdlib")
+    assert codec.dumps(DOCUMENT) == json.dumps(DOCUMENT, indent=2).encode()
+    assert codec.loads(memoryview(codec.dumps(DOCUMENT))) == DOCUMENT
+
+
+@pytest.mark.parametrize("backend", available_json_backends())
+def test_canonical_output_is_identical_across_backends(backend):
+    expected = StdlibJsonCodec().dumps(DOCUMENT, canonical=True)
+    codec = get_json_codec(backend)
+
+    assert codec.dumps(DOCUMENT, canonical=True) == expected
+    assert codec.loads(expected) == DOCUMENT
+
+
+@pytest.mark.parametrize("backend", available_json_backends())
+def test_canonical_floats_are_identical_across_backends(backend):
+    floats = {"values": [1e20, 1e16, 1e15, 1e-5, -1.5e-05, 1.5e-07, 0.1, -0.0]}
+    expected = StdlibJsonCodec().dumps(floats, canonical=True)
+
+    assert get_json_codec(backend).dumps(floats, canonical=True) == expected
+    assert b"1e20" in expected and b"0.00001" in expected and b"1.5e-7" in expected
+    assert json.loads(expected) == floats
+
+
+def test_auto_prefers_accelerated_backend():
+    assert get_json_codec("auto").name == available_json_backends()[0]
+    assert "stdlib" in available_json_backends()
+
+
+def test_auto_falls_back_to_stdlib_when_nothing_installed():
+    with patch.dict(json_codec._instances, clear=True):
+        with patch.object(
+            json_codec.importlib, "import_module", side_effect=ImportError
+        ):
+            assert get_json_codec("auto").name == "stdlib"
+            with pytest.raises(ValueError, match="not installed"):
+                get_json_codec("orjson")
+
+
+def test_unknown_backend_rejected():
+    with pytest.raises(ValueError, match="Unsupported JSON backend"):
+        get_json_codec("simdjson")
+
+
+@pytest.mark.parametrize("backend", available_json_backends())
+def test_parse_and_save_with_backend(sample_root_sbom, backend):
+    with tempfile.TemporaryDirectory() as tmpdir:
+        source = Path(tmpdir) / "root.json"
+        source.write_text(json.dumps(sample_root_sbom))
+
+        doc = SpdxParser.parse_sbom_file(source, json_backend=backend)
+        assert doc == SpdxParser.parse_sbom_file(source, json_backend="stdlib")
+
+        output = Path(tmpdir) / "out.json"
+        FileHandler.save_merged_sbom(
+            SpdxParser.serialize_to_json(doc), output, backend, canonical=True
+        )
+        assert json.loads(output.read_bytes()) == SpdxParser.serialize_to_json(doc)
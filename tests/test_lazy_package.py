@@ -0,0 +1,138 @@
+import json
+import pickle
+import tempfile
+from pathlib import Path
+from click.testing import CliRunner
+from sbom_merger.cli import main
+from sbom_merger.domain.models import (
+    BaseSpdxPackage,
+    LazySpdxPackage,
+    SpdxPackage,
+    _RecordField,
+)
+from sbom_merger.infrastructure.file_handler import FileHandler
+from sbom_merger.services.merger import SbomMerger
+from sbom_merger.services.parser import SpdxParser
+
+
+def test_lazy_package_reads_fields_from_record():
+    record = {
+        "name": "urllib3",
+        "SPDXID": "SPDXRef-urllib3",
+        "versionInfo": "2.0.0",
+        "externalRefs": [
+            {"referenceType": "cpe23Type", "referenceLocator": "cpe:2.3:a"},
+            {"referenceType": "purl", "referenceLocator": "pkg:pypi/urllib3@2.0.0"},
+        ],
+    }
+    pkg = LazySpdxPackage(record, source_sbom="dep.json")
+
+    assert isinstance(pkg, BaseSpdxPackage)
+    assert pkg.name == "urllib3"
+    assert pkg.version_info == "2.0.0"
+    assert pkg.download_location == "NOASSERTION"
+    assert pkg.files_analyzed is True
+    assert pkg.license_concluded is None
+    assert pkg.external_refs is record["externalRefs"]
+    assert pkg.purl == "pkg:pypi/urllib3@2.0.0"
+    assert pkg.source_sbom == "dep.json"
+
+
+def test_lazy_package_defaults_and_assignment():
+    pkg = LazySpdxPackage({})
+
+    assert pkg.name == ""
+    assert pkg.external_refs == []
+    assert pkg.purl is None
+
+    pkg.spdx_id = "SPDXRef-new"
+    assert pkg.spdx_id == "SPDXRef-new"
+    assert LazySpdxPackage.name.key == "name"
+
+
+def test_materialize_and_pickle():
+    pkg = LazySpdxPackage({"name": "a", "SPDXID": "SPDXRef-a"}, "s.json")
+
+    assert pkg.materialize() == SpdxPackage(
+        name="a", spdx_id="SPDXRef-a", files_analyzed=True, source_sbom="s.json"
+    )
+    assert pickle.loads(pickle.dumps(pkg)) == pkg
+
+
+def test_lazy_parse_matches_eager_parse(sample_dependency_sbom):
+    with tempfile.NamedTemporaryFile(mode="w", suffix=".json", delete=False) as f:
+        json.dump(sample_dependency_sbom, f)
+        path = Path(f.name)
+
+    try:
+        eager = SpdxParser.parse_sbom_file(path)
+        for streaming in (False, True):
+            lazy = SpdxParser.parse_sbom_file(path, streaming=streaming, lazy=True)
+            assert all(isinstance(p, LazySpdxPackage) for p in lazy.packages)
+            assert [p.materialize() for p in lazy.packages] == eager.packages
+    finally:
+        path.unlink()
+
+
+def test_merge_with_lazy_packages(temp_sbom_dir):
+    root_sbom, dep_sboms = FileHandler.discover_sbom_files(temp_sbom_dir)
+
+    eager = SbomMerger().merge_sboms(root_sbom, dep_sboms)
+    lazy = SbomMerger(lazy_packages=True).merge_sboms(root_sbom, dep_sboms)
+
+    assert lazy.merged_document.packages == eager.merged_document.packages
+    assert lazy.merged_document.relationships == eager.merged_document.relationships
+
+
+def test_merge_reads_only_id_fields_of_duplicates(tmp_path, monkeypatch):
+    record = {
+        "name": "urllib3",
+        "SPDXID": "SPDXRef-urllib3",
+        "versionInfo": "2.0.0",
+        "licenseConcluded": "MIT",
+        "externalRefs": [
+            {"referenceType": "purl", "referenceLocator": "pkg:pypi/urllib3@2.0.0"}
+        ],
+    }
+    paths = []
+    for name in ("root.json", "dep.json"):
+        paths.append(tmp_path / name)
+        paths[-1].write_text(
+            json.dumps({"spdxVersion": "SPDX-2.3", "packages": [record]})
+        )
+
+    reads = []
+    materialized = []
+    get = _RecordField.__get__
+    materialize = LazySpdxPackage.materialize
+
+    def record_read(field, instance, owner):
+        if instance is not None:
+            reads.append((instance.source_sbom, field.key))
+        return get(field, instance, owner)
+
+    def record_materialize(pkg):
+        materialized.append(pkg.source_sbom)
+        return materialize(pkg)
+
+    monkeypatch.setattr(_RecordField, "__get__", record_read)
+    monkeypatch.setattr(LazySpdxPackage, "materialize", record_materialize)
+    result = SbomMerger(lazy_packages=True).merge_sboms(paths[0], paths[1:])
+
+    assert result.statistics.duplicate_packages_removed == 1
+    assert materialized == ["root.json"]
+    assert {key for source, key in reads if source == "dep.json"} == {
+        "SPDXID",
+        "name",
+        "versionInfo",
+        "externalRefs",
+    }
+
+
+def test_cli_lazy_packages(temp_sbom_dir):
+    result = CliRunner().invoke(
+        main,
+        ["--dependencies-dir", str(temp_sbom_dir), "--lazy-packages"],
+        catch_exceptions=False,
+    )
+    assert result.exit_code == 0
@@ -0,0 +1,210 @@
+import gzip
+import json
+import pytest
+from click.testing import CliRunner
+from sbom_merger.cli import cli, main
+from sbom_merger.services.merge_planner import MergePlanner, format_bytes
+
+MB = 1024 * 1024
+
+
+def write_sbom(path, packages):
+    sbom = {
+        "sbom": {
+            "SPDXID": "SPDXRef-DOCUMENT",
+            "packages": [
+                {"SPDXID": f"SPDXRef-{i}", "name": f"pkg-{i}"} for i in range(packages)
+            ],
+        }
+    }
+    path.write_text(json.dumps(sbom))
+    return path
+
+
+def test_estimate_input_counts_elements(tmp_path, monkeypatch):
+    small = write_sbom(tmp_path / "small.json", 10)
+    assert MergePlanner.estimate_input(small) == (small.stat().st_size, 11)
+
+    compressed = tmp_path / "small.json.gz"
+    compressed.write_bytes(gzip.compress(small.read_bytes()))
+    assert MergePlanner.estimate_input(compressed) == (small.stat().st_size, 11)
+    assert MergePlanner.estimate_input(tmp_path / "missing.json") == (0, 0)
+
+    # Past the sample, the count is extrapolated from the file size.
+    big = write_sbom(tmp_path / "big.json", 2000)
+    monkeypatch.setattr(MergePlanner, "SAMPLE_BYTES", big.stat().st_size // 4)
+    size, elements = MergePlanner.estimate_input(big)
+    assert size == big.stat().st_size
+    assert 1800 < elements < 2200
+
+    big_compressed = tmp_path / "big.json.gz"
+    big_compressed.write_bytes(gzip.compress(big.read_bytes()))
+    size, _ = MergePlanner.estimate_input(big_compressed)
+    assert size == big_compressed.stat().st_size * MergePlanner.COMPRESSION_RATIO
+
+
+@pytest.fixture
+def inputs(tmp_path):
+    return [write_sbom(tmp_path / f"{i}.json", 1000) for i in range(4)]
+
+
+@pytest.mark.parametrize(
+    "budget, engine",
+    [(100 * MB, "memory"), (2 * MB, "streaming"), (MB // 2, "sqlite")],
+)
+def test_plan_picks_engine_for_budget(inputs, budget, engine):
+    plan = MergePlanner.plan(inputs, memory_budget=budget, cpu_count=8)
+
+    assert plan.engine == engine
+    assert plan.jobs == 1
+    assert plan.estimated_elements == 4004
+    assert plan.input_count == 4
+    assert plan.reasons[1].startswith(f"engine {engine}:")
+
+
+def test_plan_parallelizes_large_inputs(inputs, monkeypatch):
+    monkeypatch.setattr(MergePlanner, "PARALLEL_MIN_BYTES", 1)
+
+    plan = MergePlanner.plan(inputs, memory_budget=2 * MB, cpu_count=8)
+    assert (plan.engine, plan.jobs) == ("parallel", 4)
+    # Its workers are pure Python, so on a GIL build they need processes.
+    assert plan.executor == "process"
+    assert "threads would share the GIL" in plan.reasons[-1]
+
+    monkeypatch.setattr(
+        "sbom_merger.services.parse_stage.is_free_threaded", lambda: True
+    )
+    plan = MergePlanner.plan(inputs, memory_budget=2 * MB, cpu_count=8)
+    assert plan.executor == "free-threaded"
+    plan = MergePlanner.plan(
+        inputs, memory_budget=2 * MB, cpu_count=8, executor="thread"
+    )
+    assert (plan.executor, plan.reasons[-1]) == (
+        "thread",
+        "executor thread, as requested",
+    )
+
+    plan = MergePlanner.plan(inputs, memory_budget=2 * MB, cpu_count=1)
+    assert (plan.engine, plan.jobs, plan.executor) == ("streaming", 1, "thread")
+    assert "only one CPU" in plan.reasons[0]
+
+
+def test_plan_keeps_requested_engine_and_jobs(inputs):
+    plan = MergePlanner.plan(
+        inputs, memory_budget=1, cpu_count=4, engine="streaming", jobs=0
+    )
+    assert (plan.engine, plan.jobs) == ("streaming", 4)
+    assert plan.reasons == [
+        "4 worker(s), as requested",
+        "engine streaming, as requested",
+    ]
+
+    plan = MergePlanner.plan(inputs, memory_budget=1, memory_only="--format yaml")
+    assert plan.engine == "memory"
+    assert "required by --format yaml" in plan.reasons[1]
+    assert "exceeds" in plan.reasons[2]
+
+
+def test_memory_only_reason():
+    assert MergePlanner.memory_only_reason("json") is None
+    assert MergePlanner.memory_only_reason("yaml") == "--format yaml"
+    assert MergePlanner.memory_only_reason("json", columnar_store=True)
+    assert MergePlanner.memory_only_reason("json", incremental=True)
+
+
+def test_default_memory_budget(monkeypatch):
+    assert MergePlanner.default_memory_budget() > 0
+
+    def unsupported(name):
+        raise ValueError(name)
+
+    monkeypatch.setattr("os.sysconf", unsupported)
+    assert MergePlanner.default_memory_budget() == MergePlanner.DEFAULT_MEMORY_BUDGET
+
+
+@pytest.mark.parametrize(
+    "size, text", [(512, "512 B"), (1536, "1.5 KiB"), (3 * MB, "3.0 MiB")]
+)
+def test_format_bytes(size, text):
+    assert format_bytes(size) == text
+    assert format_bytes(5 * 1024**4) == "5120.0 GiB"
+
+
+def test_cli_auto_engine_explains_and_reports_plan(temp_sbom_dir):
+    result = CliRunner().invoke(
+        main,
+        [
+            "--dependencies-dir",
+            str(temp_sbom_dir),
+            "--engine",
+            "auto",
+            "--memory-budget",
+            "1",
+            "--explain-plan",
+        ],
+        catch_exceptions=False,
+    )
+
+    assert result.exit_code == 0
+    assert "Merge plan:" in result.output
+    assert "Engine: memory, jobs: 1" in result.output
+    report = temp_sbom_dir.parent / "test_user_test_repo_merged_merge_report.md"
+    text = report.read_text()
+    assert "## Merge Plan" in text
+    assert "- **Engine:** memory" in text
+    assert "fits the 1.0 MiB budget" in text
+
+
+def test_cli_auto_engine_respects_memory_only_options(temp_sbom_dir, monkeypatch):
+    monkeypatch.setattr(MergePlanner, "IN_MEMORY_BYTES_PER_ELEMENT", MB)
+    args = ["--dependencies-dir", str(temp_sbom_dir), "--engine", "auto"]
+
+    result = CliRunner().invoke(main, [*args, "--memory-budget", "1"])
+    assert result.exit_code == 0
+    assert "Streaming merged SBOM" in result.output
+
+    result = CliRunner().invoke(
+        main, [*args, "--memory-budget", "1", "--format", "yaml", "--explain-plan"]
+    )
+    assert result.exit_code == 0
+    assert "required by --format yaml" in result.output
+
+
+def test_cli_explain_plan_keeps_requested_engine(temp_sbom_dir):
+    result = CliRunner().invoke(
+        main,
+        [
+            "--dependencies-dir",
+            str(temp_sbom_dir),
+            "--engine",
+            "streaming",
+            "--jobs",
+            "2",
+            "--explain-plan",
+        ],
+    )
+
+    assert result.exit_code == 0
+    assert "Engine: streaming, jobs: 2, executor: thread" in result.output
+
+
+def test_cli_parallel_engine_defaults_to_processes(temp_sbom_dir):
+    args = ["--dependencies-dir", str(temp_sbom_dir), "--engine", "parallel"]
+    args += ["--jobs", "2", "--explain-plan"]
+
+    result = CliRunner().invoke(main, args)
+    assert result.exit_code == 0
+    assert "Engine: parallel, jobs: 2, executor: process" in result.output
+
+    result = CliRunner().invoke(main, [*args, "--executor", "thread"])
+    assert result.exit_code == 0
+    assert "Engine: parallel, jobs: 2, executor: thread" in result.output
+
+
+def test_cli_batch_auto_engine(temp_sbom_dir):
+    export_root = temp_sbom_dir.parent.parent
+    result = CliRunner().invoke(cli, ["batch", str(export_root), "--engine", "auto"])
+
+    assert result.exit_code == 0
+    index = json.loads((export_root / "merge_index.json").read_text())
+    assert index["results"][0]["engine"] == "memory"
@@ -1,4 +1,11 @@
+import json
+import pytest
+from sbom_merger.domain.models import RelationshipIndex, SpdxRelationship
+from sbom_merger.infrastructure.id_table import IdTable
 from sbom_merger.services.merger import SbomMerger
+from sbom_merger.services.partitioned_merger import PartitionedMerger
+from sbom_merger.services.parser import SpdxParser
+from sbom_merger.services.streaming_merger import StreamingMerger
 from sbom_merger.infrastructure.file_handler import FileHandler
 
 
@@ -54,3 +61,88 @@ def test_merge_validation(temp_sbom_dir):
     assert result.merged_document.spdx_version == "SPDX-2.3"
     assert result.merged_document.spdx_id == "SPDXRef-DOCUMENT"
     assert result.merged_document.document_namespace is not None
+
+
+@pytest.mark.parametrize("engine", ["memory", "columnar", "streaming"])
+def test_merge_drops_duplicate_relationships(temp_sbom_dir, engine):
+    dep_path = temp_sbom_dir / "psf_requests_main.json"
+    (temp_sbom_dir / "copy.json").write_bytes(dep_path.read_bytes())
+    root_sbom, dep_sboms = FileHandler.discover_sbom_files(temp_sbom_dir)
+
+    if engine == "streaming":
+        output_path = temp_sbom_dir.parent / "merged.json"
+        result = StreamingMerger().merge_to_file(root_sbom, dep_sboms, output_path)
+        relationships = json.loads(output_path.read_text())["sbom"]["relationships"]
+    else:
+        merger = SbomMerger(columnar_store=engine == "columnar")
+        result = merger.merge_sboms(root_sbom, dep_sboms)
+        relationships = [
+            SpdxParser.relationship_to_dict(r)
+            for r in result.merged_document.relationships
+        ]
+
+    keys = [tuple(r.values()) for r in relationships]
+    assert len(keys) == len(set(keys)) == 4
+    assert result.statistics.duplicate_relationships_removed == 2
+    assert result.statistics.total_relationships == 4
+
+
+@pytest.mark.parametrize(
+    "engine, options",
+    [
+        (SbomMerger, {}),
+        (StreamingMerger, {}),
+        (PartitionedMerger, {"jobs": 2, "executor": "thread"}),
+        (PartitionedMerger, {"jobs": 2, "executor": "process"}),
+    ],
+)
+def test_merge_reports_id_reuse(temp_sbom_dir, tmp_path, engine, options):
+    dep_path = temp_sbom_dir / "psf_requests_main.json"
+    (temp_sbom_dir / "copy.json").write_bytes(dep_path.read_bytes())
+    root_sbom, dep_sboms = FileHandler.discover_sbom_files(temp_sbom_dir)
+    table_path = tmp_path / "ids.sqlite"
+
+    def merge():
+        merger = engine(id_table=IdTable(table_path), **options)
+        if engine is SbomMerger:
+            return merger.merge_sboms(root_sbom, dep_sboms).statistics
+        output_path = tmp_path / "merged.json"
+        return merger.merge_to_file(root_sbom, dep_sboms, output_path).statistics
+
+    # Six package IDs, four distinct; worker processes each start with an
+    # empty cache, so they may generate an ID another worker already has.
+    first = merge()
+    assert first.id_table_hits == 0
+    assert first.id_cache_hits + first.ids_generated == 6
+    assert len(IdTable(table_path).load()) == 4
+    if options.get("executor") != "process":
+        assert first.ids_generated == 4
+        assert first.id_hit_rate == pytest.approx(2 / 6)
+
+    second = merge()
+    assert second.ids_generated == 0
+    assert second.id_cache_hits + second.id_table_hits == 6
+    assert second.id_hit_rate == 1.0
+
+
+def test_relationship_index_keys_on_all_three_fields():
+    index = RelationshipIndex()
+    rel = SpdxRelationship("SPDXRef-a", "SPDXRef-b", "DEPENDS_ON")
+
+    assert index.add(rel)
+    assert not index.add(SpdxRelationship("SPDXRef-a", "SPDXRef-b", "DEPENDS_ON"))
+    assert index.add(SpdxRelationship("SPDXRef-b", "SPDXRef-a", "DEPENDS_ON"))
+    assert index.add(SpdxRelationship("SPDXRef-a", "SPDXRef-b", "CONTAINS"))
+    assert len(index) == 3
+
+
+def test_relationship_index_keeps_null_fields_apart():
+    index = RelationshipIndex()
+
+    assert index.add(SpdxRelationship("SPDXRef-a", "SPDXRef-b", None))
+    assert index.add(SpdxRelationship("SPDXRef-c", "SPDXRef-d", None))
+    assert index.add(SpdxRelationship("SPDXRef-a", None, "DEPENDS_ON"))
+    assert index.add(SpdxRelationship("SPDXRef-x", None, "DEPENDS_ON"))
+    assert index.add(SpdxRelationship(None, "SPDXRef-b", None))
+    assert not index.add(SpdxRelationship("SPDXRef-c", "SPDXRef-d", None))
+    assert len(index) == 5
@@ -0,0 +1,135 @@
+import json
+import os
+import tempfile
+from pathlib import Path
+import pytest
+from click.testing import CliRunner
+from sbom_merger.cli import main
+from sbom_merger.infrastructure.file_handler import FileHandler
+from sbom_merger.infrastructure.parse_cache import ParseCache
+from sbom_merger.services.merger import SbomMerger
+from sbom_merger.services.parse_stage import parse_path
+
+
+@pytest.fixture
+def cache_dir():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        yield Path(tmpdir) / "cache"
+
+
+def test_content_key_depends_on_content_name_and_options(cache_dir):
+    cache_dir.mkdir()
+    a = cache_dir / "a.json"
+    b = cache_dir / "b.json"
+    a.write_text('{"x": 1}')
+    b.write_text('{"x": 1}')
+
+    key = ParseCache.content_key(a, {"streaming": False})
+    assert key == ParseCache.content_key(a, {"streaming": False})
+    assert key != ParseCache.content_key(b, {"streaming": False})
+    assert key != ParseCache.content_key(a, {"streaming": True})
+
+    a.write_text('{"x": 2}')
+    assert key != ParseCache.content_key(a, {"streaming": False})
+
+
+def test_get_put_roundtrip(cache_dir):
+    cache = ParseCache(cache_dir)
+    assert cache.get("ab" * 32) is None
+
+    cache.put("ab" * 32, {"value": [1, 2, 3]})
+    assert cache.get("ab" * 32) == {"value": [1, 2, 3]}
+
+
+def test_corrupt_entry_is_discarded(cache_dir):
+    cache = ParseCache(cache_dir)
+    cache.put("cd" * 32, "value")
+    entry = cache._entry_path("cd" * 32)
+    entry.write_bytes(b"not a pickle")
+
+    assert cache.get("cd" * 32) is None
+    assert not entry.exists()
+
+
+class StaleEntry:
+    # Unpickles by calling `rebuild(*args)`, as a stale model layout would.
+    def __init__(self, rebuild, args):
+        self.rebuild, self.args = rebuild, args
+
+    def __reduce__(self):
+        return self.rebuild, self.args
+
+
+@pytest.mark.parametrize(
+    "stale", [StaleEntry(int, ([],)), StaleEntry(int, ("not a number",))]
+)
+def test_entry_that_fails_to_unpickle_is_a_miss(cache_dir, stale):
+    cache = ParseCache(cache_dir)
+    cache.put("ef" * 32, stale)
+    entry = cache._entry_path("ef" * 32)
+    assert entry.exists()
+
+    assert cache.get("ef" * 32) is None
+    assert not entry.exists()
+
+
+def test_lru_eviction_removes_least_recently_used(cache_dir):
+    cache = ParseCache(cache_dir, max_bytes=10_000)
+    payload = "x" * 4000
+
+    cache.put("01" * 32, payload)
+    cache.put("02" * 32, payload)
+    os.utime(cache._entry_path("01" * 32), (1, 1))
+    os.utime(cache._entry_path("02" * 32), (2, 2))
+    assert cache.get("01" * 32) == payload  # refreshes recency
+
+    cache.put("03" * 32, payload)
+
+    assert cache.get("02" * 32) is None
+    assert cache.get("01" * 32) == payload
+    assert cache.get("03" * 32) == payload
+    assert cache.total_size() <= 10_000
+
+
+def test_parse_path_uses_cache(cache_dir, sample_root_sbom):
+    cache = ParseCache(cache_dir)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = Path(tmpdir) / "project_root.json"
+        path.write_text(json.dumps(sample_root_sbom))
+
+        first, first_hit = parse_path(path, {}, cache)
+        second, second_hit = parse_path(path, {}, cache)
+
+        assert (first_hit, second_hit) == (False, True)
+        assert first == second
+        assert parse_path(path, {})[1] is None
+
+
+@pytest.mark.parametrize("jobs,executor", [(1, "thread"), (2, "process")])
+def test_merge_reports_cache_hits(cache_dir, temp_sbom_dir, jobs, executor):
+    root_sbom, dep_sboms = FileHandler.discover_sbom_files(temp_sbom_dir)
+    cache = ParseCache(cache_dir)
+
+    cold = SbomMerger(jobs=jobs, executor=executor, cache=cache).merge_sboms(
+        root_sbom, dep_sboms * 2
+    )
+    warm = SbomMerger(jobs=jobs, executor=executor, cache=cache).merge_sboms(
+        root_sbom, dep_sboms * 2
+    )
+
+    assert cold.statistics.cache_misses + cold.statistics.cache_hits == 3
+    assert (warm.statistics.cache_hits, warm.statistics.cache_misses) == (3, 0)
+    assert warm.merged_document.packages == cold.merged_document.packages
+
+
+def test_cli_with_cache_dir(cache_dir, temp_sbom_dir):
+    runner = CliRunner()
+    args = ["--dependencies-dir", str(temp_sbom_dir), "--cache-dir", str(cache_dir)]
+
+    runner.invoke(main, args, catch_exceptions=False)
+    result = runner.invoke(main, args, catch_exceptions=False)
+
+    assert result.exit_code == 0
+    assert "Parse cache: 2 hits, 0 misses" in result.output
+    report = next(temp_sbom_dir.parent.glob("*_merge_report.md")).read_text()
+    assert "**Parse Cache:** 2 hits, 0 misses" in report
@@ -0,0 +1,125 @@
+import json
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+import pytest
+from click.testing import CliRunner
+from sbom_merger.cli import cli
+from sbom_merger.services.merger import SbomMerger
+from sbom_merger.services.partitioned_merger import PartitionedMerger
+from sbom_merger.services.parse_stage import (
+    ParseStage,
+    create_executor,
+    default_executor,
+    is_free_threaded,
+    resolve_jobs,
+)
+
+
+@pytest.fixture
+def dependency_dir(sample_dependency_sbom):
+    with tempfile.TemporaryDirectory() as tmpdir:
+        base = Path(tmpdir)
+        paths = []
+        for index in range(6):
+            data = json.loads(json.dumps(sample_dependency_sbom))
+            data["sbom"]["name"] = f"dep-{index}"
+            # Pad later files so the largest-first schedule differs from input order.
+            data["sbom"]["comment"] = "x" * (index * 1000)
+            path = base / f"dep_{index}.json"
+            path.write_text(json.dumps(data))
+            paths.append(path)
+
+        broken = base / "broken.json"
+        broken.write_text("{not json")
+        paths.insert(2, broken)
+        yield paths
+
+
+@pytest.mark.parametrize("executor", ["thread", "process"])
+def test_parse_stage_preserves_input_order(dependency_dir, executor):
+    outcomes = ParseStage(jobs=3, executor=executor).run(dependency_dir)
+
+    assert [o.path for o in outcomes] == dependency_dir
+    assert outcomes[2].document is None
+    assert outcomes[2].error
+    names = [o.document.name for o in outcomes if o.document is not None]
+    assert names == [f"dep-{index}" for index in range(6)]
+
+
+def test_parse_stage_serial_matches_parallel(dependency_dir):
+    serial = ParseStage(jobs=1).run(dependency_dir)
+    parallel = ParseStage(jobs=4, streaming=True).run(dependency_dir)
+
+    assert [o.document for o in serial] == [o.document for o in parallel]
+    assert [o.error is None for o in serial] == [o.error is None for o in parallel]
+
+
+def test_parse_stage_missing_file_reports_error():
+    outcomes = ParseStage(jobs=2).run(
+        [Path("/nonexistent/a.json"), Path("/nonexistent/b.json")]
+    )
+    assert all(o.error for o in outcomes)
+
+
+def test_resolve_jobs():
+    assert resolve_jobs(3) == 3
+    assert resolve_jobs(0) >= 1
+    with pytest.raises(ValueError, match="must be >= 0"):
+        resolve_jobs(-1)
+
+
+def test_create_executor_rejects_unknown_kind():
+    with pytest.raises(ValueError, match="Unsupported executor"):
+        create_executor("fibers", 2)
+
+
+def test_free_threaded_executor_requires_gil_disabled():
+    with patch("sbom_merger.services.parse_stage.is_free_threaded", return_value=False):
+        with pytest.raises(ValueError, match="GIL disabled"):
+            create_executor("free-threaded", 2)
+
+    with patch("sbom_merger.services.parse_stage.is_free_threaded", return_value=True):
+        with create_executor("free-threaded", 2) as pool:
+            assert pool.submit(sum, [1, 2]).result() == 3
+
+
+def test_default_executor_runs_the_parallel_engine_off_the_gil():
+    with patch("sbom_merger.services.parse_stage.is_free_threaded", return_value=False):
+        assert default_executor("parallel") == "process"
+        assert PartitionedMerger(jobs=2).executor == "process"
+    with patch("sbom_merger.services.parse_stage.is_free_threaded", return_value=True):
+        assert default_executor("parallel") == "free-threaded"
+    assert default_executor("memory") == default_executor("sqlite") == "thread"
+
+
+def test_free_threaded_executor_is_rejected_even_when_serial(temp_sbom_dir):
+    with patch("sbom_merger.services.parse_stage.is_free_threaded", return_value=False):
+        with pytest.raises(ValueError, match="GIL disabled"):
+            ParseStage(jobs=1, executor="free-threaded")
+
+        for command in (
+            ["merge", "--dependencies-dir", str(temp_sbom_dir)],
+            ["batch", str(temp_sbom_dir.parent.parent)],
+        ):
+            result = CliRunner().invoke(
+                cli, [*command, "--jobs", "1", "--executor", "free-threaded"]
+            )
+            assert result.exit_code == 2
+            assert "GIL disabled" in result.output
+
+
+def test_is_free_threaded_returns_bool():
+    assert isinstance(is_free_threaded(), bool)
+
+
+def test_merge_collects_parse_errors_with_parallel_stage(temp_sbom_dir, dependency_dir):
+    root_sbom = next(temp_sbom_dir.parent.glob("*_root.json"))
+
+    result = SbomMerger(jobs=4).merge_sboms(root_sbom, dependency_dir)
+
+    assert result.statistics.total_sboms_processed == 7
+    assert len(result.statistics.validation_errors) == 1
+    assert result.statistics.validation_errors[0].startswith(
+        "Failed to parse broken.json"
+    )
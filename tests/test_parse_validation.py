@@ -0,0 +1,137 @@
+import json
+import tempfile
+from pathlib import Path
+import pytest
+from click.testing import CliRunner
+from sbom_merger.cli import main
+from sbom_merger.domain.models import SpdxDocument, SpdxPackage, SpdxRelationship
+from sbom_merger.services.merger import SbomMerger
+from sbom_merger.services.parser import SpdxParser
+from sbom_merger.services.validator import SpdxValidator
+
+BROKEN_SBOM = {
+    "sbom": {
+        "spdxVersion": "SPDX-2.3",
+        "SPDXID": "SPDXRef-DOCUMENT",
+        "name": "broken",
+        "documentNamespace": "https://example.com/broken",
+        "creationInfo": {},
+        "relationships": [
+            {
+                "spdxElementId": "SPDXRef-DOCUMENT",
+                "relatedSpdxElement": "SPDXRef-a",
+                "relationshipType": "DESCRIBES",
+            },
+            {
+                "spdxElementId": "SPDXRef-a",
+                "relatedSpdxElement": "SPDXRef-missing",
+                "relationshipType": "DEPENDS_ON",
+            },
+        ],
+        # Relationships come first: endpoints are resolved once parsing ends.
+        "packages": [
+            {"name": "a", "SPDXID": "SPDXRef-a"},
+            {"name": "a-again", "SPDXID": "SPDXRef-a"},
+            {"name": "", "SPDXID": "SPDXRef-nameless"},
+            {"name": "no-id"},
+        ],
+    }
+}
+
+
+@pytest.fixture
+def broken_file():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = Path(tmpdir) / "broken.json"
+        path.write_text(json.dumps(BROKEN_SBOM))
+        yield path
+
+
+@pytest.mark.parametrize("streaming", [False, True])
+def test_parse_time_validation_matches_validate_document(broken_file, streaming):
+    doc = SpdxParser.parse_sbom_file(broken_file, streaming=streaming, validate=True)
+
+    assert (doc.validation_errors, doc.validation_warnings) == (
+        SpdxValidator.validate_document(doc)
+    )
+    assert doc.validation_errors == [
+        "Duplicate SPDXID found: SPDXRef-a",
+        "Package with SPDXID 'SPDXRef-nameless' has no name",
+        "Package 'no-id' is missing SPDXID",
+    ]
+    assert len(doc.validation_warnings) == 1
+    assert "SPDXRef-missing" in doc.validation_warnings[0]
+
+
+def test_documents_are_not_validated_by_default(broken_file):
+    doc = SpdxParser.parse_sbom_file(broken_file)
+    assert doc.validation_errors is None and doc.validation_warnings is None
+
+
+def test_other_formats_validate_on_parse(temp_sbom_dir):
+    from tests.test_cyclonedx import CYCLONEDX_SBOM
+    from tests.test_spdx3 import SPDX3_SBOM
+    from tests.test_tag_value import TAG_VALUE_SBOM
+
+    (temp_sbom_dir / "a.spdx").write_text(TAG_VALUE_SBOM)
+    (temp_sbom_dir / "b.jsonld").write_text(json.dumps(SPDX3_SBOM))
+    (temp_sbom_dir / "c.json").write_text(json.dumps(CYCLONEDX_SBOM))
+
+    for name in ("a.spdx", "b.jsonld", "c.json"):
+        doc = SpdxParser.parse_sbom_file(temp_sbom_dir / name, validate=True)
+        assert doc.validation_errors == []
+        assert doc.validation_warnings == SpdxValidator.validate_document(doc)[1]
+
+
+def test_empty_document_warns():
+    doc = SpdxDocument("SPDX-2.3", "CC0-1.0", "SPDXRef-DOCUMENT", "", "", {})
+
+    errors, warnings = SpdxValidator.validate_merged_document(doc)
+    assert errors == ["Document namespace is missing"]
+    assert warnings == ["Document name is empty", "Document contains no packages"]
+    assert SpdxValidator.validate_document(doc) == (errors, warnings)
+
+
+def test_merged_validation_checks_cross_document_endpoints():
+    doc = SpdxDocument(
+        spdx_version="SPDX-2.3",
+        data_license="CC0-1.0",
+        spdx_id="SPDXRef-DOCUMENT",
+        name="merged",
+        document_namespace="https://example.com/merged",
+        creation_info={},
+        packages=[SpdxPackage(name="a", spdx_id="SPDXRef-a")],
+        relationships=[
+            SpdxRelationship("SPDXRef-DOCUMENT", "SPDXRef-a", "DESCRIBES"),
+            SpdxRelationship("SPDXRef-a", "SPDXRef-gone", "DEPENDS_ON"),
+        ],
+    )
+
+    errors, warnings = SpdxValidator.validate_merged_document(doc)
+    assert errors == []
+    assert len(warnings) == 1 and "SPDXRef-gone" in warnings[0]
+
+
+def test_merge_reports_parse_time_findings(temp_sbom_dir, broken_file):
+    (temp_sbom_dir / broken_file.name).write_bytes(broken_file.read_bytes())
+    root = next(temp_sbom_dir.parent.glob("*_root.json"))
+    deps = sorted(temp_sbom_dir.glob("*.json"))
+
+    result = SbomMerger(validate_on_parse=True).merge_sboms(root, deps)
+
+    errors = result.statistics.validation_errors
+    assert "broken.json: Duplicate SPDXID found: SPDXRef-a" in errors
+    assert any(
+        w.startswith("broken.json: ") for w in result.statistics.validation_warnings
+    )
+
+
+def test_cli_validate_on_parse(temp_sbom_dir):
+    result = CliRunner().invoke(
+        main,
+        ["--dependencies-dir", str(temp_sbom_dir), "--validate-on-parse"],
+        catch_exceptions=False,
+    )
+
+    assert result.exit_code == 0
+    assert "validation errors found" not in result.output
@@ -0,0 +1,105 @@
+import json
+import pytest
+from click.testing import CliRunner
+from sbom_merger.cli import main
+from sbom_merger.services.partitioned_merger import PartitionedMerger
+from sbom_merger.services.streaming_merger import StreamingMerger
+from .conftest import merge_to_file
+
+
+# Several copies of the dependency, so every partition sees duplicates.
+@pytest.mark.parametrize("sbom_dir", [4], indirect=True)
+@pytest.mark.parametrize(
+    "options",
+    [
+        {"jobs": 1},
+        {"jobs": 2, "executor": "thread"},
+        {"jobs": 3, "executor": "thread", "canonical": True},
+        {"jobs": 2, "executor": "process"},
+    ],
+)
+def test_parallel_output_matches_streaming_engine(sbom_dir, tmp_path, options):
+    canonical = options.pop("canonical", False)
+    result, text = merge_to_file(
+        PartitionedMerger(work_dir=tmp_path, **options),
+        sbom_dir,
+        "parallel.json",
+        canonical,
+    )
+    expected, expected_text = merge_to_file(
+        StreamingMerger(), sbom_dir, "streamed.json", canonical
+    )
+
+    document = expected.merged_document
+    expected_text = expected_text.replace(
+        document.document_namespace, result.merged_document.document_namespace
+    ).replace(
+        document.creation_info["created"],
+        result.merged_document.creation_info["created"],
+    )
+    assert text == expected_text
+    assert list(tmp_path.iterdir()) == []
+
+    statistics, expected_statistics = result.statistics, expected.statistics
+    assert statistics.duplicate_packages_removed > 0
+    for field in (
+        "total_sboms_processed",
+        "root_packages_count",
+        "dependency_packages_count",
+        "total_packages",
+        "total_relationships",
+        "duplicate_packages_removed",
+        "duplicate_relationships_removed",
+        "validation_errors",
+        "validation_warnings",
+    ):
+        assert getattr(statistics, field) == getattr(expected_statistics, field)
+
+
+def test_parallel_root_failure_stops_the_merge(temp_sbom_dir, tmp_path):
+    root = temp_sbom_dir.parent / "broken_root.json"
+    root.write_text("{")
+
+    with pytest.raises(ValueError):
+        PartitionedMerger(jobs=2, executor="thread").merge_to_file(
+            root, sorted(temp_sbom_dir.glob("*.json")), tmp_path / "out.json"
+        )
+
+
+def test_split_batches_keeps_order_and_balances_size(tmp_path):
+    paths = []
+    for i, size in enumerate([100, 10, 10, 10, 100, 10]):
+        path = tmp_path / f"{i}.json"
+        path.write_bytes(b" " * size)
+        paths.append(path)
+
+    batches = PartitionedMerger.split_batches(paths + [tmp_path / "missing"], 3)
+
+    assert [path for batch in batches for path in batch] == paths + [
+        tmp_path / "missing"
+    ]
+    assert len(batches) == 3
+    assert batches[0] == paths[:1]
+    assert PartitionedMerger.split_batches(paths, 1) == [paths]
+
+
+@pytest.mark.parametrize("sbom_dir", [4], indirect=True)
+def test_cli_parallel_engine(sbom_dir):
+    result = CliRunner().invoke(
+        main,
+        [
+            "--dependencies-dir",
+            str(sbom_dir),
+            "--engine",
+            "parallel",
+            "--jobs",
+            "2",
+            "--executor",
+            "thread",
+        ],
+        catch_exceptions=False,
+    )
+
+    assert result.exit_code == 0
+    output = sbom_dir.parent / "test_user_test_repo_merged.json"
+    assert len(json.loads(output.read_text())["sbom"]["packages"]) == 4
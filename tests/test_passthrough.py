@@ -0,0 +1,109 @@
+import json
+import pytest
+from click.testing import CliRunner
+from sbom_merger.cli import main
+from sbom_merger.services.merger import SbomMerger
+from sbom_merger.services.parser import SpdxParser
+
+RICH_PACKAGE = {
+    "name": "certifi",
+    "SPDXID": "SPDXRef-certifi",
+    "downloadLocation": "NOASSERTION",
+    "versionInfo": "2024.2.2",
+    "supplier": "Organization: Kenneth Reitz",
+    "primaryPackagePurpose": "LIBRARY",
+    "licenseDeclared": "MPL-2.0",
+    "homepage": "https://github.com/certifi/python-certifi",
+    "checksums": [{"algorithm": "SHA256", "checksumValue": "abc"}],
+    "annotations": [{"annotator": "Tool: scanner", "comment": "reviewed"}],
+}
+
+RICH_RELATIONSHIP = {
+    "spdxElementId": "SPDXRef-DOCUMENT",
+    "relatedSpdxElement": "SPDXRef-certifi",
+    "relationshipType": "DESCRIBES",
+    "comment": "top-level package",
+}
+
+
+@pytest.fixture
+def rich_sbom_dir(temp_sbom_dir):
+    dep = {
+        "sbom": {
+            "spdxVersion": "SPDX-2.3",
+            "SPDXID": "SPDXRef-DOCUMENT",
+            "name": "certifi",
+            "documentNamespace": "https://example.com/certifi",
+            "creationInfo": {},
+            "packages": [RICH_PACKAGE],
+            "relationships": [RICH_RELATIONSHIP],
+        }
+    }
+    (temp_sbom_dir / "certifi.json").write_text(json.dumps(dep))
+    return temp_sbom_dir
+
+
+def merged_entries(sbom_dir, **options):
+    root = next(sbom_dir.parent.glob("*_root.json"))
+    deps = sorted(sbom_dir.glob("*.json"))
+    merged = SbomMerger(**options).merge_sboms(root, deps).merged_document
+    sbom = SpdxParser.serialize_to_json(merged)["sbom"]
+    package = next(p for p in sbom["packages"] if p["name"] == "certifi")
+    relationship = next(
+        r for r in sbom["relationships"] if r["relatedSpdxElement"] == package["SPDXID"]
+    )
+    return package, relationship
+
+
+@pytest.mark.parametrize(
+    "options",
+    [
+        {},
+        {"streaming_parse": True},
+        {"lazy_packages": True},
+        {"columnar_store": True},
+    ],
+)
+def test_passthrough_keeps_unmodelled_fields(rich_sbom_dir, options):
+    package, relationship = merged_entries(rich_sbom_dir, passthrough=True, **options)
+
+    assert package["SPDXID"] != RICH_PACKAGE["SPDXID"]
+    assert package == {**RICH_PACKAGE, "SPDXID": package["SPDXID"]}
+    assert relationship == {
+        **RICH_RELATIONSHIP,
+        "relatedSpdxElement": package["SPDXID"],
+    }
+
+
+def test_fields_are_dropped_without_passthrough(rich_sbom_dir):
+    package, relationship = merged_entries(rich_sbom_dir)
+
+    assert "checksums" not in package and "supplier" not in package
+    assert "comment" not in relationship
+
+
+def test_parse_records_raw_record_only_in_passthrough(rich_sbom_dir):
+    path = rich_sbom_dir / "certifi.json"
+
+    doc = SpdxParser.parse_sbom_file(path, passthrough=True)
+    assert doc.packages[0].raw_record["checksums"] == RICH_PACKAGE["checksums"]
+    assert doc.relationships[0].raw_record["comment"] == "top-level package"
+
+    # Records are written back with the new SPDXID, not modified in place.
+    merged = doc.packages[0].materialize()
+    merged.spdx_id = "SPDXRef-new"
+    assert SpdxParser.package_to_dict(merged)["SPDXID"] == "SPDXRef-new"
+    assert merged.raw_record["SPDXID"] == "SPDXRef-certifi"
+    assert SpdxParser.parse_sbom_file(path).packages[0].raw_record is None
+
+
+def test_cli_passthrough(rich_sbom_dir):
+    result = CliRunner().invoke(
+        main,
+        ["--dependencies-dir", str(rich_sbom_dir), "--passthrough"],
+        catch_exceptions=False,
+    )
+
+    assert result.exit_code == 0
+    output = rich_sbom_dir.parent / "test_user_test_repo_merged.json"
+    assert '"primaryPackagePurpose": "LIBRARY"' in output.read_text()
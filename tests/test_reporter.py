@@ -21,6 +21,7 @@ def test_generate_report():
         dependency_packages_count=20,
         total_packages=30,
         total_relationships=15,
+        duplicate_relationships_removed=7,
         processing_time_seconds=1.5,
     )
 
@@ -30,6 +31,7 @@ def test_generate_report():
     assert "SPDX SBOM Merge Report" in report
     assert "30" in report
     assert "15" in report
+    assert "**Duplicate Relationships Removed:** 7" in report
     assert "1.50 seconds" in report
 
 
@@ -70,6 +72,7 @@ def test_generate_report_saves_to_file():
         )
 
         stats = MergeStatistics()
+        assert stats.id_hit_rate == 0.0
         result = MergeResult(merged_document=doc, statistics=stats)
 
         MergeReporter.generate_report(result, output_path)
@@ -0,0 +1,246 @@
+import json
+import tempfile
+from pathlib import Path
+import pytest
+from click.testing import CliRunner
+from sbom_merger.cli import main
+from sbom_merger.domain.models import SpdxDocument, SpdxRelationship
+from sbom_merger.infrastructure.config import Config
+from sbom_merger.infrastructure.file_handler import FileHandler
+from sbom_merger.services.merger import SbomMerger
+from sbom_merger.services.parser import SpdxParser
+from sbom_merger.services.spdx3 import Spdx3Parser, Spdx3Serializer
+from sbom_merger.services.validator import SpdxValidator
+
+NAMESPACE = "https://vendor.example/spdx/widget"
+
+SPDX3_SBOM = {
+    "@context": "https://spdx.org/rdf/3.0.1/spdx-context.jsonld",
+    "@graph": [
+        {
+            "type": "CreationInfo",
+            "@id": "_:creationinfo",
+            "specVersion": "3.0.1",
+            "created": "2025-12-11T00:00:00Z",
+            "createdBy": [f"{NAMESPACE}#vendor"],
+            "createdUsing": [f"{NAMESPACE}#scanner"],
+        },
+        {"type": "Organization", "spdxId": f"{NAMESPACE}#vendor", "name": "Vendor"},
+        {"type": "Tool", "spdxId": f"{NAMESPACE}#scanner", "name": "scanner"},
+        {
+            "type": "SpdxDocument",
+            "spdxId": NAMESPACE,
+            "creationInfo": "_:creationinfo",
+            "name": "vendor/widget",
+            "dataLicense": "https://spdx.org/licenses/CC0-1.0",
+            "rootElement": [f"{NAMESPACE}#SPDXRef-widget"],
+        },
+        {
+            "type": "software_Package",
+            "spdxId": f"{NAMESPACE}#SPDXRef-widget",
+            "name": "widget",
+            "software_packageVersion": "1.2.3",
+            "software_downloadLocation": "https://vendor.example/widget",
+            "software_copyrightText": "Copyright Vendor",
+            "software_packageUrl": "pkg:npm/widget@1.2.3",
+        },
+        {
+            "type": "software_Package",
+            "spdxId": f"{NAMESPACE}#SPDXRef-left-pad",
+            "name": "left-pad",
+            "externalIdentifier": [
+                {
+                    "type": "ExternalIdentifier",
+                    "externalIdentifierType": "packageUrl",
+                    "identifier": "pkg:npm/left-pad@1.3.0",
+                }
+            ],
+        },
+        {
+            "type": "simplelicensing_LicenseExpression",
+            "spdxId": f"{NAMESPACE}#license-mit",
+            "simplelicensing_licenseExpression": "MIT",
+        },
+        {
+            "type": "Relationship",
+            "spdxId": f"{NAMESPACE}#rel-1",
+            "from": f"{NAMESPACE}#SPDXRef-widget",
+            "relationshipType": "dependsOn",
+            "to": [f"{NAMESPACE}#SPDXRef-left-pad", "https://other.example#pkg"],
+        },
+        {
+            "type": "Relationship",
+            "spdxId": f"{NAMESPACE}#rel-2",
+            "from": f"{NAMESPACE}#SPDXRef-widget",
+            "relationshipType": "hasConcludedLicense",
+            "to": [f"{NAMESPACE}#license-mit"],
+        },
+    ],
+}
+
+
+@pytest.fixture
+def spdx3_file():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = Path(tmpdir) / "vendor_widget.json"
+        path.write_text(json.dumps(SPDX3_SBOM))
+        yield path
+
+
+def test_parse_spdx3_document(spdx3_file):
+    assert FileHandler.detect_format(spdx3_file) == "spdx3-jsonld"
+    doc = SpdxParser.parse_sbom_file(spdx3_file, streaming=True)
+
+    assert doc.spdx_version == "SPDX-3.0.1"
+    assert doc.data_license == "CC0-1.0"
+    assert doc.document_namespace == NAMESPACE
+    assert doc.creation_info["creators"] == ["Organization: Vendor", "Tool: scanner"]
+
+    widget, left_pad = doc.packages
+    assert (widget.spdx_id, widget.version_info, widget.license_concluded) == (
+        "SPDXRef-widget",
+        "1.2.3",
+        "MIT",
+    )
+    assert widget.copyright_text == "Copyright Vendor"
+    assert left_pad.download_location == "NOASSERTION"
+    assert left_pad.external_refs[0]["referenceLocator"] == "pkg:npm/left-pad@1.3.0"
+
+    assert [
+        (r.spdx_element_id, r.relationship_type, r.related_spdx_element)
+        for r in doc.relationships
+    ] == [
+        ("SPDXRef-DOCUMENT", "DESCRIBES", "SPDXRef-widget"),
+        ("SPDXRef-widget", "DEPENDS_ON", "SPDXRef-left-pad"),
+        ("SPDXRef-widget", "DEPENDS_ON", "https://other.example#pkg"),
+    ]
+
+
+def test_graph_detected_after_load_and_lazy(spdx3_file):
+    # The marker sniff only looks at the head of the file; a graph further
+    # down is still recognised once the JSON is decoded.
+    FileHandler.SNIFF_BYTES, saved = 0, FileHandler.SNIFF_BYTES
+    try:
+        doc = SpdxParser.parse_sbom_file(spdx3_file, lazy=True)
+    finally:
+        FileHandler.SNIFF_BYTES = saved
+
+    assert doc.packages[0].purl == "pkg:npm/widget@1.2.3"
+    assert Spdx3Parser.is_spdx3(SPDX3_SBOM)
+    assert not Spdx3Parser.is_spdx3({"sbom": {}})
+
+
+def test_spdx3_roundtrip(spdx3_file):
+    doc = SpdxParser.parse_sbom_file(spdx3_file)
+    serialized = Spdx3Serializer.serialize(doc)
+
+    assert serialized["@context"].endswith("spdx-context.jsonld")
+    types = [element["type"] for element in serialized["@graph"]]
+    assert types[0] == "CreationInfo"
+    assert types.count("software_Package") == 2
+
+    reparsed = Spdx3Parser.build_document(serialized, "out.jsonld")
+    assert reparsed.name == doc.name
+    assert reparsed.creation_info["creators"] == doc.creation_info["creators"]
+    assert [(p.spdx_id, p.license_concluded) for p in reparsed.packages] == [
+        (p.spdx_id, p.license_concluded) for p in doc.packages
+    ]
+    assert [
+        (r.spdx_element_id, r.relationship_type, r.related_spdx_element)
+        for r in reparsed.relationships
+    ] == [
+        (r.spdx_element_id, r.relationship_type, r.related_spdx_element)
+        for r in doc.relationships
+    ]
+
+
+def test_spdx3_relationship_types(spdx3_file):
+    doc = SpdxParser.parse_sbom_file(spdx3_file)
+    widget, left_pad = (p.spdx_id for p in doc.packages)
+    edges = [
+        (left_pad, "DEPENDENCY_OF", widget),
+        (left_pad, "DEV_DEPENDENCY_OF", widget),
+        (widget, "CONTAINS", left_pad),
+        (left_pad, "GENERATED_FROM", widget),
+        (left_pad, "PACKAGE_OF", widget),
+    ]
+    doc.relationships = [SpdxRelationship(a, b, kind) for a, kind, b in edges]
+    serialized = Spdx3Serializer.serialize(doc)
+
+    relationships = [
+        element
+        for element in serialized["@graph"]
+        if element["type"].endswith("Relationship")
+        and element["relationshipType"] != "hasConcludedLicense"
+    ]
+    assert [
+        (r["type"], r["relationshipType"], r.get("scope")) for r in relationships
+    ] == [
+        ("Relationship", "dependsOn", None),
+        ("LifecycleScopedRelationship", "dependsOn", "development"),
+        ("Relationship", "contains", None),
+        ("Relationship", "generates", None),
+        ("Relationship", "other", None),
+    ]
+    # *_OF edges are reversed: the dependent depends on the dependency.
+    assert relationships[0]["from"].endswith("#" + widget)
+    assert relationships[0]["to"][0].endswith("#" + left_pad)
+    assert relationships[4]["comment"] == "SPDX 2.3 relationship type PACKAGE_OF"
+
+    reparsed = Spdx3Parser.build_document(serialized, "out.jsonld")
+    assert [
+        (r.spdx_element_id, r.relationship_type, r.related_spdx_element)
+        for r in reparsed.relationships
+    ] == [
+        (widget, "DEPENDS_ON", left_pad),
+        (left_pad, "DEV_DEPENDENCY_OF", widget),
+        (widget, "CONTAINS", left_pad),
+        (widget, "GENERATES", left_pad),
+        (left_pad, "OTHER", widget),
+    ]
+
+
+def test_version_compatibility_accepts_spdx3():
+    docs = [
+        SpdxDocument(
+            spdx_version=version,
+            data_license="CC0-1.0",
+            spdx_id="SPDXRef-DOCUMENT",
+            name="doc",
+            document_namespace="https://example.com/doc",
+            creation_info={},
+        )
+        for version in ("SPDX-2.3", "SPDX-3.0.1")
+    ]
+
+    errors, warnings = SpdxValidator.validate_version_compatibility(docs)
+    assert errors == []
+    assert any("Multiple SPDX versions" in w for w in warnings)
+    assert Config.is_ingestible_spdx_version("SPDX-3.0")
+    assert not Config.is_ingestible_spdx_version("SPDX-1.0")
+
+
+def test_merge_mixed_versions(temp_sbom_dir, spdx3_file):
+    (temp_sbom_dir / "vendor_widget.jsonld").write_bytes(spdx3_file.read_bytes())
+
+    root_sbom, dep_sboms = FileHandler.discover_sbom_files(temp_sbom_dir)
+    result = SbomMerger().merge_sboms(root_sbom, dep_sboms)
+
+    merged = result.merged_document
+    assert merged.spdx_version == "SPDX-2.3"
+    assert {"widget", "left-pad"} <= {p.name for p in merged.packages}
+
+
+def test_cli_spdx3_output(temp_sbom_dir):
+    result = CliRunner().invoke(
+        main,
+        ["--dependencies-dir", str(temp_sbom_dir), "--format", "spdx3-jsonld"],
+        catch_exceptions=False,
+    )
+
+    assert result.exit_code == 0
+    output = temp_sbom_dir.parent / "test_user_test_repo_merged.jsonld"
+    doc = SpdxParser.parse_sbom_file(output)
+    assert doc.spdx_version == "SPDX-3.0.1"
+    assert doc.name.startswith("Merged SBOM")
+    assert "Tool: merge-spdx-sboms-v1.0.0" in doc.creation_info["creators"]
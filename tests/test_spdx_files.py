@@ -0,0 +1,243 @@
+import json
+import pickle
+import xml.etree.ElementTree as ET
+import pytest
+from click.testing import CliRunner
+from sbom_merger.cli import main
+from sbom_merger.infrastructure.element_spool import ElementSpool
+from sbom_merger.infrastructure.json_codec import available_json_backends
+from sbom_merger.services.merger import SbomMerger
+from sbom_merger.services.parser import SpdxParser
+from sbom_merger.services.tag_value import TagValueParser
+from sbom_merger.services.validator import SpdxValidator
+from sbom_merger.services.writers import JsonWriter, RdfXmlWriter, YamlWriter
+
+
+def file_record(spdx_id, name):
+    return {
+        "SPDXID": spdx_id,
+        "fileName": name,
+        "checksums": [{"algorithm": "SHA1", "checksumValue": "da39a3ee"}],
+    }
+
+
+@pytest.fixture
+def sbom_dir_with_files(temp_sbom_dir):
+    root_path = next(temp_sbom_dir.parent.glob("*_root.json"))
+    root = json.loads(root_path.read_text())
+    sbom = root["sbom"]
+    sbom["packages"][1]["hasFiles"] = ["SPDXRef-File-1", "SPDXRef-File-2"]
+    sbom["files"] = [
+        file_record("SPDXRef-File-1", "./setup.py"),
+        file_record("SPDXRef-File-2", "./src/main.py"),
+    ]
+    sbom["snippets"] = [
+        {
+            "SPDXID": "SPDXRef-Snippet-1",
+            "snippetFromFile": "SPDXRef-File-2",
+            "ranges": [
+                {
+                    "startPointer": {"offset": 10, "reference": "SPDXRef-File-2"},
+                    "endPointer": {"offset": 20, "reference": "SPDXRef-File-2"},
+                }
+            ],
+        }
+    ]
+    root_path.write_text(json.dumps(root))
+
+    dep = {
+        "spdxVersion": "SPDX-2.3",
+        "SPDXID": "SPDXRef-DOCUMENT",
+        "name": "lib",
+        "documentNamespace": "https://example.com/lib",
+        "creationInfo": {},
+        "packages": [{"name": "lib", "SPDXID": "SPDXRef-lib"}],
+        "files": [file_record("SPDXRef-File-1", "./lib.py")],
+        "relationships": [
+            {
+                "spdxElementId": "SPDXRef-lib",
+                "relatedSpdxElement": "SPDXRef-File-1",
+                "relationshipType": "CONTAINS",
+            }
+        ],
+    }
+    (temp_sbom_dir / "lib.json").write_text(json.dumps(dep))
+    return temp_sbom_dir
+
+
+def merge(sbom_dir, **options):
+    root = next(sbom_dir.parent.glob("*_root.json"))
+    deps = sorted(sbom_dir.glob("*.json"))
+    return SbomMerger(**options).merge_sboms(root, deps)
+
+
+@pytest.mark.parametrize("streaming", [False, True])
+def test_parse_spools_files_and_snippets(sbom_dir_with_files, streaming):
+    root = next(sbom_dir_with_files.parent.glob("*_root.json"))
+    doc = SpdxParser.parse_sbom_file(root, streaming=streaming)
+
+    assert doc.elements.counts == {"files": 2, "snippets": 1}
+    assert [r["fileName"] for r in doc.elements.iter_records("files")] == [
+        "./setup.py",
+        "./src/main.py",
+    ]
+    contains = [
+        (r.spdx_element_id, r.related_spdx_element)
+        for r in doc.relationships
+        if r.relationship_type == "CONTAINS"
+    ]
+    assert contains == [
+        ("SPDXRef-root-project", "SPDXRef-File-1"),
+        ("SPDXRef-root-project", "SPDXRef-File-2"),
+    ]
+
+
+@pytest.mark.parametrize("options", [{}, {"columnar_store": True}])
+def test_merge_remaps_dependency_elements(sbom_dir_with_files, options):
+    result = merge(sbom_dir_with_files, **options)
+    sbom = SpdxParser.serialize_to_json(result.merged_document)["sbom"]
+
+    file_ids = [f["SPDXID"] for f in sbom["files"]]
+    assert file_ids == ["SPDXRef-File-1", "SPDXRef-File-2", "SPDXRef-lib.json-File-1"]
+    assert sbom["snippets"][0]["snippetFromFile"] == "SPDXRef-File-2"
+
+    lib_id = next(p["SPDXID"] for p in sbom["packages"] if p["name"] == "lib")
+    assert {
+        "spdxElementId": lib_id,
+        "relatedSpdxElement": "SPDXRef-lib.json-File-1",
+        "relationshipType": "CONTAINS",
+    } in sbom["relationships"]
+    assert not any(
+        "File" in warning for warning in result.statistics.validation_warnings
+    )
+
+
+@pytest.mark.parametrize(
+    "options", [{}, {"lazy_packages": True}, {"columnar_store": True}]
+)
+def test_absent_files_analyzed_is_written_true(sbom_dir_with_files, options):
+    # The lib package contains a file and leaves filesAnalyzed out, so it
+    # defaults to true; writing false would contradict its CONTAINS.
+    document = merge(sbom_dir_with_files, **options).merged_document
+    sbom = SpdxParser.serialize_to_json(document)["sbom"]
+
+    lib = next(p for p in sbom["packages"] if p["name"] == "lib")
+    assert lib["filesAnalyzed"] is True
+    tags = list(TagValueParser.iter_tags(SpdxParser.serialize_to_tag_value(document)))
+    lib_tags = tags[tags.index(("PackageName", "lib")) :]
+    assert next(v for t, v in lib_tags if t == "FilesAnalyzed") == "true"
+
+
+def test_scoped_snippet_references(sbom_dir_with_files):
+    root = next(sbom_dir_with_files.parent.glob("*_root.json"))
+    (sbom_dir_with_files / "copy.json").write_bytes(root.read_bytes())
+
+    sbom = SpdxParser.serialize_to_json(merge(sbom_dir_with_files).merged_document)
+    snippet = sbom["sbom"]["snippets"][1]
+    assert snippet["SPDXID"] == "SPDXRef-copy.json-Snippet-1"
+    assert snippet["ranges"][0]["endPointer"]["reference"] == (
+        "SPDXRef-copy.json-File-2"
+    )
+
+
+@pytest.mark.parametrize("backend", available_json_backends())
+@pytest.mark.parametrize("canonical", [False, True])
+def test_json_writer_matches_serialize_to_json(sbom_dir_with_files, backend, canonical):
+    document = merge(sbom_dir_with_files).merged_document
+
+    text = "".join(JsonWriter.iter_chunks(document, backend, canonical))
+    assert json.loads(text) == SpdxParser.serialize_to_json(document)
+    if canonical:
+        keys = list(json.loads(text)["sbom"])
+        assert keys == sorted(keys)
+
+
+def test_yaml_includes_elements(sbom_dir_with_files):
+    yaml = pytest.importorskip("yaml")
+    document = merge(sbom_dir_with_files).merged_document
+
+    loaded = yaml.safe_load("".join(YamlWriter.iter_lines(document)))
+    assert loaded == SpdxParser.serialize_to_json(document)["sbom"]
+
+
+def test_tag_value_includes_elements(sbom_dir_with_files, tmp_path):
+    document = merge(sbom_dir_with_files).merged_document
+
+    text = "".join(SpdxParser.serialize_to_tag_value(document))
+    tags = list(TagValueParser.iter_tags(text.splitlines()))
+    assert [value for tag, value in tags if tag == "FileName"] == [
+        "./setup.py",
+        "./src/main.py",
+        "./lib.py",
+    ]
+    assert ("FileChecksum", "SHA1: da39a3ee") in tags
+    assert ("SnippetSPDXID", "SPDXRef-Snippet-1") in tags
+    assert ("SnippetFromFileSPDXID", "SPDXRef-File-2") in tags
+    assert ("SnippetByteRange", "10:20") in tags
+    # Elements come before the relationships, which follow all of them.
+    assert tags.index(("SnippetByteRange", "10:20")) < [tag for tag, _ in tags].index(
+        "Relationship"
+    )
+
+    # The reader spools the elements back, so CONTAINS still resolves.
+    output = tmp_path / "merged.spdx"
+    output.write_text(text)
+    reread = SpdxParser.parse_sbom_file(output)
+    assert len(reread.packages) == len(document.packages)
+    assert len(reread.relationships) == len(document.relationships)
+    for section in ElementSpool.SECTIONS:
+        assert list(reread.elements.iter_records(section)) == list(
+            document.elements.iter_records(section)
+        )
+    assert SpdxValidator.validate_document(reread) == ([], [])
+
+
+def test_rdf_includes_elements(sbom_dir_with_files):
+    document = merge(sbom_dir_with_files).merged_document
+    spdx, ptr = "{http://spdx.org/rdf/terms#}", "{http://www.w3.org/2009/pointers#}"
+    rdf = "{http://www.w3.org/1999/02/22-rdf-syntax-ns#}"
+
+    root = ET.fromstring("".join(RdfXmlWriter.iter_lines(document)))
+    files = root.findall(f"{spdx}File")
+    assert [f.findtext(f"{spdx}fileName") for f in files] == [
+        "./setup.py",
+        "./src/main.py",
+        "./lib.py",
+    ]
+    assert (
+        files[0].get(f"{rdf}about") == f"{document.document_namespace}#SPDXRef-File-1"
+    )
+    assert files[0].findtext(f".//{spdx}checksumValue") == "da39a3ee"
+
+    snippet = root.find(f"{spdx}Snippet")
+    from_file = snippet.find(f"{spdx}snippetFromFile").get(f"{rdf}resource")
+    assert from_file == f"{document.document_namespace}#SPDXRef-File-2"
+    assert [p.text for p in snippet.iter(f"{ptr}offset")] == ["10", "20"]
+
+
+def test_element_spool_reads_while_appending_and_pickles():
+    spool = ElementSpool()
+    spool.append("files", {"SPDXID": "SPDXRef-a"})
+
+    for record in spool.iter_records("files"):
+        if record["SPDXID"] == "SPDXRef-a":
+            spool.append("files", {"SPDXID": "SPDXRef-b"})
+    assert list(spool.element_ids()) == ["SPDXRef-a", "SPDXRef-b"]
+    assert list(spool.iter_records("snippets")) == []
+
+    restored = pickle.loads(pickle.dumps(spool))
+    assert list(restored.element_ids()) == ["SPDXRef-a", "SPDXRef-b"]
+    assert len(restored) == 2
+
+
+def test_cli_writes_files_section(sbom_dir_with_files):
+    result = CliRunner().invoke(
+        main,
+        ["--dependencies-dir", str(sbom_dir_with_files)],
+        catch_exceptions=False,
+    )
+
+    assert result.exit_code == 0
+    output = sbom_dir_with_files.parent / "test_user_test_repo_merged.json"
+    merged = json.loads(output.read_text())
+    assert len(merged["sbom"]["files"]) == 3
@@ -0,0 +1,140 @@
+import json
+import pytest
+from click.testing import CliRunner
+from sbom_merger.cli import main
+from sbom_merger.domain.models import SpdxPackage, SpdxRelationship
+from sbom_merger.infrastructure.bloom_filter import BloomFilter
+from sbom_merger.infrastructure.sqlite_store import SqliteMergeStore
+from sbom_merger.services.sqlite_merger import SqliteMergeSink, SqliteMerger
+from sbom_merger.services.streaming_merger import StreamingMerger
+from sbom_merger.services.writers import JsonWriter
+from .conftest import merge_to_file
+
+
+@pytest.mark.parametrize(
+    "options",
+    [{}, {"canonical": True}, {"validate_on_parse": True}, {"passthrough": True}],
+)
+def test_sqlite_output_matches_streaming_engine(sbom_dir, tmp_path, options):
+    canonical = options.pop("canonical", False)
+    merger = SqliteMerger(work_dir=tmp_path, expected_ids=8, **options)
+    result, text = merge_to_file(merger, sbom_dir, "sqlite.json", canonical)
+    expected, expected_text = merge_to_file(
+        StreamingMerger(**options), sbom_dir, "streamed.json", canonical
+    )
+
+    document = expected.merged_document
+    expected_text = expected_text.replace(
+        document.document_namespace, result.merged_document.document_namespace
+    ).replace(
+        document.creation_info["created"],
+        result.merged_document.creation_info["created"],
+    )
+    assert text == expected_text
+    assert list(tmp_path.iterdir()) == []
+
+    statistics, expected_statistics = result.statistics, expected.statistics
+    assert statistics.duplicate_packages_removed == 2
+    assert statistics.duplicate_relationships_removed == 2
+    for field in (
+        "total_packages",
+        "total_relationships",
+        "validation_errors",
+        "validation_warnings",
+    ):
+        assert getattr(statistics, field) == getattr(expected_statistics, field)
+    assert any("SPDXRef-copy.json-missing" in w for w in statistics.validation_warnings)
+    assert not any("File-1" in w for w in statistics.validation_warnings)
+    assert json.loads(text)["sbom"]["files"][0]["SPDXID"] == "SPDXRef-copy.json-File-1"
+
+
+def test_sqlite_sink_reports_unnamed_packages(temp_sbom_dir, sample_dependency_sbom):
+    sample_dependency_sbom["sbom"]["packages"][0]["name"] = ""
+    (temp_sbom_dir / "psf_requests_main.json").write_text(
+        json.dumps(sample_dependency_sbom)
+    )
+
+    result, _ = merge_to_file(SqliteMerger(), temp_sbom_dir, "sqlite.json")
+    expected, _ = merge_to_file(StreamingMerger(), temp_sbom_dir, "streamed.json")
+
+    assert result.statistics.validation_errors == expected.statistics.validation_errors
+    assert "has no name" in result.statistics.validation_errors[0]
+
+
+def test_bloom_filter_spares_lookups_for_new_keys(tmp_path):
+    store = SqliteMergeStore(expected_ids=1000, directory=tmp_path)
+    ids = [f"SPDXRef-pkg-{i}" for i in range(1000)]
+
+    assert all(store.add_package(spdx_id, "{}") for spdx_id in ids)
+    assert store.probes < 50
+    probes = store.probes
+
+    assert not any(store.add_package(spdx_id, "{}") for spdx_id in ids)
+    assert store.probes == probes + 1000
+    assert store.package_count == 1000
+    assert store.add_relationship("a", "b", "DEPENDS_ON", "{}")
+    assert not store.add_relationship("a", "b", "DEPENDS_ON", "{}")
+    assert list(store.iter_records("relationships")) == ["{}"]
+
+    with pytest.raises(ValueError):
+        list(store.iter_records("element_ids"))
+    store.close()
+    assert not store.path.exists()
+
+
+def test_sink_encodes_only_new_records(tmp_path, monkeypatch):
+    encoded = []
+    encode = JsonWriter.encode_element
+    monkeypatch.setattr(
+        JsonWriter,
+        "encode_element",
+        lambda *args: encoded.append(args[1]) or encode(*args),
+    )
+    sink = SqliteMergeSink("stdlib", canonical=False, directory=tmp_path)
+    pkg = SpdxPackage(name="a", spdx_id="SPDXRef-a")
+    rel = SpdxRelationship("SPDXRef-a", "SPDXRef-b", "DEPENDS_ON")
+
+    assert [
+        sink.add_package(pkg, "SPDXRef-pypi-a"),
+        sink.add_package(pkg, "SPDXRef-pypi-a"),
+    ] == [True, False]
+    assert [sink.add_relationship(rel), sink.add_relationship(rel)] == [True, False]
+    assert [record.get("SPDXID", "rel") for record in encoded] == [
+        "SPDXRef-pypi-a",
+        "rel",
+    ]
+    sink.close()
+
+
+@pytest.mark.parametrize("capacity, error_rate", [(0, 0.01), (10, 0), (10, 1)])
+def test_bloom_filter_rejects_bad_parameters(capacity, error_rate):
+    with pytest.raises(ValueError):
+        BloomFilter(capacity, error_rate)
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(100)
+    for i in range(500):
+        bloom.add(str(i))
+
+    assert all(str(i) in bloom for i in range(500))
+
+
+def test_estimate_ids_from_input_sizes(tmp_path):
+    big = tmp_path / "big.json"
+    big.write_bytes(b" " * 1024 * 1024)
+
+    assert SqliteMerger.estimate_ids([big, tmp_path / "missing.json"]) == 4096
+    assert SqliteMerger.estimate_ids([]) == 1024
+
+
+def test_cli_sqlite_engine(sbom_dir):
+    result = CliRunner().invoke(
+        main,
+        ["--dependencies-dir", str(sbom_dir), "--engine", "sqlite"],
+        catch_exceptions=False,
+    )
+
+    assert result.exit_code == 0
+    output = sbom_dir.parent / "test_user_test_repo_merged.json"
+    assert len(json.loads(output.read_text())["sbom"]["packages"]) == 4
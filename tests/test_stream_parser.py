@@ -0,0 +1,106 @@
+import io
+import json
+import tempfile
+from pathlib import Path
+import pytest
+from sbom_merger.services.parser import SpdxParser
+from sbom_merger.services.merger import SbomMerger
+from sbom_merger.infrastructure.file_handler import FileHandler
+from sbom_merger.services.stream_parser import (
+    JsonTokenReader,
+    SpdxStreamParser,
+    DOCUMENT_EVENT,
+    HEADER_EVENT,
+    PACKAGE_EVENT,
+    RELATIONSHIP_EVENT,
+)
+
+
+def _write_json(data, suffix=".json"):
+    with tempfile.NamedTemporaryFile(mode="w", suffix=suffix, delete=False) as f:
+        json.dump(data, f, indent=2)
+        return Path(f.name)
+
+
+def test_stream_parse_matches_eager_parse_wrapped(sample_root_sbom):
+    path = _write_json(sample_root_sbom)
+    try:
+        eager = SpdxParser.parse_sbom_file(path)
+        streamed = SpdxParser.parse_sbom_file(path, streaming=True)
+        assert streamed == eager
+    finally:
+        path.unlink()
+
+
+def test_stream_parse_matches_eager_parse_unwrapped(sample_dependency_sbom):
+    path = _write_json(sample_dependency_sbom["sbom"])
+    try:
+        eager = SpdxParser.parse_sbom_file(path)
+        streamed = SpdxStreamParser.parse_sbom_file(path)
+        assert streamed == eager
+        assert streamed.name == "com.github.psf/requests"
+    finally:
+        path.unlink()
+
+
+def test_iter_events_yields_packages_and_relationships(sample_root_sbom):
+    path = _write_json(sample_root_sbom)
+    try:
+        events = list(SpdxStreamParser.iter_events(path, chunk_size=7))
+        kinds = [kind for kind, _ in events]
+        assert kinds[0] == DOCUMENT_EVENT
+        assert kinds.count(PACKAGE_EVENT) == 2
+        assert kinds.count(RELATIONSHIP_EVENT) == 2
+        headers = dict(value for kind, value in events if kind == HEADER_EVENT)
+        assert headers["spdxVersion"] == "SPDX-2.3"
+        assert events[kinds.index(PACKAGE_EVENT)][1].source_sbom == path.name
+    finally:
+        path.unlink()
+
+
+def test_reader_handles_values_split_across_chunks():
+    reader = JsonTokenReader(io.StringIO('[12345, "abc\\"def", {"a": [1, 2]}]'), 3)
+    assert list(reader.iter_array()) == [12345, 'abc"def', {"a": [1, 2]}]
+    reader.expect_end()
+
+
+def test_reader_empty_containers():
+    path = _write_json({"sbom": {"packages": [], "relationships": []}})
+    try:
+        doc = SpdxStreamParser.parse_sbom_file(path)
+        assert doc.packages == []
+        assert doc.relationships == []
+    finally:
+        path.unlink()
+
+    path = _write_json({})
+    try:
+        assert list(SpdxStreamParser.iter_events(path)) == []
+    finally:
+        path.unlink()
+
+
+@pytest.mark.parametrize(
+    "content",
+    ["not json at all", '{"sbom": {"packages": [}}', '{"a": 1} trailing', "{1: 2}"],
+)
+def test_stream_parse_invalid_json(content):
+    with tempfile.NamedTemporaryFile(mode="w", suffix=".json", delete=False) as f:
+        f.write(content)
+        path = Path(f.name)
+
+    try:
+        with pytest.raises(json.JSONDecodeError):
+            SpdxStreamParser.parse_sbom_file(path)
+    finally:
+        path.unlink()
+
+
+def test_merge_with_streaming_parse(temp_sbom_dir):
+    root_sbom, dep_sboms = FileHandler.discover_sbom_files(temp_sbom_dir)
+
+    eager = SbomMerger().merge_sboms(root_sbom, dep_sboms)
+    streamed = SbomMerger(streaming_parse=True).merge_sboms(root_sbom, dep_sboms)
+
+    assert streamed.merged_document.packages == eager.merged_document.packages
+    assert streamed.merged_document.relationships == eager.merged_document.relationships
@@ -0,0 +1,168 @@
+import json
+import pytest
+from click.testing import CliRunner
+from sbom_merger.cli import main, save_merged_document
+from sbom_merger.services.merger import SbomMerger
+from sbom_merger.services.parse_stage import ParseStage
+from sbom_merger.services.parser import SpdxParser
+from sbom_merger.services.streaming_merger import StreamingMerger
+from .conftest import merge_to_file, sbom_inputs
+
+
+def memory_output(sbom_dir, streamed, canonical=False, **options):
+    # Same merge through the in-memory engine, with the per-run header values
+    # of the streamed output.
+    result = SbomMerger(**options).merge_sboms(*sbom_inputs(sbom_dir))
+    path = sbom_dir.parent / "memory.json"
+    save_merged_document(result.merged_document, path, "json", "auto", canonical)
+
+    document = result.merged_document
+    text = path.read_text()
+    text = text.replace(document.document_namespace, streamed.document_namespace)
+    text = text.replace(
+        document.creation_info["created"], streamed.creation_info["created"]
+    )
+    return text, result.statistics
+
+
+@pytest.mark.parametrize(
+    "options",
+    [
+        {},
+        {"canonical": True},
+        {"passthrough": True},
+        {"validate_on_parse": True},
+        {"lazy_packages": True, "jobs": 2},
+    ],
+)
+def test_streaming_output_matches_memory_engine(sbom_dir, options):
+    canonical = options.pop("canonical", False)
+
+    result, text = merge_to_file(
+        StreamingMerger(**options), sbom_dir, "streamed.json", canonical
+    )
+    expected, statistics = memory_output(
+        sbom_dir, result.merged_document, canonical, **options
+    )
+
+    assert text == expected
+    assert result.output_path == str(sbom_dir.parent / "streamed.json")
+    assert result.merged_document.packages == []
+
+    actual = result.statistics
+    assert actual.duplicate_packages_removed == 2
+    for field in (
+        "total_sboms_processed",
+        "root_packages_count",
+        "dependency_packages_count",
+        "total_packages",
+        "total_relationships",
+        "validation_errors",
+        "validation_warnings",
+    ):
+        assert getattr(actual, field) == getattr(statistics, field)
+
+
+@pytest.mark.parametrize("root_format", ["json", "tag-value"])
+def test_streaming_folds_root_from_parser_events(sbom_dir, monkeypatch, root_format):
+    # Relationships ahead of the packages they refer to are held back until
+    # the packages have been read.
+    root = sbom_inputs(sbom_dir)[0]
+    sbom = json.loads(root.read_text())["sbom"]
+    sbom = {"relationships": sbom.pop("relationships"), **sbom}
+    root.write_text(json.dumps({"sbom": sbom}))
+    if root_format == "tag-value":
+        document = SpdxParser.parse_sbom_file(root)
+        root.unlink()
+        root = root.with_suffix(".spdx")
+        root.write_text("".join(SpdxParser.serialize_to_tag_value(document)))
+
+    parsed = []
+    parse = SpdxParser.parse_sbom_file
+    monkeypatch.setattr(
+        SpdxParser,
+        "parse_sbom_file",
+        lambda path, **options: parsed.append(path) or parse(path, **options),
+    )
+    result, text = merge_to_file(StreamingMerger(), sbom_dir, "streamed.json")
+
+    assert root not in parsed
+    assert text == memory_output(sbom_dir, result.merged_document)[0]
+    assert result.statistics.root_packages_count == 2
+
+
+def test_streaming_rejects_elements_outside_the_wrapper(sbom_dir):
+    root = sbom_inputs(sbom_dir)[0]
+    sbom = json.loads(root.read_text())["sbom"]
+    root.write_text(json.dumps({"packages": sbom["packages"], "sbom": sbom}))
+
+    with pytest.raises(ValueError, match='found outside the "sbom" object'):
+        merge_to_file(StreamingMerger(), sbom_dir, "streamed.json")
+
+
+def test_streaming_merges_spooled_elements(temp_sbom_dir):
+    dep = {
+        "spdxVersion": "SPDX-2.3",
+        "SPDXID": "SPDXRef-DOCUMENT",
+        "name": "lib",
+        "documentNamespace": "https://example.com/lib",
+        "creationInfo": {},
+        "packages": [{"name": "lib", "SPDXID": "SPDXRef-lib"}],
+        "files": [{"SPDXID": "SPDXRef-File-1", "fileName": "./lib.py"}],
+    }
+    (temp_sbom_dir / "lib.json").write_text(json.dumps(dep))
+    output_path = temp_sbom_dir.parent / "streamed.json"
+
+    result = StreamingMerger().merge_to_file(*sbom_inputs(temp_sbom_dir), output_path)
+
+    files = json.loads(output_path.read_text())["sbom"]["files"]
+    assert files == [{"SPDXID": "SPDXRef-lib.json-File-1", "fileName": "./lib.py"}]
+    assert result.statistics.validation_errors == []
+
+
+def test_streaming_rejects_incompatible_versions(temp_sbom_dir, sample_dependency_sbom):
+    sample_dependency_sbom["sbom"]["spdxVersion"] = "SPDX-1.2"
+    (temp_sbom_dir / "old.json").write_text(json.dumps(sample_dependency_sbom))
+    output_path = temp_sbom_dir.parent / "streamed.json"
+
+    with pytest.raises(ValueError, match="Unsupported SPDX version: SPDX-1.2"):
+        StreamingMerger().merge_to_file(*sbom_inputs(temp_sbom_dir), output_path)
+    assert not output_path.exists()
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_iter_outcomes_keeps_input_order(sbom_dir, jobs):
+    paths = sbom_inputs(sbom_dir)[1]
+
+    outcomes = list(ParseStage(jobs).iter_outcomes(paths))
+
+    assert [outcome.path for outcome in outcomes] == paths
+    assert outcomes[0].document is None and outcomes[0].error
+    assert all(outcome.document for outcome in outcomes[1:])
+
+
+def test_cli_streaming_engine(sbom_dir):
+    result = CliRunner().invoke(
+        main,
+        ["--dependencies-dir", str(sbom_dir), "--engine", "streaming"],
+        catch_exceptions=False,
+    )
+
+    assert result.exit_code == 0
+    assert "Streaming merged SBOM to" in result.output
+    output = sbom_dir.parent / "test_user_test_repo_merged.json"
+    assert len(json.loads(output.read_text())["sbom"]["packages"]) == 4
+    assert (sbom_dir.parent / "test_user_test_repo_merged_merge_report.md").exists()
+
+
+@pytest.mark.parametrize(
+    "extra", [["--format", "yaml"], ["--columnar-store"], ["--incremental"]]
+)
+def test_cli_streaming_engine_rejects_options(temp_sbom_dir, extra):
+    result = CliRunner().invoke(
+        main,
+        ["--dependencies-dir", str(temp_sbom_dir), "--engine", "streaming", *extra],
+    )
+
+    assert result.exit_code == 2
+    assert "--engine streaming" in result.output
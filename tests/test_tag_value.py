@@ -0,0 +1,145 @@
+import io
+import tempfile
+from pathlib import Path
+import pytest
+from click.testing import CliRunner
+from sbom_merger.cli import main
+from sbom_merger.infrastructure.file_handler import FileHandler
+from sbom_merger.services.merger import SbomMerger
+from sbom_merger.services.parser import SpdxParser
+from sbom_merger.services.tag_value import TagValueParser, TagValueSerializer
+
+TAG_VALUE_SBOM = """\
+## Document Information
+SPDXVersion: SPDX-2.3
+DataLicense: CC0-1.0
+SPDXID: SPDXRef-DOCUMENT
+DocumentName: vendor/widget
+DocumentNamespace: https://vendor.example/spdx/widget
+Creator: Tool: vendor-scanner
+Creator: Organization: Vendor
+Created: 2025-12-11T00:00:00Z
+DocumentComment: <text>Generated by
+vendor tooling</text>
+
+## Packages
+PackageName: widget
+SPDXID: SPDXRef-widget
+PackageVersion: 1.2.3
+PackageDownloadLocation: https://vendor.example/widget
+FilesAnalyzed: false
+PackageLicenseConcluded: MIT
+PackageCopyrightText: <text>Copyright Vendor</text>
+PackageChecksum: SHA256: abc123
+ExternalRef: PACKAGE-MANAGER purl pkg:npm/widget@1.2.3
+
+FileName: ./src/index.js
+SPDXID: SPDXRef-File-index
+FileChecksum: SHA1: deadbeef
+
+PackageName: left-pad
+SPDXID: SPDXRef-left-pad
+PackageDownloadLocation: NOASSERTION
+
+Relationship: SPDXRef-DOCUMENT DESCRIBES SPDXRef-widget
+Relationship: SPDXRef-widget DEPENDS_ON SPDXRef-left-pad
+"""
+
+
+@pytest.fixture
+def tag_value_file():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = Path(tmpdir) / "vendor_widget.spdx"
+        path.write_text(TAG_VALUE_SBOM)
+        yield path
+
+
+def test_parse_tag_value_document(tag_value_file):
+    doc = SpdxParser.parse_sbom_file(tag_value_file)
+
+    assert doc.spdx_version == "SPDX-2.3"
+    assert doc.name == "vendor/widget"
+    assert doc.comment == "Generated by\nvendor tooling"
+    assert doc.creation_info == {
+        "creators": ["Tool: vendor-scanner", "Organization: Vendor"],
+        "created": "2025-12-11T00:00:00Z",
+    }
+    assert [p.spdx_id for p in doc.packages] == ["SPDXRef-widget", "SPDXRef-left-pad"]
+
+    widget = doc.packages[0]
+    assert widget.version_info == "1.2.3"
+    assert widget.files_analyzed is False
+    assert widget.license_concluded == "MIT"
+    assert widget.copyright_text == "Copyright Vendor"
+    assert widget.external_refs == [
+        {
+            "referenceCategory": "PACKAGE-MANAGER",
+            "referenceType": "purl",
+            "referenceLocator": "pkg:npm/widget@1.2.3",
+        }
+    ]
+    assert widget.source_sbom == "vendor_widget.spdx"
+    assert [(r.spdx_element_id, r.relationship_type) for r in doc.relationships] == [
+        ("SPDXRef-DOCUMENT", "DESCRIBES"),
+        ("SPDXRef-widget", "DEPENDS_ON"),
+    ]
+
+
+def test_tag_value_roundtrip(tag_value_file):
+    doc = SpdxParser.parse_sbom_file(tag_value_file)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        output = Path(tmpdir) / "out.spdx"
+        FileHandler.save_lines(SpdxParser.serialize_to_tag_value(doc), output)
+        reparsed = SpdxParser.parse_sbom_file(output)
+
+    assert reparsed.comment == doc.comment
+    assert reparsed.creation_info == doc.creation_info
+    assert [(p.spdx_id, p.name, p.version_info) for p in reparsed.packages] == [
+        (p.spdx_id, p.name, p.version_info) for p in doc.packages
+    ]
+    assert len(reparsed.relationships) == len(doc.relationships)
+
+
+def test_serializer_formats_values():
+    assert TagValueSerializer._format_value(True) == "true"
+    assert TagValueSerializer._format_value("a\nb") == "<text>a\nb</text>"
+
+
+def test_iter_tags_errors_and_invalid_relationship():
+    with pytest.raises(ValueError, match="Unterminated"):
+        list(TagValueParser.iter_tags(["PackageComment: <text>never closed"]))
+
+    stream = io.StringIO("Relationship: only-two PARTS\n")
+    with pytest.raises(ValueError, match="Invalid Relationship"):
+        list(TagValueParser.iter_stream_events(stream, "x.spdx"))
+
+
+def test_discover_and_merge_tag_value(temp_sbom_dir):
+    (temp_sbom_dir / "vendor_widget.spdx").write_text(TAG_VALUE_SBOM)
+
+    root_sbom, dep_sboms = FileHandler.discover_sbom_files(temp_sbom_dir)
+    assert FileHandler.detect_format(Path("a.spdx.gz")) == "tag-value"
+    assert FileHandler.detect_format(Path("a.json")) == "json"
+    assert "vendor_widget.spdx" in [p.name for p in dep_sboms]
+
+    result = SbomMerger().merge_sboms(root_sbom, dep_sboms)
+    names = {p.name for p in result.merged_document.packages}
+    assert {"widget", "left-pad"} <= names
+
+
+def test_cli_tag_value_output(temp_sbom_dir):
+    result = CliRunner().invoke(
+        main,
+        ["--dependencies-dir", str(temp_sbom_dir), "--format", "tag-value"],
+        catch_exceptions=False,
+    )
+
+    assert result.exit_code == 0
+    output = temp_sbom_dir.parent / "test_user_test_repo_merged.spdx"
+    assert output.exists()
+    doc = SpdxParser.parse_sbom_file(output)
+    merged_json = temp_sbom_dir.parent / "test_user_test_repo_merged.json"
+    assert not merged_json.exists()
+    assert doc.name.startswith("Merged SBOM")
+    assert "Tool: merge-spdx-sboms-v1.0.0" in doc.creation_info["creators"]
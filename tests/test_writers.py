@@ -0,0 +1,123 @@
+import json
+import xml.etree.ElementTree as ET
+import pytest
+from click.testing import CliRunner
+from sbom_merger.cli import main
+from sbom_merger.domain.models import SpdxDocument, SpdxPackage, SpdxRelationship
+from sbom_merger.services.parser import SpdxParser
+from sbom_merger.services.writers import RdfXmlWriter, YamlWriter
+
+SPDX = "{http://spdx.org/rdf/terms#}"
+RDF = "{http://www.w3.org/1999/02/22-rdf-syntax-ns#}"
+
+
+@pytest.fixture
+def document():
+    return SpdxDocument(
+        spdx_version="SPDX-2.3",
+        data_license="CC0-1.0",
+        spdx_id="SPDXRef-DOCUMENT",
+        name="widget <merged>",
+        document_namespace="https://example.com/widget",
+        creation_info={
+            "created": "2025-12-11T00:00:00Z",
+            "creators": ["Tool: scanner", 'Organization: "Vendor" & Co'],
+            "licenseListVersion": "3.22",
+        },
+        packages=[
+            SpdxPackage(
+                name="widget",
+                spdx_id="SPDXRef-widget",
+                download_location="NOASSERTION",
+                version_info="1.2.3",
+                license_concluded="MIT",
+                copyright_text="Copyright: Vendor\nAll rights reserved",
+                external_refs=[
+                    {
+                        "referenceCategory": "PACKAGE-MANAGER",
+                        "referenceType": "purl",
+                        "referenceLocator": "pkg:npm/widget@1.2.3",
+                    }
+                ],
+            ),
+            SpdxPackage(
+                name="left-pad",
+                spdx_id="SPDXRef-left-pad",
+                download_location="https://example.com/left-pad",
+                license_concluded="MIT OR Apache-2.0",
+            ),
+        ],
+        relationships=[
+            SpdxRelationship("SPDXRef-DOCUMENT", "SPDXRef-widget", "DESCRIBES"),
+            SpdxRelationship("SPDXRef-widget", "SPDXRef-left-pad", "DEPENDS_ON"),
+        ],
+        comment="Merged",
+    )
+
+
+def test_yaml_matches_json_structure(document):
+    yaml = pytest.importorskip("yaml")
+
+    loaded = yaml.safe_load("".join(YamlWriter.iter_lines(document)))
+    assert loaded == SpdxParser.serialize_to_json(document)["sbom"]
+
+
+def test_yaml_nested_values_and_empty_document(document):
+    yaml = pytest.importorskip("yaml")
+
+    nested = {"a b": [[1, 2], {}], "empty": [], "flag": None}
+    text = "".join(YamlWriter.iter_node(nested))
+    assert yaml.safe_load(text) == nested
+    assert "".join(YamlWriter.iter_node("x")) == '"x"\n'
+
+    document.packages = []
+    document.relationships = []
+    loaded = yaml.safe_load("".join(SpdxParser.serialize_to_yaml(document)))
+    assert loaded["packages"] == [] and loaded["relationships"] == []
+
+
+def test_rdf_output_is_well_formed(document):
+    root = ET.fromstring("".join(RdfXmlWriter.iter_lines(document)))
+
+    doc_node = root.find(f"{SPDX}SpdxDocument")
+    assert doc_node.get(f"{RDF}about") == "https://example.com/widget#SPDXRef-DOCUMENT"
+    assert doc_node.findtext(f"{SPDX}name") == "widget <merged>"
+    creators = [c.text for c in doc_node.iter(f"{SPDX}creator")]
+    assert creators == document.creation_info["creators"]
+
+    widget, left_pad = root.findall(f"{SPDX}Package")
+    assert widget.find(f"{SPDX}licenseConcluded").get(f"{RDF}resource") == (
+        "http://spdx.org/licenses/MIT"
+    )
+    assert widget.find(f"{SPDX}downloadLocation").get(f"{RDF}resource") == (
+        "http://spdx.org/rdf/terms#noassertion"
+    )
+    assert widget.findtext(f".//{SPDX}referenceLocator") == "pkg:npm/widget@1.2.3"
+    assert left_pad.findtext(f"{SPDX}licenseConcluded") == "MIT OR Apache-2.0"
+
+    relationship_types = [
+        r.get(f"{RDF}resource") for r in root.iter(f"{SPDX}relationshipType")
+    ]
+    assert relationship_types == [
+        "http://spdx.org/rdf/terms#relationshipType_describes",
+        "http://spdx.org/rdf/terms#relationshipType_dependsOn",
+    ]
+
+
+@pytest.mark.parametrize("output_format,suffix", [("yaml", ".yaml"), ("rdf", ".rdf")])
+def test_cli_streaming_formats(temp_sbom_dir, output_format, suffix):
+    result = CliRunner().invoke(
+        main,
+        ["--dependencies-dir", str(temp_sbom_dir), "--format", output_format],
+        catch_exceptions=False,
+    )
+
+    assert result.exit_code == 0
+    output = temp_sbom_dir.parent / f"test_user_test_repo_merged{suffix}"
+    assert output.exists()
+    if output_format == "rdf":
+        ET.parse(output)
+    else:
+        yaml = pytest.importorskip("yaml")
+        merged_json = json.dumps(yaml.safe_load(output.read_text()))
+        assert "Merged SBOM" in merged_json